@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""Benchmark of the incremental GeoJSON parsing of actinia.geojson.
+
+Writes a GeoJSON FeatureCollection with many point features and compares
+the peak memory use and the throughput of json.load and iter_features.
+
+    python benchmarks/iter_features.py --features 1000000
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import argparse
+import json
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from actinia.geojson import iter_batches, iter_features
+
+
+def write_geojson(path: Path, n_features: int) -> None:
+    """Write a FeatureCollection with n_features point features."""
+    with path.open("w", encoding="utf-8") as file:
+        file.write('{"type": "FeatureCollection", "features": [\n')
+        for i in range(n_features):
+            feature = {
+                "type": "Feature",
+                "properties": {"cat": i, "name": f"point {i}", "value": i / 7},
+                "geometry": {
+                    "type": "Point",
+                    "coordinates": [630000 + i % 1500, 215000 + i // 1500],
+                },
+            }
+            separator = ",\n" if i < n_features - 1 else "\n"
+            file.write(json.dumps(feature) + separator)
+        file.write("]}\n")
+
+
+def measure(name: str, function: callable) -> None:
+    """Print run time, features per second and peak memory of function.
+
+    The peak memory is traced in a second run, as tracing slows down the
+    parsing.
+    """
+    start = time.perf_counter()
+    n_features = function()
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"{name:<16} {seconds:8.2f} s {n_features / seconds:12.0f} "
+        f"features/s {peak / 1024**2:10.1f} MiB peak",
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--features", type=int, default=200000)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "points.geojson"
+        write_geojson(path, args.features)
+        size = path.stat().st_size / 1024**2
+        print(f"{args.features} features, {size:.1f} MiB GeoJSON")
+
+        def load() -> int:
+            with path.open("rb") as file:
+                return len(json.load(file)["features"])
+
+        def features() -> int:
+            return sum(1 for _ in iter_features(path))
+
+        def batches() -> int:
+            return sum(
+                len(batch["cat"])
+                for batch in iter_batches(
+                    iter_features(path),
+                    args.batch_size,
+                )
+            )
+
+        measure("json.load", load)
+        measure("iter_features", features)
+        measure("iter_batches", batches)
+
+
+if __name__ == "__main__":
+    main()
@@ -18,10 +18,14 @@ __maintainer__ = "Anika Weinmann"
 
 import re
 
+from actinia.batch import JobBatch
+from actinia.cache import ByteCache, ObjectCache
+from actinia.estimator import CostEstimator
 from actinia.location import Location
 from actinia.resources.templating import tplEnv
 from actinia.resources.logger import log
-from actinia.utils import request_and_check
+from actinia.upload import UploadManifest
+from actinia.utils import DOWNLOAD_DIR, request_and_check
 
 
 class Actinia:
@@ -33,6 +37,8 @@ class Actinia:
         pw=None,
         connect_timeout=None,
         read_timeout=None,
+        cache_ttls=None,
+        upload_manifest=None,
     ):
         self.api_prefix = api_version
         self.base_url = url
@@ -41,12 +47,20 @@ class Actinia:
         self.__password = None
         self.__auth = None
         self.timeout = (connect_timeout, read_timeout)
+        self.cache = ObjectCache(cache_ttls)
         if user and pw:
             self.set_authentication(user, pw)
         self.locations = dict()
         self.__set_url()
         self.__check_version()
         self.jobs = dict()
+        self.cost_estimator = CostEstimator()
+        if upload_manifest is not None and not isinstance(
+            upload_manifest, UploadManifest
+        ):
+            upload_manifest = UploadManifest(upload_manifest)
+        self.upload_manifest = upload_manifest
+        self.render_cache = ByteCache(directory=DOWNLOAD_DIR / "render")
 
     def __set_url(self):
         if self.api_prefix == "latest":
@@ -122,10 +136,17 @@ class Actinia:
             self.__auth = None
             raise e
 
-    def get_locations(self):
-        if len(self.locations) == 0:
-            self.__request_locations()
-        return self.locations
+    def get_locations(self, force=False):
+        """
+        Return the locations, cached with the TTL of "locations" in
+        cache_ttls.
+
+        :param force: Force reloading of the locations
+        :return: A dict of the locations with the location names as key
+        """
+        return self.cache.get(
+            "locations", (), self.__request_locations, force=force
+        )
 
     def __request_locations(self):
         """
@@ -146,10 +167,14 @@ class Actinia:
         if not loc_names:
             raise Exception("Authentication is not set.")
 
+        # keep the known locations with their cached mapsets
         loc = {
-            lname: Location(lname, self, self.__auth) for lname in loc_names
+            lname: self.locations.get(lname)
+            or Location(lname, self, self.__auth)
+            for lname in loc_names
         }
         self.locations = loc
+        return loc
 
     def create_location(self, name, epsgcode):
         """
@@ -176,12 +201,50 @@ class Actinia:
         )
 
         location = Location(name, self, self.__auth)
-        if len(self.locations) == 0:
-            self.__request_locations()
+        self.get_locations()
         self.locations[name] = location
 
         return location
 
+    def map(
+        self,
+        chains,
+        target,
+        max_in_flight=4,
+        ordered=True,
+        names=None,
+        retries=2,
+        waiting_time=5,
+    ):
+        """
+        Submits a list of process chains with bounded concurrency.
+
+        At most max_in_flight jobs are submitted or running at the same time
+        and all running jobs are polled together. Failed submissions are
+        retried if they cannot have created a job. The returned JobBatch
+        yields its items in input order (ordered=True) or as they complete
+        and exposes throughput metrics with JobBatch.metrics.
+
+        :param chains: List of process chains (dict, JSON string or file)
+        :param target: Mapset (persistent) or Location (ephemeral
+                       processing) to process the chains in
+        :param max_in_flight: Maximal number of jobs in flight
+        :param ordered: Yield the results in input order
+        :param names: Optional list of job names
+        :param retries: Number of resubmissions of a failed submission
+        :param waiting_time: Time to wait in seconds for next poll
+        :return: The JobBatch
+        """
+        return JobBatch(
+            chains,
+            target,
+            max_in_flight,
+            names=names,
+            ordered=ordered,
+            retries=retries,
+            waiting_time=waiting_time,
+        )
+
 
 # TODO:
 # * /resource_storage - GET, DELETE
@@ -0,0 +1,373 @@
+#!/usr/bin/env python
+
+"""The batch module provides bulk submission of process chains.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from threading import Thread
+from time import monotonic, sleep
+from typing import TYPE_CHECKING, Callable, Iterator
+
+from actinia.resources.logger import log
+from actinia.utils import is_retryable
+
+if TYPE_CHECKING:
+    from actinia.job import Job
+    from actinia.location import Location
+    from actinia.mapset import Mapset
+
+RUNNING_STATUS = ("accepted", "running")
+
+
+def submit_process_chain(
+    target: Mapset | Location,
+    pc: str | dict,
+    name: str | None = None,
+    retries: int = 0,
+    waiting_time: float = 5,
+    *,
+    on_retry: Callable[[Exception], None] | None = None,
+) -> Job:
+    """Submit a process chain to a mapset or a location.
+
+    Mapsets run the process chain persistently
+    (``create_processing_job``), locations run it ephemeral
+    (``create_processing_export_job``). A failed submission is only
+    resubmitted if it cannot have created a job: after connection errors
+    before the request was sent and after 5xx responses without a resource
+    id.
+
+    Parameters
+    ----------
+    target: Mapset | Location
+        Mapset or location to submit the process chain to
+    pc: str | dict
+        The actinia process chain
+    name: str | None
+        Name of the processing job (optional)
+    retries: int
+        Number of resubmissions if the submission fails
+    waiting_time: float
+        Time to wait in seconds before a resubmission
+    on_retry: Callable[[Exception], None] | None
+        Function called with the error before each resubmission
+
+    Returns
+    -------
+    Job
+
+    Raises
+    ------
+    TypeError
+        TypeError if 'target' cannot process process chains.
+
+    """
+    if hasattr(target, "create_processing_job"):
+        submit = target.create_processing_job
+    elif hasattr(target, "create_processing_export_job"):
+        submit = target.create_processing_export_job
+    else:
+        msg = "Target has to be a Mapset or a Location."
+        raise TypeError(msg)
+    attempt = 0
+    while True:
+        try:
+            return submit(pc, name)
+        except Exception as e:
+            attempt += 1
+            if attempt > retries or not is_retryable(e):
+                raise e
+            log.warning(
+                f"Submission of job {name} failed ({e}), "
+                f"retry {attempt}/{retries}."
+            )
+            if on_retry is not None:
+                on_retry(e)
+            sleep(waiting_time)
+
+
+class BatchItem:
+    """A single process chain of a JobBatch and its job."""
+
+    def __init__(self, index: int, pc: str | dict, name: str) -> None:
+        """Initialize the BatchItem object."""
+        self.index = index
+        self.process_chain = pc
+        self.name = name
+        self.job = None
+        self.error = None
+        self.attempts = 0
+        self.submit_time = None
+        self.start_time = None
+        self.end_time = None
+
+    @property
+    def status(self) -> str:
+        """Return the job status or 'submission_failed'."""
+        if self.job is None:
+            return "submission_failed" if self.error else "pending"
+        return self.job.status
+
+    @property
+    def queue_wait(self) -> float | None:
+        """Return the seconds between submission and start of the job."""
+        if self.submit_time is None or self.start_time is None:
+            return None
+        return self.start_time - self.submit_time
+
+    @property
+    def run_time(self) -> float | None:
+        """Return the seconds between start and end of the job."""
+        if self.start_time is None or self.end_time is None:
+            return None
+        return self.end_time - self.start_time
+
+
+class JobBatch:
+    """Submit process chains with bounded concurrency and wait for them.
+
+    At most ``max_in_flight`` jobs are submitted or running at the same
+    time and the running jobs are polled together in one loop. Iterating
+    over the batch yields BatchItems in input order if ``ordered`` is
+    True, otherwise as they complete.
+    """
+
+    def __init__(
+        self,
+        chains: list[str | dict],
+        target: Mapset | Location,
+        max_in_flight: int = 4,
+        *,
+        names: list[str] | None = None,
+        ordered: bool = True,
+        retries: int = 2,
+        waiting_time: float = 5,
+        poll_retries: int = 0,
+    ) -> None:
+        """Initialize the JobBatch object and start the submission.
+
+        Parameters
+        ----------
+        chains: list[str | dict]
+            The actinia process chains
+        target: Mapset | Location
+            Mapset (persistent) or location (ephemeral) to process in
+        max_in_flight: int
+            Maximal number of jobs submitted or running at the same time
+        names: list[str] | None
+            Job names, one per process chain (optional)
+        ordered: bool
+            Yield the results in input order instead of completion order
+        retries: int
+            Number of resubmissions of a failed submission
+        waiting_time: float
+            Time to wait in seconds between polls and resubmissions
+        poll_retries: int
+            Number of retries in case of ReadTimeout while polling
+
+        Raises
+        ------
+        ValueError
+            ValueError if names and chains do not have the same length or
+            max_in_flight is smaller than 1.
+
+        """
+        if names is None:
+            names = [f"batch_job_{i}" for i in range(len(chains))]
+        if len(names) != len(chains):
+            msg = "names and chains must have the same length."
+            raise ValueError(msg)
+        if max_in_flight < 1:
+            msg = "max_in_flight must be at least 1."
+            raise ValueError(msg)
+        self.target = target
+        self.ordered = ordered
+        self.retries = retries
+        self.waiting_time = waiting_time
+        self.poll_retries = poll_retries
+        self.items = [
+            BatchItem(i, pc, name)
+            for i, (pc, name) in enumerate(zip(chains, names))
+        ]
+        self.max_in_flight = max_in_flight
+        self.__start_time = monotonic()
+        self.__futures = [Future() for _ in self.items]
+        Thread(target=self.__run).start()
+
+    def __submit(self, item: BatchItem) -> None:
+        """Submit the process chain of an item."""
+
+        def on_retry(error: Exception) -> None:
+            item.attempts += 1
+
+        item.attempts = 1
+        try:
+            item.job = submit_process_chain(
+                self.target,
+                item.process_chain,
+                item.name,
+                retries=self.retries,
+                waiting_time=self.waiting_time,
+                on_retry=on_retry,
+            )
+        except Exception as e:
+            log.error(f"Submission of job {item.name} failed: {e}")
+            item.error = e
+            return
+        item.submit_time = monotonic()
+
+    def __update(self, item: BatchItem) -> bool:
+        """Poll the job of an item and return whether it is done."""
+        job = item.job
+        try:
+            job.poll(quiet=True, retries=self.poll_retries)
+        except Exception as e:
+            job.status, job.message = "error", str(e)
+        if item.start_time is None and job.status == "running":
+            item.start_time = monotonic()
+        return job.status not in RUNNING_STATUS
+
+    def __finish(self, item: BatchItem) -> None:
+        """Record the end of an item and resolve its future."""
+        item.end_time = monotonic()
+        job = item.job
+        if job is not None:
+            if item.start_time is None:
+                # job finished between two polls
+                item.start_time = item.end_time
+            if job.status == "finished":
+                log.info(f"Job {item.name} finished.")
+            else:
+                log.error(f"Job {item.name} is {job.status}: {job.message}")
+        self.__futures[item.index].set_result(item)
+
+    def __run(self) -> None:
+        """Run the batch and fail the unfinished items on unexpected errors."""
+        try:
+            self.__schedule()
+        except Exception as e:
+            log.error(f"Batch failed: {e}")
+            for future in self.__futures:
+                if not future.done():
+                    future.set_exception(e)
+
+    def __schedule(self) -> None:
+        """Submit the process chains and poll all running jobs together."""
+        pending = deque(self.items)
+        submitting = {}
+        running = []
+        last_poll = monotonic()
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as executor:
+            while pending or submitting or running:
+                while (
+                    pending
+                    and len(submitting) + len(running) < self.max_in_flight
+                ):
+                    item = pending.popleft()
+                    submitting[executor.submit(self.__submit, item)] = item
+                if submitting:
+                    done, _ = wait(
+                        submitting,
+                        timeout=self.waiting_time if running else None,
+                        return_when=FIRST_COMPLETED,
+                    )
+                else:
+                    done = set()
+                    sleep(
+                        max(self.waiting_time - (monotonic() - last_poll), 0)
+                    )
+                for future in done:
+                    item = submitting.pop(future)
+                    if item.job is not None and item.status in RUNNING_STATUS:
+                        running.append(item)
+                    else:
+                        # submission failed or the job ran synchronously
+                        self.__finish(item)
+                if monotonic() - last_poll < self.waiting_time:
+                    continue
+                last_poll = monotonic()
+                for item in list(running):
+                    if self.__update(item):
+                        running.remove(item)
+                        self.__finish(item)
+
+    def __iter__(self) -> Iterator[BatchItem]:
+        """Yield the BatchItems once their jobs are done."""
+        if self.ordered:
+            futures = self.__futures
+        else:
+            futures = as_completed(self.__futures)
+        for future in futures:
+            yield future.result()
+
+    def __len__(self) -> int:
+        """Return the number of process chains in the batch."""
+        return len(self.items)
+
+    def wait(self) -> list[BatchItem]:
+        """Wait for all jobs and return the BatchItems in input order."""
+        return [future.result() for future in self.__futures]
+
+    def jobs(self) -> list[Job]:
+        """Wait for all jobs and return them in input order.
+
+        Items whose submission failed are returned as None.
+        """
+        return [item.job for item in self.wait()]
+
+    @property
+    def metrics(self) -> dict:
+        """Return throughput metrics of the done jobs.
+
+        Returns
+        -------
+        metrics: dict
+            Number of submitted, finished and failed jobs, resubmissions,
+            elapsed seconds, jobs per minute and mean queue wait and run
+            time in seconds
+
+        """
+        done = [item for item in self.items if item.end_time is not None]
+        if len(done) == len(self.items) and done:
+            end_time = max(item.end_time for item in done)
+        else:
+            end_time = monotonic()
+        elapsed = end_time - self.__start_time
+        queue_waits = [i.queue_wait for i in done if i.queue_wait is not None]
+        run_times = [i.run_time for i in done if i.run_time is not None]
+        return {
+            "submitted": sum(1 for i in self.items if i.job is not None),
+            "finished": sum(1 for i in done if i.status == "finished"),
+            "failed": sum(1 for i in done if i.status != "finished"),
+            "resubmissions": sum(max(i.attempts - 1, 0) for i in self.items),
+            "elapsed": elapsed,
+            "jobs_per_minute": len(done) / elapsed * 60 if elapsed else 0.0,
+            "mean_queue_wait": (
+                sum(queue_waits) / len(queue_waits) if queue_waits else None
+            ),
+            "mean_run_time": (
+                sum(run_times) / len(run_times) if run_times else None
+            ),
+        }
@@ -0,0 +1,415 @@
+#!/usr/bin/env python
+
+"""The cache module provides the object cache of the Actinia client.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import hashlib
+import os
+from collections import OrderedDict
+from pathlib import Path
+from threading import RLock, Thread, get_ident
+from time import monotonic
+from typing import Any, Callable
+from weakref import WeakMethod
+
+from actinia.resources.logger import log
+
+# Time to live in seconds per resource kind, None never expires
+DEFAULT_TTLS = {
+    "locations": 300,
+    "location_info": None,
+    "mapsets": 60,
+    "mapset_info": 600,
+    "raster_layers": 60,
+    "vector_layers": 60,
+    "strds": 60,
+    "raster_info": 600,
+    "vector_info": 600,
+    "strds_info": 60,
+    "strds_raster_layers": 60,
+    "strds_statistics": None,
+}
+# Seconds after the TTL in which the stale value is returned while it is
+# requested again in the background
+DEFAULT_STALE_WHILE_REVALIDATE = 30
+# Default sizes of the ByteCache in memory and on disk
+DEFAULT_MEMORY_BYTES = 256 * 1024**2
+DEFAULT_DISK_BYTES = 1024**3
+
+
+class ObjectCache:
+    """Cache of the resources requested by the client.
+
+    Entries are identified by the resource kind (e.g. "raster_layers") and
+    the path of the resource, e.g. ``(location_name, mapset_name)``. Each
+    kind has its own time to live (TTL). Within
+    ``stale_while_revalidate`` seconds after the TTL the stale value is
+    returned and requested again in the background.
+    """
+
+    def __init__(
+        self,
+        ttls: dict | None = None,
+        stale_while_revalidate: float = DEFAULT_STALE_WHILE_REVALIDATE,
+    ) -> None:
+        """Initialize the ObjectCache object.
+
+        Parameters
+        ----------
+        ttls: dict | None
+            Time to live in seconds per resource kind, overwriting
+            DEFAULT_TTLS; None never expires, 0 disables caching
+        stale_while_revalidate: float
+            Seconds after the TTL in which stale values are returned
+
+        """
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.stale_while_revalidate = stale_while_revalidate
+        self.__entries = {}
+        self.__refreshing = set()
+        self.__listeners = []
+        # number of invalidations, to detect them while a value is loaded
+        self.__generation = 0
+        self.__lock = RLock()
+        self.__metrics = {
+            "hits": 0,
+            "misses": 0,
+            "stale_hits": 0,
+            "refreshes": 0,
+            "invalidations": 0,
+        }
+
+    def __count(self, metric: str) -> None:
+        with self.__lock:
+            self.__metrics[metric] += 1
+
+    def get(
+        self,
+        kind: str,
+        path: tuple,
+        loader: Callable[[], Any],
+        *,
+        force: bool = False,
+    ) -> Any:
+        """Return a cached value or load it.
+
+        Parameters
+        ----------
+        kind: str
+            Resource kind, key of the TTLs
+        path: tuple
+            Path of the resource, e.g. (location_name, mapset_name)
+        loader: Callable
+            Function requesting the resource, its return value is cached
+        force: bool
+            Load the value even if it is cached
+
+        Returns
+        -------
+        value: Any
+            The cached or loaded value
+
+        """
+        key = (kind, tuple(path))
+        ttl = self.ttls.get(kind)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            generation = self.__generation
+        # a TTL of 0 disables caching including stale values
+        if entry is not None and not force and ttl != 0:
+            value, timestamp = entry
+            age = monotonic() - timestamp
+            if ttl is None or age <= ttl:
+                self.__count("hits")
+                return value
+            if age <= ttl + self.stale_while_revalidate:
+                self.__count("stale_hits")
+                self.__refresh(key, entry, loader)
+                return value
+        self.__count("misses")
+        value = loader()
+        with self.__lock:
+            # values loaded before an invalidation may be outdated
+            if self.__generation == generation:
+                self.__entries[key] = (value, monotonic())
+        return value
+
+    def __refresh(
+        self,
+        key: tuple,
+        entry: tuple,
+        loader: Callable[[], Any],
+    ) -> None:
+        """Load a value in the background, replacing the stale entry."""
+        with self.__lock:
+            if key in self.__refreshing:
+                return
+            self.__refreshing.add(key)
+
+        def refresh():
+            try:
+                value = loader()
+                with self.__lock:
+                    # do not revive invalidated entries or overwrite
+                    # values set while loading
+                    if self.__entries.get(key) is entry:
+                        self.__entries[key] = (value, monotonic())
+                self.__count("refreshes")
+            except Exception as e:
+                log.warning(f"Refreshing {key} failed: {e}")
+            finally:
+                with self.__lock:
+                    self.__refreshing.discard(key)
+
+        Thread(target=refresh, daemon=True).start()
+
+    def set(self, kind: str, path: tuple, value: Any) -> None:
+        """Set a cached value."""
+        with self.__lock:
+            self.__entries[(kind, tuple(path))] = (value, monotonic())
+
+    def peek(self, kind: str, path: tuple) -> Any:
+        """Return a cached value regardless of its age or None."""
+        with self.__lock:
+            entry = self.__entries.get((kind, tuple(path)))
+        return None if entry is None else entry[0]
+
+    def invalidate(self, kind: str | None = None, path: tuple = ()) -> None:
+        """Remove cached values.
+
+        Parameters
+        ----------
+        kind: str | None
+            Resource kind to remove, all kinds if None
+        path: tuple
+            Remove the values of the resource and all resources below,
+            e.g. (location_name, mapset_name) removes all cached values of
+            the mapset
+
+        """
+        path = tuple(path)
+        with self.__lock:
+            keys = [
+                key
+                for key in self.__entries
+                if (kind is None or key[0] == kind)
+                and key[1][: len(path)] == path
+            ]
+            for key in keys:
+                del self.__entries[key]
+            self.__generation += 1
+            # drop the listeners of objects which no longer exist
+            listeners = [ref() for ref in self.__listeners]
+            self.__listeners = [
+                ref
+                for ref, listener in zip(self.__listeners, listeners)
+                if listener is not None
+            ]
+        self.__count("invalidations")
+        for listener in listeners:
+            if listener is not None:
+                listener(kind, path)
+
+    def clear(self) -> None:
+        """Remove all cached values."""
+        self.invalidate()
+
+    def add_listener(self, listener: Callable[[str, tuple], None]) -> None:
+        """Add a function called with kind and path on invalidation.
+
+        Bound methods are referenced weakly, so listening does not keep
+        their objects alive; they are removed when the object is deleted.
+        """
+        if hasattr(listener, "__self__"):
+            ref = WeakMethod(listener)
+        else:
+
+            def ref() -> Callable[[str, tuple], None]:
+                return listener
+
+        with self.__lock:
+            self.__listeners.append(ref)
+
+    def remove_listener(self, listener: Callable[[str, tuple], None]) -> None:
+        """Remove a function added with add_listener.
+
+        Raises
+        ------
+        ValueError
+            ValueError if the function is not a listener.
+
+        """
+        with self.__lock:
+            for ref in self.__listeners:
+                if ref() == listener:
+                    self.__listeners.remove(ref)
+                    return
+        msg = "The function is not a listener of the cache."
+        raise ValueError(msg)
+
+    @property
+    def metrics(self) -> dict:
+        """Return the number of hits, misses, stale hits, refreshes,
+        invalidations and cached entries.
+        """
+        with self.__lock:
+            return {**self.__metrics, "entries": len(self.__entries)}
+
+
+class ByteCache:
+    """Size-bounded LRU cache of bytes, e.g. rendered images.
+
+    Values are kept in memory up to ``max_bytes`` and, if a directory is
+    given, written to files up to ``max_disk_bytes``, which are reused by
+    later sessions. Keys are tuples of strings and numbers. The least
+    recently used values are removed first.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MEMORY_BYTES,
+        directory: str | Path | None = None,
+        max_disk_bytes: int = DEFAULT_DISK_BYTES,
+    ) -> None:
+        """Initialize the ByteCache object.
+
+        Parameters
+        ----------
+        max_bytes: int
+            Maximal number of bytes in memory
+        directory: str | Path | None
+            Directory of the cached files, no files if None
+        max_disk_bytes: int
+            Maximal number of bytes of the files
+
+        """
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.directory = None if directory is None else Path(directory)
+        self.__memory = OrderedDict()
+        self.__memory_bytes = 0
+        self.__disk = OrderedDict()
+        self.__disk_bytes = 0
+        self.__lock = RLock()
+        self.__metrics = {"hits": 0, "disk_hits": 0, "misses": 0}
+        if self.directory is not None and self.directory.is_dir():
+            files = sorted(
+                (file.stat().st_mtime, file.name, file.stat().st_size)
+                for file in self.directory.glob("*.bin")
+            )
+            for _, name, size in files:
+                self.__disk[name] = size
+                self.__disk_bytes += size
+
+    @staticmethod
+    def file_name(key: tuple) -> str:
+        """Return the file name of a key."""
+        return hashlib.sha256(repr(tuple(key)).encode()).hexdigest() + ".bin"
+
+    def __contains__(self, key: tuple) -> bool:
+        """Return whether a value is cached in memory or on disk."""
+        key = tuple(key)
+        with self.__lock:
+            return key in self.__memory or self.file_name(key) in self.__disk
+
+    def get(self, key: tuple) -> bytes | None:
+        """Return a cached value or None."""
+        key = tuple(key)
+        name = self.file_name(key)
+        with self.__lock:
+            if key in self.__memory:
+                self.__memory.move_to_end(key)
+                self.__metrics["hits"] += 1
+                return self.__memory[key]
+            on_disk = name in self.__disk
+        if on_disk:
+            try:
+                data = (self.directory / name).read_bytes()
+            except OSError:
+                data = None
+            if data is not None:
+                os.utime(self.directory / name)
+                with self.__lock:
+                    self.__metrics["disk_hits"] += 1
+                    if name in self.__disk:
+                        self.__disk.move_to_end(name)
+                    self.__set_memory(key, data)
+                return data
+            with self.__lock:
+                self.__disk_bytes -= self.__disk.pop(name, 0)
+        with self.__lock:
+            self.__metrics["misses"] += 1
+        return None
+
+    def set(self, key: tuple, data: bytes) -> None:
+        """Cache a value in memory and on disk."""
+        key = tuple(key)
+        data = bytes(data)
+        with self.__lock:
+            self.__set_memory(key, data)
+        if self.directory is None or len(data) > self.max_disk_bytes:
+            return
+        name = self.file_name(key)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        part = self.directory / f"{name}.{os.getpid()}.{get_ident()}.part"
+        part.write_bytes(data)
+        os.replace(part, self.directory / name)
+        with self.__lock:
+            self.__disk_bytes -= self.__disk.pop(name, 0)
+            self.__disk[name] = len(data)
+            self.__disk_bytes += len(data)
+            removed = []
+            while self.__disk_bytes > self.max_disk_bytes:
+                old, size = self.__disk.popitem(last=False)
+                self.__disk_bytes -= size
+                removed.append(old)
+        for old in removed:
+            (self.directory / old).unlink(missing_ok=True)
+
+    def __set_memory(self, key: tuple, data: bytes) -> None:
+        """Add a value to memory and remove the least recently used."""
+        self.__memory_bytes -= len(self.__memory.pop(key, b""))
+        if len(data) > self.max_bytes:
+            return
+        self.__memory[key] = data
+        self.__memory_bytes += len(data)
+        while self.__memory_bytes > self.max_bytes:
+            _, old = self.__memory.popitem(last=False)
+            self.__memory_bytes -= len(old)
+
+    def clear(self) -> None:
+        """Remove all cached values from memory and disk."""
+        with self.__lock:
+            names = list(self.__disk)
+            self.__memory.clear()
+            self.__disk.clear()
+            self.__memory_bytes = self.__disk_bytes = 0
+        for name in names:
+            (self.directory / name).unlink(missing_ok=True)
+
+    @property
+    def metrics(self) -> dict:
+        """Return the number of hits, disk hits and misses and the cached
+        bytes in memory and on disk.
+        """
+        with self.__lock:
+            return {
+                **self.__metrics,
+                "memory_bytes": self.__memory_bytes,
+                "disk_bytes": self.__disk_bytes,
+            }
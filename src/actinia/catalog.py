@@ -0,0 +1,528 @@
+#!/usr/bin/env python
+
+"""The catalog module provides an index of all layers of an actinia server.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import json
+import struct
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+
+from actinia.resources.logger import log
+
+if TYPE_CHECKING:
+    from actinia import Actinia
+
+MAGIC = b"ACTCAT01"
+ALIGN = 64
+KINDS = ("raster", "vector", "strds")
+# Mapset methods listing the layers of each kind
+LIST_METHODS = {
+    "raster": "get_raster_layers",
+    "vector": "get_vector_layers",
+    "strds": "get_strds",
+}
+
+
+class CatalogEntry(NamedTuple):
+    """A layer in the catalog."""
+
+    location: str
+    mapset: str
+    kind: str
+    name: str
+
+
+def write_arrays(path: str | Path, meta: dict, arrays: dict) -> None:
+    """Write numpy arrays and JSON metadata to a memory-mappable file.
+
+    The file starts with MAGIC, the length of the JSON header as uint64 and
+    the JSON header with the metadata and the offset, dtype and shape of
+    each array. The arrays follow aligned to ALIGN bytes.
+
+    Parameters
+    ----------
+    path: str | Path
+        Path of the file
+    meta: dict
+        JSON serializable metadata
+    arrays: dict
+        numpy arrays by name
+
+    """
+    layout = {}
+    offset = 0
+    for name, array in arrays.items():
+        layout[name] = [offset, array.dtype.str, list(array.shape)]
+        offset += -(-array.nbytes // ALIGN) * ALIGN
+    header = json.dumps({"meta": meta, "arrays": layout}).encode("UTF8")
+    start = -(-(len(MAGIC) + 8 + len(header)) // ALIGN) * ALIGN
+    with Path(path).open("wb") as out:
+        out.write(MAGIC)
+        out.write(struct.pack("<Q", len(header)))
+        out.write(header)
+        out.write(b"\0" * (start - out.tell()))
+        for name, array in arrays.items():
+            out.seek(start + layout[name][0])
+            out.write(np.ascontiguousarray(array).tobytes())
+        out.truncate(start + offset)
+
+
+def read_arrays(path: str | Path) -> tuple[dict, dict]:
+    """Memory-map the arrays of a file written by write_arrays.
+
+    Parameters
+    ----------
+    path: str | Path
+        Path of the file
+
+    Returns
+    -------
+    meta: dict
+        The metadata
+    arrays: dict
+        Read-only memory-mapped numpy arrays by name
+
+    Raises
+    ------
+    ValueError
+        ValueError if the file has not been written by write_arrays.
+
+    """
+    with Path(path).open("rb") as src:
+        if src.read(len(MAGIC)) != MAGIC:
+            msg = f"<{path}> is not a catalog file."
+            raise ValueError(msg)
+        (length,) = struct.unpack("<Q", src.read(8))
+        header = json.loads(src.read(length).decode("UTF8"))
+    start = -(-(len(MAGIC) + 8 + length) // ALIGN) * ALIGN
+    arrays = {}
+    for name, (offset, dtype, shape) in header["arrays"].items():
+        if int(np.prod(shape)) == 0:
+            arrays[name] = np.empty(shape, dtype=dtype)
+            continue
+        arrays[name] = np.memmap(
+            path,
+            dtype=dtype,
+            mode="r",
+            offset=start + offset,
+            shape=tuple(shape),
+        )
+    return header["meta"], arrays
+
+
+class _NameView:
+    """Sorted layer names as sequence of bytes, decoded on access."""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray) -> None:
+        self.blob = blob
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> bytes:
+        start, stop = self.offsets[index], self.offsets[index + 1]
+        return self.blob[start:stop].tobytes()
+
+
+class Catalog:
+    """Index of the locations, mapsets and layers of an actinia server.
+
+    ``snapshot`` crawls all mapsets concurrently, ``refresh`` only requests
+    the layers of new mapsets and of mapsets changed by the client (see
+    Actinia.cache). The index can be saved to a file which is memory-mapped
+    when it is loaded again.
+    """
+
+    def __init__(self, actinia: Actinia) -> None:
+        """Initialize the Catalog object.
+
+        Parameters
+        ----------
+        actinia: Actinia
+            The Actinia instance of the server
+
+        """
+        self.__actinia = actinia
+        self.errors = {}
+        self.__layers = {}
+        self.__dirty = set()
+        self.__lock = Lock()
+        self.__index = None
+        self.__mapsets = []
+        self.spatial_index = None
+        actinia.cache.add_listener(self.__on_invalidate)
+
+    def __on_invalidate(self, kind: str | None, path: tuple) -> None:
+        """Mark mapsets changed by the client as dirty."""
+        with self.__lock:
+            if len(path) == 0:
+                self.__dirty.update(self.__layers)
+            elif len(path) == 1:
+                self.__dirty.update(
+                    key for key in self.__layers if key[0] == path[0]
+                )
+            else:
+                self.__dirty.add(tuple(path[:2]))
+
+    def __list_mapset(self, location: str, mapset: str) -> dict:
+        """Request the layer names of a mapset.
+
+        If a listing fails, the previous layer names are kept and the
+        mapset stays dirty, so it is listed again by the next refresh.
+        """
+        previous = self.__layers.get((location, mapset), {})
+        layers = {}
+        for kind in KINDS:
+            try:
+                locations = self.__actinia.get_locations()
+                obj = locations[location].get_mapsets()[mapset]
+                get_layers = getattr(obj, LIST_METHODS[kind])
+                layers[kind] = sorted(get_layers(force=True))
+                self.errors.pop((location, mapset, kind), None)
+            except Exception as e:
+                log.warning(
+                    f"Listing {kind} layers of <{location}/{mapset}> "
+                    f"failed: {e}"
+                )
+                self.errors[(location, mapset, kind)] = e
+                layers[kind] = previous.get(kind, [])
+                with self.__lock:
+                    self.__dirty.add((location, mapset))
+        return layers
+
+    def __crawl(
+        self,
+        locations: list[str],
+        mapsets: set[tuple[str, str]],
+        max_in_flight: int,
+    ) -> None:
+        """List mapsets of locations and layers of new and given mapsets."""
+
+        def list_mapsets(location):
+            try:
+                locations = self.__actinia.get_locations()
+                return set(locations[location].get_mapsets(force=True))
+            except Exception as e:
+                log.warning(f"Listing mapsets of <{location}> failed: {e}")
+                self.errors[(location,)] = e
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            listed = dict(
+                zip(locations, executor.map(list_mapsets, locations))
+            )
+            for location, names in listed.items():
+                if names is None:
+                    continue
+                known = {ms for loc, ms in self.__layers if loc == location}
+                for removed in known - names:
+                    del self.__layers[(location, removed)]
+                mapsets.update((location, ms) for ms in names - known)
+            keys = sorted(mapsets)
+            results = executor.map(lambda key: self.__list_mapset(*key), keys)
+            for key, layers in zip(keys, results):
+                self.__layers[key] = layers
+        self.__index = None
+
+    def snapshot(self, max_in_flight: int = 8) -> Catalog:
+        """Request all locations, mapsets and layer names concurrently.
+
+        Parameters
+        ----------
+        max_in_flight: int
+            Maximal number of concurrent requests
+
+        Returns
+        -------
+        Catalog
+            The catalog itself
+
+        """
+        self.errors = {}
+        with self.__lock:
+            self.__dirty.clear()
+        self.__layers = {}
+        locations = list(self.__actinia.get_locations(force=True))
+        self.__crawl(locations, set(), max_in_flight)
+        return self
+
+    def refresh(
+        self,
+        mapsets: list[tuple[str, str]] | None = None,
+        max_in_flight: int = 8,
+    ) -> Catalog:
+        """Update the catalog incrementally.
+
+        The mapsets of all locations are listed again. Layers are only
+        listed for new mapsets, for mapsets changed by the client and for
+        the given mapsets.
+
+        Parameters
+        ----------
+        mapsets: list[tuple[str, str]] | None
+            Additional (location, mapset) tuples to list the layers of
+        max_in_flight: int
+            Maximal number of concurrent requests
+
+        Returns
+        -------
+        Catalog
+            The catalog itself
+
+        """
+        self.__materialize()
+        with self.__lock:
+            dirty = self.__dirty | set(mapsets or [])
+            self.__dirty = set()
+        locations = list(self.__actinia.get_locations(force=True))
+        for key in list(self.__layers):
+            if key[0] not in locations:
+                del self.__layers[key]
+        dirty = {key for key in dirty if key[0] in locations}
+        self.__crawl(locations, dirty, max_in_flight)
+        return self
+
+    def __materialize(self) -> None:
+        """Create the layer lists from a loaded index."""
+        if self.__layers or self.__index is None:
+            return
+        index = self.__index
+        for location, mapset in self.__mapsets:
+            self.__layers[(location, mapset)] = {kind: [] for kind in KINDS}
+        for i, name in enumerate(index["names"]):
+            location, mapset = self.__mapsets[index["mapset"][i]]
+            kind = KINDS[index["kind"][i]]
+            self.__layers[(location, mapset)][kind].append(name.decode("UTF8"))
+
+    def __build(self) -> dict:
+        """Build the sorted index arrays from the layer lists."""
+        if self.__index is not None:
+            return self.__index
+        self.__mapsets = sorted(self.__layers)
+        entries = []
+        for mapset_id, key in enumerate(self.__mapsets):
+            for kind_id, kind in enumerate(KINDS):
+                entries.extend(
+                    (name.encode("UTF8"), kind_id, mapset_id)
+                    for name in self.__layers[key][kind]
+                )
+        entries.sort()
+        lengths = np.fromiter(
+            (len(name) for name, _, _ in entries), np.uint64, len(entries)
+        )
+        offsets = np.zeros(len(entries) + 1, dtype=np.uint64)
+        np.cumsum(lengths, out=offsets[1:])
+        blob = np.frombuffer(
+            b"".join(name for name, _, _ in entries), dtype=np.uint8
+        )
+        index = {
+            "blob": blob,
+            "offsets": offsets,
+            "kind": np.fromiter(
+                (kind for _, kind, _ in entries), np.uint8, len(entries)
+            ),
+            "mapset": np.fromiter(
+                (mapset for _, _, mapset in entries), np.int32, len(entries)
+            ),
+        }
+        index["names"] = _NameView(index["blob"], index["offsets"])
+        self.__index = index
+        return index
+
+    def __entries(self, indices: range | np.ndarray) -> list[CatalogEntry]:
+        index = self.__build()
+        entries = []
+        for i in indices:
+            location, mapset = self.__mapsets[index["mapset"][i]]
+            entries.append(
+                CatalogEntry(
+                    location,
+                    mapset,
+                    KINDS[index["kind"][i]],
+                    index["names"][i].decode("UTF8"),
+                )
+            )
+        return entries
+
+    def __len__(self) -> int:
+        """Return the number of layers."""
+        return len(self.__build()["names"])
+
+    @property
+    def mapsets(self) -> list[tuple[str, str]]:
+        """Return the (location, mapset) tuples of the catalog."""
+        self.__build()
+        return list(self.__mapsets)
+
+    def lookup(self, name: str, kind: str | None = None) -> list[CatalogEntry]:
+        """Return the layers with the given name.
+
+        Parameters
+        ----------
+        name: str
+            Layer name
+        kind: str | None
+            Layer type: "raster", "vector", "strds" or None for all
+
+        Returns
+        -------
+        entries: list[CatalogEntry]
+
+        """
+        names = self.__build()["names"]
+        key = name.encode("UTF8")
+        start = bisect_left(names, key)
+        stop = start
+        while stop < len(names) and names[stop] == key:
+            stop += 1
+        return [
+            e
+            for e in self.__entries(range(start, stop))
+            if kind in (None, e.kind)
+        ]
+
+    def prefix(
+        self, prefix: str, kind: str | None = None
+    ) -> list[CatalogEntry]:
+        """Return the layers with names starting with prefix.
+
+        Parameters
+        ----------
+        prefix: str
+            Start of the layer names
+        kind: str | None
+            Layer type: "raster", "vector", "strds" or None for all
+
+        Returns
+        -------
+        entries: list[CatalogEntry]
+
+        """
+        names = self.__build()["names"]
+        key = prefix.encode("UTF8")
+        start = bisect_left(names, key)
+        stop = start
+        while stop < len(names) and names[stop].startswith(key):
+            stop += 1
+        return [
+            e
+            for e in self.__entries(range(start, stop))
+            if kind in (None, e.kind)
+        ]
+
+    def by_kind(self, kind: str) -> list[CatalogEntry]:
+        """Return all layers of a type ("raster", "vector" or "strds")."""
+        index = self.__build()
+        return self.__entries(
+            np.nonzero(index["kind"] == KINDS.index(kind))[0]
+        )
+
+    def layer(self, entry: CatalogEntry):
+        """Return the Raster, Vector or SpaceTimeRasterDataset of an entry."""
+        mapset = self.__actinia.get_locations()[entry.location].get_mapsets()[
+            entry.mapset
+        ]
+        if entry.kind == "raster":
+            return mapset.get_raster_layers()[entry.name]
+        if entry.kind == "vector":
+            return mapset.get_vector_layers()[entry.name]
+        return mapset.get_strds()[entry.name]
+
+    def build_spatial_index(self, max_in_flight: int = 8):
+        """Request the extents of all layers into a SpatialIndex.
+
+        The spatial index is saved and loaded with the catalog.
+
+        Parameters
+        ----------
+        max_in_flight: int
+            Maximal number of concurrent requests
+
+        Returns
+        -------
+        SpatialIndex
+
+        """
+        from actinia.spatial_index import SpatialIndex
+
+        self.spatial_index = SpatialIndex(self.__actinia).build(
+            self, max_in_flight
+        )
+        return self.spatial_index
+
+    def save(self, path: str | Path) -> None:
+        """Save the catalog and its spatial index to a file.
+
+        Parameters
+        ----------
+        path: str | Path
+            Path of the catalog file
+
+        """
+        index = self.__build()
+        arrays = {key: value for key, value in index.items() if key != "names"}
+        meta = {"mapsets": self.__mapsets}
+        if self.spatial_index is not None:
+            spatial_meta, spatial_arrays = self.spatial_index.to_arrays()
+            meta["spatial_index"] = spatial_meta
+            for key, value in spatial_arrays.items():
+                arrays[f"spatial_{key}"] = value
+        write_arrays(path, meta, arrays)
+
+    @classmethod
+    def load(cls, actinia: Actinia, path: str | Path) -> Catalog:
+        """Load a catalog file, memory-mapping the index.
+
+        A saved spatial index is loaded as well.
+
+        Parameters
+        ----------
+        actinia: Actinia
+            The Actinia instance of the server
+        path: str | Path
+            Path of the catalog file written by save
+
+        Returns
+        -------
+        Catalog
+
+        """
+        meta, arrays = read_arrays(path)
+        catalog = cls(actinia)
+        catalog.__mapsets = [tuple(key) for key in meta["mapsets"]]
+        spatial_arrays = {
+            key.split("_", 1)[1]: arrays.pop(key)
+            for key in list(arrays)
+            if key.startswith("spatial_")
+        }
+        arrays["names"] = _NameView(arrays["blob"], arrays["offsets"])
+        catalog.__index = arrays
+        if "spatial_index" in meta:
+            from actinia.spatial_index import SpatialIndex
+
+            catalog.spatial_index = SpatialIndex.from_arrays(
+                actinia, meta["spatial_index"], spatial_arrays
+            )
+        return catalog
@@ -0,0 +1,280 @@
+#!/usr/bin/env python
+
+"""The estimator module predicts the cost of process chains.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import json
+import math
+import re
+from collections import deque
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING
+
+from actinia.utils import load_process_chain
+
+if TYPE_CHECKING:
+    from actinia.job import Job
+    from actinia.region import Region
+
+# Run time model for modules without recorded run times:
+# DEFAULT_OVERHEAD seconds plus DEFAULT_SECONDS_PER_CELL seconds per cell
+DEFAULT_OVERHEAD = 0.5
+DEFAULT_SECONDS_PER_CELL = 1e-7
+MAX_SAMPLES = 200
+# Cells in the output of g.region -g
+CELLS_PATTERN = re.compile(r"^cells=(\d+)\s*$", re.MULTILINE)
+# Recorded run times with cells needed per module to use its model for
+# selecting synchronous processing
+MIN_SAMPLES = 3
+
+
+class CostEstimator:
+    """Estimate run time and cell usage of process chains.
+
+    The run time of each module is modelled as a linear function of the
+    cells of the computational region. The models are fitted to the run
+    times of the process logs of finished jobs recorded with ``record``.
+    """
+
+    def __init__(
+        self,
+        max_samples: int = MAX_SAMPLES,
+        min_samples: int = MIN_SAMPLES,
+    ) -> None:
+        """Initialize the CostEstimator object.
+
+        Parameters
+        ----------
+        max_samples: int
+            Maximal number of recorded run times per module, older run
+            times are discarded
+        min_samples: int
+            Number of recorded run times with cells per module needed to
+            trust its model, see covers
+
+        """
+        self.max_samples = max_samples
+        self.min_samples = min_samples
+        self.samples = {}
+        self.__models = {}
+        self.__lock = Lock()
+
+    def add_sample(
+        self,
+        module: str,
+        run_time: float,
+        cells: int | None = None,
+    ) -> None:
+        """Add the run time of a module.
+
+        Parameters
+        ----------
+        module: str
+            Name of the module (executable)
+        run_time: float
+            Run time of the module in seconds
+        cells: int | None
+            Cells of the computational region the module ran in
+
+        """
+        with self.__lock:
+            samples = self.samples.setdefault(
+                module, deque(maxlen=self.max_samples)
+            )
+            samples.append((None if cells is None else int(cells), run_time))
+            self.__models.pop(module, None)
+
+    def record(self, job: Job, region: Region | None = None) -> None:
+        """Record the run times of the process log of a finished job.
+
+        The modules are recorded with the cells of the region the job was
+        started in. Regions set by g.region with the -g flag in the
+        process chain apply to the following modules.
+
+        Parameters
+        ----------
+        job: Job
+            Finished job with process log
+        region: Region | None
+            Computational region the job was started in, defaults to the
+            region of the job
+
+        """
+        if region is None:
+            region = getattr(job, "region", None)
+        cells = getattr(region, "cells", None)
+        for entry in getattr(job, "process_log", None) or []:
+            module = entry.get("executable")
+            run_time = entry.get("run_time")
+            if module is None or run_time is None:
+                continue
+            self.add_sample(module, float(run_time), cells)
+            if module == "g.region":
+                match = CELLS_PATTERN.search(entry.get("stdout") or "")
+                if match is not None:
+                    cells = int(match.group(1))
+
+    def covers(self, pc: str | dict) -> bool:
+        """Return whether all modules of a process chain have enough
+        recorded run times with cells for their models.
+
+        Parameters
+        ----------
+        pc: str | dict
+            The actinia process chain
+
+        Returns
+        -------
+        covers: bool
+            True if each module has at least min_samples run times
+
+        """
+        modules = {
+            item["module"] for item in load_process_chain(pc).get("list", [])
+        }
+        with self.__lock:
+            counts = [
+                sum(c is not None for c, _ in self.samples.get(module, ()))
+                for module in modules
+            ]
+        return all(count >= self.min_samples for count in counts)
+
+    def model(self, module: str) -> tuple[float, float]:
+        """Return the run time model of a module.
+
+        Parameters
+        ----------
+        module: str
+            Name of the module (executable)
+
+        Returns
+        -------
+        model: tuple[float, float]
+            Overhead in seconds and seconds per cell
+
+        """
+        with self.__lock:
+            if module in self.__models:
+                return self.__models[module]
+            samples = list(self.samples.get(module, []))
+        with_cells = [(c, t) for c, t in samples if c is not None]
+        if len({c for c, _ in with_cells}) > 1:
+            # least squares fit of run_time = overhead + slope * cells
+            n = len(with_cells)
+            mean_c = sum(c for c, _ in with_cells) / n
+            mean_t = sum(t for _, t in with_cells) / n
+            var = sum((c - mean_c) ** 2 for c, _ in with_cells)
+            cov = sum((c - mean_c) * (t - mean_t) for c, t in with_cells)
+            slope = max(cov / var, 0.0)
+            overhead = max(mean_t - slope * mean_c, 0.0)
+        elif with_cells:
+            cells = with_cells[0][0]
+            mean_t = sum(t for _, t in with_cells) / len(with_cells)
+            overhead = 0.0
+            slope = mean_t / cells if cells else 0.0
+        elif samples:
+            overhead = sum(t for _, t in samples) / len(samples)
+            slope = 0.0
+        else:
+            overhead = DEFAULT_OVERHEAD
+            slope = DEFAULT_SECONDS_PER_CELL
+        with self.__lock:
+            self.__models[module] = (overhead, slope)
+        return overhead, slope
+
+    def estimate(
+        self,
+        pc: str | dict,
+        region: Region,
+        max_cells: int | None = None,
+        max_runtime: float | None = None,
+    ) -> dict:
+        """Estimate run time and cell usage of a process chain.
+
+        Parameters
+        ----------
+        pc: str | dict
+            The actinia process chain
+        region: Region
+            Computational region the process chain is processed in
+        max_cells: int | None
+            Cell limit of the user
+        max_runtime: float | None
+            Process time limit of the user in seconds
+
+        Returns
+        -------
+        estimate: dict
+            Predicted "runtime" and "cells" per step in "steps", the total
+            "runtime", the maximal "cells", "exceeds_limits" and the number
+            of tiles ("split") to process the chain within the limits
+
+        """
+        cells = int(region.cells) if region and region.cells else 0
+        steps = []
+        for item in load_process_chain(pc).get("list", []):
+            overhead, slope = self.model(item["module"])
+            steps.append(
+                {
+                    "id": item.get("id"),
+                    "module": item["module"],
+                    "cells": cells,
+                    "runtime": overhead + slope * cells,
+                }
+            )
+        runtime = sum(step["runtime"] for step in steps)
+        split = 1
+        if max_cells and cells > max_cells:
+            split = math.ceil(cells / max_cells)
+        if max_runtime and runtime > max_runtime:
+            split = max(split, math.ceil(runtime / max_runtime))
+        return {
+            "steps": steps,
+            "runtime": runtime,
+            "cells": cells,
+            "exceeds_limits": split > 1,
+            "split": split,
+        }
+
+    def save(self, path: str | Path) -> None:
+        """Save the recorded run times as JSON file.
+
+        Parameters
+        ----------
+        path: str | Path
+            Path of the JSON file
+
+        """
+        with self.__lock:
+            samples = {k: list(v) for k, v in self.samples.items()}
+        Path(path).write_text(json.dumps(samples), encoding="UTF8")
+
+    def load(self, path: str | Path) -> None:
+        """Load recorded run times from a JSON file.
+
+        Parameters
+        ----------
+        path: str | Path
+            Path of the JSON file written by ``save``
+
+        """
+        samples = json.loads(Path(path).read_text(encoding="UTF8"))
+        for module, module_samples in samples.items():
+            for cells, run_time in module_samples:
+                self.add_sample(module, run_time, cells)
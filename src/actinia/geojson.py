@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+"""The geojson module parses GeoJSON feature collections incrementally.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import codecs
+import json
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+CHUNK_SIZE = 1024 * 1024
+WHITESPACE = " \t\n\r"
+SCALARS = (str, int, float, bool)
+
+
+class _Reader:
+    """Buffer over text chunks for decoding one JSON value after another."""
+
+    def __init__(self, chunks: Iterator[bytes | str]) -> None:
+        self.__chunks = chunks
+        self.__decoder = codecs.getincrementaldecoder("utf-8")()
+        self.__json = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk to the buffer, return False at the end."""
+        if self.eof:
+            return False
+        chunk = next(self.__chunks, None)
+        if chunk is None:
+            self.eof = True
+            chunk = self.__decoder.decode(b"", final=True)
+        elif not isinstance(chunk, str):
+            chunk = self.__decoder.decode(chunk)
+        pos = self.pos
+        self.buffer = self.buffer[pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Skip whitespace and return the next character, "" at the end."""
+        while True:
+            while (
+                self.pos < len(self.buffer)
+                and self.buffer[self.pos] in WHITESPACE
+            ):
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, characters: str) -> str:
+        """Consume the next character, which must be one of characters.
+
+        Raises
+        ------
+        ValueError
+            ValueError for other characters.
+
+        """
+        character = self.peek()
+        if not character or character not in characters:
+            msg = (
+                f"Invalid GeoJSON: expected one of {characters!r}, got "
+                f"{character or 'end of data'!r}."
+            )
+            raise ValueError(msg)
+        self.pos += 1
+        return character
+
+    def value(self) -> object:
+        """Decode the next JSON value, reading more chunks if needed.
+
+        Raises
+        ------
+        ValueError
+            ValueError for invalid JSON.
+
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.__json.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # the value may continue in the next chunk
+                if not self.fill():
+                    raise
+                continue
+            # numbers at the end of the buffer may continue as well
+            if end == len(self.buffer) and not self.eof:
+                self.fill()
+                continue
+            self.pos = end
+            return value
+
+
+def iter_features(
+    source: str | Path | Iterable[bytes | str],
+    chunk_size: int = CHUNK_SIZE,
+    members: dict | None = None,
+) -> Iterator[dict]:
+    """Yield the features of a GeoJSON FeatureCollection one by one.
+
+    The GeoJSON is read in chunks and only the current feature is decoded,
+    so the memory use does not depend on the number of features.
+
+    Parameters
+    ----------
+    source: str | Path | Iterable[bytes | str]
+        Path of a GeoJSON file, a binary or text file object or an
+        iterable of UTF-8 encoded or decoded chunks, e.g. of a streamed
+        HTTP response
+    chunk_size: int
+        Number of bytes to read at once from paths and file objects
+    members: dict | None
+        If given, the other members of the collection, e.g. "crs", are
+        added to it as they are read
+
+    Yields
+    ------
+    feature: dict
+        The features of the collection
+
+    Raises
+    ------
+    ValueError
+        ValueError if the GeoJSON is not a FeatureCollection.
+
+    """
+    if isinstance(source, (str, Path)):
+        with Path(source).open("rb") as file:
+            yield from iter_features(file, chunk_size, members)
+        return
+    if hasattr(source, "read"):
+        file = source
+        source = iter(lambda: file.read(chunk_size), file.read(0))
+    reader = _Reader(iter(source))
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key != "features":
+            value = reader.value()
+            if members is not None:
+                members[key] = value
+        else:
+            reader.expect("[")
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    yield reader.value()
+                    if reader.expect(",]") == "]":
+                        break
+        if reader.expect(",}") == "}":
+            return
+
+
+def split_features(
+    path: str | Path,
+    n_chunks: int,
+    directory: str | Path,
+    prefix: str = "chunk",
+) -> list[dict]:
+    """Split a GeoJSON FeatureCollection into files of consecutive features.
+
+    The file is read twice, first to count the features and to find the
+    properties with floating point values, then to write the chunks. Each
+    feature is written with all properties, missing properties as null
+    and integers of floating point properties as floats, so the chunks
+    are imported with the same attribute columns.
+
+    Parameters
+    ----------
+    path: str | Path
+        Path of the GeoJSON file
+    n_chunks: int
+        Number of chunks, fewer if the file has less features
+    directory: str | Path
+        Directory to write the chunks to
+    prefix: str
+        Prefix of the chunk file names
+
+    Returns
+    -------
+    chunks: list[dict]
+        "path", number of "features" and "geometry_types" per chunk
+
+    """
+    # all property keys and if they have floating point values
+    float_keys = {}
+    n_features = 0
+    for feature in iter_features(path):
+        n_features += 1
+        for key, value in (feature.get("properties") or {}).items():
+            is_float = isinstance(value, float)
+            float_keys[key] = float_keys.get(key, False) or is_float
+    n_chunks = max(min(n_chunks, n_features), 1)
+    chunk_features = -(-n_features // n_chunks)
+    members = {}
+    chunks = []
+    file = None
+    try:
+        for i, feature in enumerate(iter_features(path, members=members)):
+            if i % chunk_features == 0:
+                if file is not None:
+                    file.write("\n]}\n")
+                    file.close()
+                header = {
+                    "type": "FeatureCollection",
+                    **{
+                        key: value
+                        for key, value in members.items()
+                        if key not in {"type", "bbox"}
+                    },
+                }
+                chunk_path = (
+                    Path(directory) / f"{prefix}_{len(chunks)}.geojson"
+                )
+                file = chunk_path.open("w", encoding="utf-8")
+                file.write(json.dumps(header)[:-1] + ', "features": [\n')
+                chunks.append(
+                    {
+                        "path": chunk_path,
+                        "features": 0,
+                        "geometry_types": set(),
+                    }
+                )
+            else:
+                file.write(",\n")
+            values = feature.get("properties") or {}
+            feature["properties"] = properties = {
+                key: values.get(key) for key in float_keys
+            }
+            for key, is_float in float_keys.items():
+                value = properties[key]
+                if is_float and type(value) is int:
+                    properties[key] = float(value)
+            file.write(json.dumps(feature))
+            chunks[-1]["features"] += 1
+            geometry = feature.get("geometry") or {}
+            chunks[-1]["geometry_types"].add(geometry.get("type"))
+        if file is not None:
+            file.write("\n]}\n")
+    finally:
+        if file is not None:
+            file.close()
+    return chunks
+
+
+def iter_batches(
+    features: Iterable[dict],
+    batch_size: int = 10000,
+    columns: list[str] | None = None,
+) -> Iterator[dict]:
+    """Yield batches of features as columnar numpy arrays.
+
+    Parameters
+    ----------
+    features: Iterable[dict]
+        GeoJSON features, e.g. from iter_features
+    batch_size: int
+        Maximal number of features per batch
+    columns: list[str] | None
+        Properties to return, by default all properties of the features
+
+    Yields
+    ------
+    batch: dict
+        dict with the object array "geometry" of GeoJSON geometries and an
+        array per property; properties missing in a feature are None
+
+    """
+    features = iter(features)
+    while True:
+        batch = list(islice(features, batch_size))
+        if not batch:
+            return
+        properties = [feature.get("properties") or {} for feature in batch]
+        names = columns
+        if names is None:
+            names = list(dict.fromkeys(key for p in properties for key in p))
+        geometries = np.empty(len(batch), dtype=object)
+        geometries[:] = [feature.get("geometry") for feature in batch]
+        arrays = {"geometry": geometries}
+        for name in names:
+            values = [p.get(name) for p in properties]
+            if all(isinstance(value, SCALARS) for value in values):
+                array = np.asarray(values)
+            else:
+                # missing values, lists and objects
+                array = np.empty(len(values), dtype=object)
+                array[:] = values
+            arrays[name] = array
+        yield arrays
@@ -0,0 +1,489 @@
+#!/usr/bin/env python
+
+"""The geotiff module encodes and decodes numpy arrays as GeoTIFF.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import struct
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from actinia.region import Region
+
+# TIFF field types: (type id, struct format)
+SHORT = (3, "H")
+LONG = (4, "I")
+DOUBLE = (12, "d")
+ASCII = (2, "s")
+# SampleFormat by numpy dtype kind
+SAMPLE_FORMATS = {"u": 1, "i": 2, "f": 3}
+# Rows per strip are chosen to get strips of about this size
+STRIP_SIZE = 1024 * 1024
+# numpy dtypes of the TIFF field types, rationals as pairs
+FIELD_DTYPES = {
+    1: "u1",
+    2: "u1",
+    3: "u2",
+    4: "u4",
+    5: "u4",
+    6: "i1",
+    7: "u1",
+    8: "i2",
+    9: "i4",
+    10: "i4",
+    11: "f4",
+    12: "f8",
+    16: "u8",
+    17: "i8",
+    18: "u8",
+}
+RATIONAL_TYPES = {5, 10}
+# TIFF compressions supported by read
+NO_COMPRESSION = 1
+LZW = 5
+DEFLATE = (8, 32946)
+
+
+def _geographic(epsg: int) -> bool:
+    """Return if an EPSG code is a geographic CRS (EPSG 4000 - 4999)."""
+    return 4000 <= epsg < 5000
+
+
+def _geokeys(epsg: int | None) -> list[int]:
+    """Return the GeoKeyDirectory of a CRS given as EPSG code."""
+    keys = [(1025, 0, 1, 1)]  # GTRasterTypeGeoKey: PixelIsArea
+    if epsg is not None:
+        if _geographic(epsg):
+            keys += [(1024, 0, 1, 2), (2048, 0, 1, epsg)]
+        else:
+            keys += [(1024, 0, 1, 1), (3072, 0, 1, epsg)]
+    keys.sort()
+    directory = [1, 1, 0, len(keys)]
+    for key in keys:
+        directory.extend(key)
+    return directory
+
+
+def encode(
+    array: np.ndarray,
+    region: Region,
+    epsg: int | None = None,
+    nodata: float | None = None,
+) -> bytearray:
+    """Encode a 2D array as uncompressed GeoTIFF.
+
+    Parameters
+    ----------
+    array: numpy.ndarray
+        2D array with rows from north to south, bool, (u)int8, (u)int16,
+        (u)int32, float32 or float64
+    region: Region
+        Extent of the array; the resolution is computed from the array
+        shape if not set
+    epsg: int | None
+        EPSG code of the coordinate reference system
+    nodata: float | None
+        No data value
+
+    Returns
+    -------
+    geotiff: bytearray
+        The GeoTIFF file
+
+    Raises
+    ------
+    ValueError
+        ValueError if the array is not 2D, its shape does not match the
+        region or it is larger than 4 GiB.
+    TypeError
+        TypeError for unsupported data types.
+
+    """
+    array = np.asarray(array)
+    if array.dtype == bool:
+        array = array.astype(np.uint8)
+    if array.ndim != 2:
+        msg = f"Array must be 2D, got {array.ndim} dimensions."
+        raise ValueError(msg)
+    if array.dtype.kind not in SAMPLE_FORMATS or array.dtype.itemsize > 8:
+        msg = f"Unsupported data type {array.dtype}."
+        raise TypeError(msg)
+    if array.dtype.itemsize == 8 and array.dtype.kind != "f":
+        msg = f"Unsupported data type {array.dtype}, use 32 bit integers."
+        raise TypeError(msg)
+    rows, cols = array.shape
+    if (region.rows, region.cols) not in ((None, None), (rows, cols)):
+        msg = (
+            f"Array shape {array.shape} does not match region "
+            f"({region.rows}, {region.cols})."
+        )
+        raise ValueError(msg)
+    nsres = region.nsres or (region.n - region.s) / rows
+    ewres = region.ewres or (region.e - region.w) / cols
+    dtype = array.dtype.newbyteorder("<")
+    if array.nbytes > 2**32 - 2**20:
+        msg = "Arrays larger than 4 GiB are not supported."
+        raise ValueError(msg)
+
+    row_bytes = cols * dtype.itemsize
+    rows_per_strip = max(1, min(rows, STRIP_SIZE // max(row_bytes, 1)))
+    n_strips = -(-rows // rows_per_strip)
+    strip_counts = [
+        min(rows_per_strip, rows - i * rows_per_strip) * row_bytes
+        for i in range(n_strips)
+    ]
+    tags = [
+        (256, LONG, [cols]),
+        (257, LONG, [rows]),
+        (258, SHORT, [dtype.itemsize * 8]),
+        (259, SHORT, [1]),
+        (262, SHORT, [1]),
+        (273, LONG, [0] * n_strips),
+        (277, SHORT, [1]),
+        (278, LONG, [rows_per_strip]),
+        (279, LONG, strip_counts),
+        (284, SHORT, [1]),
+        (339, SHORT, [SAMPLE_FORMATS[dtype.kind]]),
+        (33550, DOUBLE, [ewres, nsres, 0.0]),
+        (33922, DOUBLE, [0.0, 0.0, 0.0, region.w, region.n, 0.0]),
+        (34735, SHORT, _geokeys(epsg)),
+    ]
+    if nodata is not None:
+        tags.append((42113, ASCII, [f"{nodata}".encode("ascii") + b"\0"]))
+
+    def pack(field_type, values):
+        if field_type is ASCII:
+            return values[0]
+        return struct.pack(f"<{len(values)}{field_type[1]}", *values)
+
+    # header, IFD and the values not fitting into the IFD entries
+    ifd_size = 2 + 12 * len(tags) + 4
+    extra_offset = 8 + ifd_size
+    extra = b""
+    for _ in range(2):
+        # the strip offsets depend on the size of the extra values
+        data_offset = extra_offset + len(extra)
+        data_offset += -data_offset % 16
+        offsets = [
+            data_offset + sum(strip_counts[:i]) for i in range(n_strips)
+        ]
+        tags[5] = (273, LONG, offsets)
+        entries = b""
+        extra = b""
+        for tag, field_type, values in tags:
+            value = pack(field_type, values)
+            count = len(value) if field_type is ASCII else len(values)
+            if len(value) <= 4:
+                entry_value = value.ljust(4, b"\0")
+            else:
+                entry_value = struct.pack("<I", extra_offset + len(extra))
+                extra += value + b"\0" * (len(value) % 2)
+            entries += struct.pack("<HHI", tag, field_type[0], count)
+            entries += entry_value
+    header = struct.pack("<2sHI", b"II", 42, 8)
+    ifd = struct.pack("<H", len(tags)) + entries + struct.pack("<I", 0)
+    head = header + ifd + extra
+    # copy the array only once, directly into the file buffer
+    geotiff = bytearray(data_offset + array.nbytes)
+    geotiff[: len(head)] = head
+    np.frombuffer(geotiff, dtype=dtype, offset=data_offset).reshape(
+        rows, cols
+    )[:] = array
+    return geotiff
+
+
+def _read_tags(file) -> tuple[str, dict]:
+    """Read the tags of the first IFD of a TIFF or BigTIFF file."""
+    header = file.read(16)
+    if header[:2] == b"II":
+        order = "<"
+    elif header[:2] == b"MM":
+        order = ">"
+    else:
+        msg = "Not a TIFF file."
+        raise ValueError(msg)
+    (version,) = struct.unpack(f"{order}H", header[2:4])
+    if version == 42:
+        (ifd,) = struct.unpack(f"{order}I", header[4:8])
+        count_format, entry_format, value_size = "H", "HHI", 4
+    elif version == 43:
+        (ifd,) = struct.unpack(f"{order}Q", header[8:16])
+        count_format, entry_format, value_size = "Q", "HHQ", 8
+    else:
+        msg = f"Unknown TIFF version {version}."
+        raise ValueError(msg)
+    offset_format = f"{order}{'I' if value_size == 4 else 'Q'}"
+    entry_size = struct.calcsize(f"{order}{entry_format}") + value_size
+    file.seek(ifd)
+    count_size = struct.calcsize(count_format)
+    (count,) = struct.unpack(f"{order}{count_format}", file.read(count_size))
+    entries = file.read(count * entry_size)
+    tags = {}
+    for i in range(count):
+        start = i * entry_size
+        stop = start + entry_size
+        entry = entries[start:stop]
+        tag, field_type, n = struct.unpack_from(
+            f"{order}{entry_format}", entry
+        )
+        if field_type not in FIELD_DTYPES:
+            continue
+        dtype = np.dtype(FIELD_DTYPES[field_type]).newbyteorder(order)
+        n_values = n * (2 if field_type in RATIONAL_TYPES else 1)
+        size = n_values * dtype.itemsize
+        raw = entry[-value_size:]
+        if size > value_size:
+            file.seek(struct.unpack(offset_format, raw)[0])
+            raw = file.read(size)
+        raw = raw[:size]
+        if field_type == 2:
+            tags[tag] = raw.rstrip(b"\0").decode("ascii", "replace")
+            continue
+        values = np.frombuffer(raw, dtype=dtype)
+        if field_type in RATIONAL_TYPES:
+            values = values[0::2] / values[1::2]
+        tags[tag] = values
+    return order, tags
+
+
+def _lzw_decode(data: bytes) -> bytes:
+    """Decode TIFF LZW compressed data (MSB first, early change)."""
+    table = [bytes([i]) for i in range(256)] + [b"", b""]
+    out = bytearray()
+    n_bits = 9
+    position = 0
+    total_bits = len(data) * 8
+    data = bytes(data) + b"\0\0\0"
+    previous = None
+    while position + n_bits <= total_bits:
+        start = position >> 3
+        stop = start + 3
+        window = int.from_bytes(data[start:stop], "big")
+        code = (window >> (24 - (position & 7) - n_bits)) & ((1 << n_bits) - 1)
+        position += n_bits
+        if code == 256:
+            del table[258:]
+            n_bits = 9
+            previous = None
+            continue
+        if code == 257:
+            break
+        if previous is None:
+            entry = table[code]
+        else:
+            if code < len(table):
+                entry = table[code]
+            else:
+                entry = previous + previous[:1]
+            table.append(previous + entry[:1])
+        out += entry
+        previous = entry
+        if len(table) + 1 >= 1 << n_bits and n_bits < 12:
+            n_bits += 1
+    return bytes(out)
+
+
+def _decode_block(
+    raw: bytes,
+    compression: int,
+    predictor: int,
+    dtype: np.dtype,
+    shape: tuple[int, int, int],
+) -> np.ndarray:
+    """Decompress a strip or tile into an array of shape (rows, cols, bands).
+
+    Raises
+    ------
+    ValueError
+        ValueError for unsupported compressions and predictors.
+
+    """
+    if compression in DEFLATE:
+        raw = zlib.decompress(raw)
+    elif compression == LZW:
+        raw = _lzw_decode(raw)
+    elif compression != NO_COMPRESSION:
+        msg = f"Unsupported TIFF compression {compression}."
+        raise ValueError(msg)
+    rows, cols, bands = shape
+    count = rows * cols * bands
+    if predictor == 3:
+        # floating point predictor: byte planes with horizontal differencing
+        # between the bytes of the same sample of neighbouring pixels, which
+        # are one pixel (the samples per pixel) apart within a byte plane
+        planes = np.frombuffer(raw, np.uint8, count * dtype.itemsize)
+        planes = np.cumsum(
+            planes.reshape(rows, -1, bands), axis=1, dtype=np.uint8
+        ).reshape(rows, dtype.itemsize, cols * bands)
+        values = np.ascontiguousarray(planes.transpose(0, 2, 1))
+        return values.view(dtype.newbyteorder(">")).reshape(shape)
+    block = np.frombuffer(raw, dtype, count).reshape(shape)
+    if predictor == 2:
+        block = np.cumsum(block, axis=1, dtype=block.dtype)
+    elif predictor != 1:
+        msg = f"Unsupported TIFF predictor {predictor}."
+        raise ValueError(msg)
+    return block
+
+
+def _region(tags: dict, rows: int, cols: int) -> Region:
+    """Return the extent of a GeoTIFF from its georeferencing tags."""
+    region = Region(rows=rows, cols=cols, cells=rows * cols)
+    if 33550 in tags and 33922 in tags:
+        ewres, nsres = float(tags[33550][0]), float(tags[33550][1])
+        i, j, _, x, y, _ = (float(value) for value in tags[33922][:6])
+        w = x - i * ewres
+        n = y + j * nsres
+    elif 34264 in tags:
+        matrix = tags[34264]
+        ewres, nsres = float(matrix[0]), -float(matrix[5])
+        w, n = float(matrix[3]), float(matrix[7])
+    else:
+        return region
+    geokeys = tags.get(34735)
+    if geokeys is not None:
+        keys = np.asarray(geokeys[4:], dtype=np.int64).reshape(-1, 4)
+        raster_type = keys[keys[:, 0] == 1025, 3]
+        if len(raster_type) and raster_type[0] == 2:
+            # PixelIsPoint: the tie point is the center of the pixel
+            w -= ewres / 2
+            n += nsres / 2
+    region.n = n
+    region.s = n - rows * nsres
+    region.w = w
+    region.e = w + cols * ewres
+    region.nsres = nsres
+    region.ewres = ewres
+    return region
+
+
+def read(
+    path: str | Path,
+    out_path: str | Path | None = None,
+) -> tuple[np.ndarray, Region, float | None]:
+    """Read a single image GeoTIFF into a memory-mapped numpy array.
+
+    Uncompressed GeoTIFFs with consecutive strips are memory-mapped
+    directly. Otherwise the strips or tiles are decoded one by one into
+    a memory-mapped .npy file, so the file does not need to fit into
+    memory. Supported are stripped and tiled, uncompressed, deflate and
+    LZW compressed GeoTIFFs and BigTIFFs with horizontal and floating
+    point predictor.
+
+    Parameters
+    ----------
+    path: str | Path
+        Path of the GeoTIFF
+    out_path: str | Path | None
+        Path of the .npy file for decoded data, defaults to path with
+        suffix .npy
+
+    Returns
+    -------
+    array: numpy.ndarray
+        Read-only memory-mapped array of shape (rows, cols) or
+        (rows, cols, bands)
+    region: Region
+        Extent and resolution of the array
+    nodata: float | None
+        No data value of the GeoTIFF
+
+    Raises
+    ------
+    ValueError
+        ValueError for unsupported TIFF files.
+
+    """
+    path = Path(path)
+    with path.open("rb") as file:
+        order, tags = _read_tags(file)
+        cols, rows = int(tags[256][0]), int(tags[257][0])
+        bands = int(tags.get(277, [1])[0])
+        bits = int(tags.get(258, [1])[0])
+        sample_format = int(tags.get(339, [1])[0])
+        compression = int(tags.get(259, [1])[0])
+        predictor = int(tags.get(317, [1])[0])
+        if bands > 1 and int(tags.get(284, [1])[0]) != 1:
+            msg = "Only pixel interleaved multi band GeoTIFFs are supported."
+            raise ValueError(msg)
+        kinds = {value: kind for kind, value in SAMPLE_FORMATS.items()}
+        if sample_format not in kinds or bits % 8:
+            msg = f"Unsupported sample format {sample_format} ({bits} bit)."
+            raise ValueError(msg)
+        dtype = np.dtype(f"{kinds[sample_format]}{bits // 8}")
+        dtype = dtype.newbyteorder(order)
+        if 322 in tags:
+            block_cols, block_rows = int(tags[322][0]), int(tags[323][0])
+            offsets, counts = tags[324], tags[325]
+        else:
+            block_cols = cols
+            block_rows = min(int(tags.get(278, [rows])[0]), rows)
+            offsets, counts = tags[273], tags[279]
+        region = _region(tags, rows, cols)
+        nodata = tags.get(42113)
+        nodata = float(nodata) if nodata else None
+        shape = (rows, cols) if bands == 1 else (rows, cols, bands)
+
+        offsets = np.asarray(offsets, dtype=np.int64)
+        counts = np.asarray(counts, dtype=np.int64)
+        contiguous = bool(np.all(offsets[1:] == offsets[:-1] + counts[:-1]))
+        if (
+            compression == NO_COMPRESSION
+            and predictor == 1
+            and block_cols == cols
+            and contiguous
+        ):
+            array = np.memmap(
+                path,
+                dtype=dtype,
+                mode="r",
+                offset=int(offsets[0]),
+                shape=shape,
+            )
+            return array, region, nodata
+
+        out_path = path.with_suffix(".npy") if out_path is None else out_path
+        out = np.lib.format.open_memmap(
+            out_path, mode="w+", dtype=dtype.newbyteorder("="), shape=shape
+        )
+        view = out.reshape(rows, cols, bands)
+        blocks_across = -(-cols // block_cols)
+        for index, (offset, count) in enumerate(zip(offsets, counts)):
+            row = index // blocks_across * block_rows
+            col = index % blocks_across * block_cols
+            if row >= rows:
+                break
+            # strips at the bottom may be shorter, tiles are padded
+            height = block_rows if 322 in tags else min(block_rows, rows - row)
+            file.seek(int(offset))
+            block = _decode_block(
+                file.read(int(count)),
+                compression,
+                predictor,
+                dtype,
+                (height, block_cols, bands),
+            )
+            stop_row = min(row + height, rows)
+            stop_col = min(col + block_cols, cols)
+            view[row:stop_row, col:stop_col] = block[
+                : stop_row - row, : stop_col - col
+            ]
+        out.flush()
+        del out, view
+    return np.load(out_path, mmap_mode="r"), region, nodata
@@ -16,10 +16,12 @@ __author__ = "Anika Weinmann"
 __copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
 __maintainer__ = "Anika Weinmann"
 
+from pathlib import Path
 from time import sleep
 
+from actinia import geotiff
 from actinia.resources.logger import log
-from actinia.utils import request_and_check
+from actinia.utils import DOWNLOAD_DIR, download_file, request_and_check
 
 
 class Job:
@@ -29,12 +31,34 @@ class Job:
         actinia,
         auth,
         actinia_json_dict,
+        region=None,
+        cache_path=None,
     ):
         self.name = name
+        self.region = region
         self.__actinia = actinia
         self.__auth = auth
+        self.__cache_path = cache_path
+        self.__done = False
         for key in actinia_json_dict:
             setattr(self, key, actinia_json_dict[key])
+        self.__on_done()
+
+    def __on_done(self):
+        """
+        Record the run times of a finished job for cost estimation and
+        invalidate the cached resources the job may have changed.
+        """
+        status = getattr(self, "status", None)
+        if self.__done or status in [None, "accepted", "running"]:
+            return
+        self.__done = True
+        estimator = getattr(self.__actinia, "cost_estimator", None)
+        if estimator is not None and status == "finished":
+            estimator.record(self)
+        cache = getattr(self.__actinia, "cache", None)
+        if cache is not None and self.__cache_path is not None:
+            cache.invalidate(path=self.__cache_path)
 
     def __update(
         self,
@@ -69,6 +93,7 @@ class Job:
         self.__update(
             resp,
         )
+        self.__on_done()
         if not quiet:
             log.info(f"Status of {self.name} job is {self.status}.")
 
@@ -82,6 +107,9 @@ class Job:
                    changed
             retries: Integer number of retries in case of ReadTimeout
         """
+        if self.status not in ["accepted", "running"]:
+            # e.g. jobs of synchronous processing are already done
+            return 0 if self.status == "finished" else 1
         status_accepted_running = True
         status = None
         while status_accepted_running:
@@ -107,6 +135,56 @@ class Job:
                 )
                 log.info(msg)
 
+    def download(self, directory=None, retries=2):
+        """
+        Download the exported resources of a finished job.
+
+        Args:
+            directory: Directory to write the files to, by default a
+                       directory named by the resource ID in DOWNLOAD_DIR;
+                       files already in the directory are not downloaded
+                       again
+            retries: Integer number of retries after connection errors
+
+        Returns:
+            (list): list with the paths of the downloaded files
+        """
+        if self.status != "finished":
+            raise RuntimeError(
+                f"The {self.name} job is {self.status}, only resources of "
+                "finished jobs can be downloaded."
+            )
+        if directory is None:
+            directory = DOWNLOAD_DIR / self.resource_id
+        kwargs = {"auth": self.__auth, "timeout": self.__actinia.timeout}
+        paths = []
+        for url in self.urls.get("resources", []):
+            path = Path(directory) / url.rstrip("/").rsplit("/", 1)[-1]
+            # the resources of a job do not change, so reuse earlier
+            # downloads
+            if not path.exists():
+                download_file(url, path, retries=retries, **kwargs)
+            paths.append(path)
+        log.debug(f"Downloaded {len(paths)} resources of {self.name} job.")
+        return paths
+
+    def to_numpy(self, resource=0, directory=None, retries=2):
+        """
+        Download an exported GeoTIFF and read it into a memory-mapped
+        numpy array.
+
+        Args:
+            resource: Index of the exported resource in the job URLs
+            directory: Directory to write the files to, see download
+            retries: Integer number of retries after connection errors
+
+        Returns:
+            (tuple): tuple of the read-only array, its Region and the no
+                     data value
+        """
+        paths = self.download(directory=directory, retries=retries)
+        return geotiff.read(paths[resource])
+
     def terminate(self):
         """Terminate the current job"""
         kwargs = {"auth": self._Job__auth, "timeout": self.__actinia.timeout}
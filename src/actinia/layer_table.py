@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+
+"""The layer_table module provides a columnar table of layer information.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from actinia.region import Region, RegionArray
+from actinia.resources.logger import log
+
+
+def _as_int(value: str | int | None) -> int:
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return -1
+
+
+class LayerTable:
+    """Columnar table with the extents and sizes of layers.
+
+    The table holds the layer names and per layer the extents and
+    resolutions as RegionArray and the rows, columns and cells as int64
+    arrays (-1 if unknown).
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        names: np.ndarray,
+        regions: RegionArray,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        cells: np.ndarray,
+        errors: dict | None = None,
+    ) -> None:
+        """Initialize the LayerTable object.
+
+        Parameters
+        ----------
+        kind: str
+            Layer type: "raster", "vector" or "strds"
+        names: numpy.ndarray
+            Layer names
+        regions: RegionArray
+            Extents and resolutions of the layers
+        rows: numpy.ndarray
+            Number of rows of the layers
+        cols: numpy.ndarray
+            Number of columns of the layers
+        cells: numpy.ndarray
+            Number of cells of the layers
+        errors: dict | None
+            Exceptions of failed requests by layer name
+
+        """
+        self.kind = kind
+        self.names = names
+        self.regions = regions
+        self.rows = rows
+        self.cols = cols
+        self.cells = cells
+        self.errors = errors or {}
+        self.__index = None
+
+    @classmethod
+    def from_info(
+        cls,
+        kind: str,
+        infos: dict[str, dict | None],
+        errors: dict | None = None,
+    ) -> LayerTable:
+        """Create a LayerTable from layer info dicts.
+
+        Parameters
+        ----------
+        kind: str
+            Layer type: "raster", "vector" or "strds"
+        infos: dict[str, dict | None]
+            Info dict by layer name, None for unknown info
+        errors: dict | None
+            Exceptions of failed requests by layer name
+
+        Returns
+        -------
+        LayerTable
+
+        """
+        names = np.array(list(infos), dtype=str)
+        regions = RegionArray.from_regions(
+            Region.from_dict(info or {}) for info in infos.values()
+        )
+        sizes = np.array(
+            [
+                [
+                    _as_int((info or {}).get("rows")),
+                    _as_int((info or {}).get("cols")),
+                    _as_int((info or {}).get("cells")),
+                ]
+                for info in infos.values()
+            ],
+            dtype=np.int64,
+        ).reshape(-1, 3)
+        return cls(kind, names, regions, *sizes.T, errors)
+
+    def __len__(self) -> int:
+        """Return the number of layers."""
+        return len(self.names)
+
+    def index(self, name: str) -> int:
+        """Return the row of a layer.
+
+        Raises
+        ------
+        KeyError
+            KeyError if the layer is not in the table.
+
+        """
+        if self.__index is None:
+            self.__index = {name: i for i, name in enumerate(self.names)}
+        return self.__index[name]
+
+    def select(self, mask: np.ndarray) -> LayerTable:
+        """Return the rows selected by a boolean mask or index array."""
+        return LayerTable(
+            self.kind,
+            self.names[mask],
+            self.regions[mask],
+            self.rows[mask],
+            self.cols[mask],
+            self.cells[mask],
+            self.errors,
+        )
+
+
+def fetch_layer_info(
+    kind: str,
+    layers: dict,
+    max_in_flight: int = 8,
+) -> LayerTable:
+    """Request the info of layers concurrently.
+
+    The info of each layer is requested with its ``get_info`` method, so
+    the info and region of the layer objects are set as well.
+
+    Parameters
+    ----------
+    kind: str
+        Layer type: "raster", "vector" or "strds"
+    layers: dict
+        Raster, Vector or SpaceTimeRasterDataset objects by name
+    max_in_flight: int
+        Maximal number of concurrent requests
+
+    Returns
+    -------
+    LayerTable
+
+    """
+
+    def fetch(layer):
+        try:
+            return layer.get_info(), None
+        except Exception as e:
+            log.warning(f"Requesting info of <{layer.name}> failed: {e}")
+            return None, e
+
+    with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        results = list(executor.map(fetch, layers.values()))
+    infos = {}
+    errors = {}
+    for name, (info, error) in zip(layers, results):
+        infos[name] = info
+        if error is not None:
+            errors[name] = error
+    return LayerTable.from_info(kind, infos, errors)
@@ -25,7 +25,11 @@ from actinia.resources.logger import log
 from actinia.region import Region
 from actinia.mapset import Mapset
 from actinia.job import Job
-from actinia.utils import set_job_names, request_and_check
+from actinia.utils import (
+    set_job_names,
+    request_and_check,
+    use_sync_processing,
+)
 
 
 class Location:
@@ -51,25 +55,31 @@ class Location:
             **{"auth": (self.__auth), "timeout": self.__actinia.timeout},
         )["process_results"]
         self.projection = proc_res["projection"]
-        self.region = Region(**proc_res["region"])
+        self.region = Region.from_dict(proc_res["region"])
+        return {"projection": self.projection, "region": self.region}
 
-    def get_info(self):
+    def get_info(self, force=False):
         """
         Return location information
         """
-        if self.projection is None or self.region is None:
-            self.__request_info()
-        return {"projection": self.projection, "region": self.region}
+        return self.__actinia.cache.get(
+            "location_info", (self.name,), self.__request_info, force=force
+        )
 
     def __request_mapsets(self):
         """
         Requests the mapsets in the given location.
 
-        :return: A list of the mapset names
+        :return: A dict of the mapsets with the mapset names as key
         """
-        self.mapsets = Mapset.list_mapsets_request(
+        mapsets = Mapset.list_mapsets_request(
             self.name, self.__actinia, self.__auth
         )
+        # keep the known mapsets with their cached layers
+        self.mapsets = {
+            mname: self.mapsets.get(mname) or mapset
+            for mname, mapset in mapsets.items()
+        }
         return self.mapsets
 
     def delete(self):
@@ -81,21 +91,21 @@ class Location:
             **{"auth": self.__auth, "timeout": self.__actinia.timeout},
         )
         del self.__actinia.locations[self.name]
+        self.__actinia.cache.invalidate(path=(self.name,))
 
-    def get_mapsets(self):
+    def get_mapsets(self, force=False):
         """
-        Return mapsets
+        Return mapsets, cached with the TTL of "mapsets"
         """
-        if self.mapsets is None or len(self.mapsets) == 0:
-            self.__request_mapsets()
-        return self.mapsets
+        return self.__actinia.cache.get(
+            "mapsets", (self.name,), self.__request_mapsets, force=force
+        )
 
     def create_mapset(self, name):
         """
         Creates a mapset within the location.
         """
-        if self.mapsets is None or len(self.mapsets) == 0:
-            self.__request_mapsets()
+        self.get_mapsets()
         mapset = Mapset.create_mapset_request(
             name, self.name, self.__actinia, self.__auth
         )
@@ -109,13 +119,13 @@ class Location:
         """
         Deletes a mapset and returns an updated mapset list for the location.
         """
-        if self.mapsets is None or len(self.mapsets) == 0:
-            self.__request_mapsets()
+        self.get_mapsets()
         Mapset.delete_mapset_request(
             name, self.name, self.__actinia, self.__auth
         )
         if name and name in self.mapsets:
             del self.mapsets[name]
+        self.__actinia.cache.invalidate(path=(self.name, name))
         return self.mapsets
 
     def __validate_process_chain(self, pc, type):
@@ -159,21 +169,36 @@ class Location:
         self.__actinia.jobs[name] = job
         return job
 
-    # TODO: * /locations/{location_name}/processing_async_export
-    #            - POST (ephemeral database)
-    # * (/locations/{location_name}/processing_export
-    #            - POST (ephemeral database))
-    def create_processing_export_job(self, pc, name=None):
+    def create_processing_export_job(self, pc, name=None, mode="async"):
         """
         Creates a processing_export job with a given PC.
+
+        The mode "async" uses the processing_async_export endpoint and
+        returns the running job, "sync" uses the processing_export endpoint
+        and returns the job when it is done. "auto" selects "sync" for
+        process chains which are estimated to be cheap from the number of
+        modules and the cells of the location region.
         """
+        if mode not in ["async", "sync", "auto"]:
+            raise ValueError("mode must be 'async', 'sync' or 'auto'.")
+        # the region the job runs in, recorded for cost estimation
+        region = self.get_info()["region"]
+        if mode == "auto":
+            sync = use_sync_processing(
+                pc, region, estimator=self.__actinia.cost_estimator
+            )
+            mode = "sync" if sync else "async"
         # set name
         orig_name, name = set_job_names(name)
         # set endpoint in url
-        url = (
-            f"{self.__actinia.url}/locations/{self.name}/"
-            "processing_async_export"
-        )
+        url = f"{self.__actinia.url}/locations/{self.name}/"
+        status_code = (200,)
+        if mode == "sync":
+            url += "processing_export"
+            # the sync endpoint returns failed jobs with status code 400
+            status_code = (200, 400)
+        else:
+            url += "processing_async_export"
         # make POST request
         postkwargs = {
             "headers": self.__actinia.headers,
@@ -191,9 +216,11 @@ class Location:
         else:
             raise Exception("Given process chain has no valid type.")
 
-        resp = request_and_check("POST", url, **postkwargs)
+        resp = request_and_check(
+            "POST", url, status_code=status_code, **postkwargs
+        )
         # create a job
-        job = Job(orig_name, self.__actinia, self.__auth, resp)
+        job = Job(orig_name, self.__actinia, self.__auth, resp, region)
         self.__actinia.jobs[name] = job
         return job
 
@@ -201,8 +228,5 @@ class Location:
 # TODO:
 # * /locations/{location_name}/process_chain_validation_async - POST
 # * /locations/{location_name}/process_chain_validation_sync - POST
-# * /locations/{location_name}/processing_async_export
-#               - POST (ephemeral database)
-# * (/locations/{location_name}/processing_export - POST (ephemeral database))
 # * (/locations/{location_name}/processing_async_export_gcs - POST)
 # * (/locations/{location_name}/processing_async_export_s3 - POST)
@@ -19,21 +19,136 @@ __copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
 __maintainer__ = "Anika Weinmann"
 
 import json
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from enum import Enum, unique
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional
+from tempfile import TemporaryDirectory
+from time import monotonic, sleep
+from typing import TYPE_CHECKING, BinaryIO, Callable, Optional, Union
 
+from actinia.geojson import split_features
 from actinia.job import Job
+from actinia.layer_table import LayerTable, fetch_layer_info
 from actinia.raster import Raster
 from actinia.region import Region
 from actinia.resources.logger import log
 from actinia.strds import SpaceTimeRasterDataset
-from actinia.utils import request_and_check, set_job_names
+from actinia.upload import content_hash, prepare_upload, upload_file
+from actinia.utils import (
+    create_actinia_pc_item,
+    request_and_check,
+    set_job_names,
+    use_sync_processing,
+)
 from actinia.vector import Vector
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+    import numpy as np
+
     from actinia import Actinia
 
+    UploadSource = Union[str, Path, bytes, memoryview, BinaryIO, np.ndarray]
+
+
+def merge_chunks_process_chain(
+    layer_name: str,
+    names: list[str],
+    counts: list[int],
+    areas: bool,
+) -> dict:
+    """Return the process chain merging vector chunks into one layer.
+
+    The categories of each chunk and of its attribute table are offset by
+    the number of features of the previous chunks, so they are unique and
+    numbered as in a single import. The chunks are patched together with
+    their attribute tables, areas are cleaned and the chunks are removed.
+    The last step selects the number of attribute rows and categories.
+
+    Parameters
+    ----------
+    layer_name: str
+        Name of the merged vector layer
+    names: list[str]
+        Names of the imported chunks
+    counts: list[int]
+        Number of features per chunk
+    areas: bool
+        Whether the chunks have polygons, whose shared boundaries are
+        cleaned after patching
+
+    Returns
+    -------
+    pc: dict
+        The process chain
+
+    """
+    pc_list = []
+    patch_inputs = [names[0]]
+    removed = [names[0]]
+    offset = counts[0]
+    for i, (name, count) in enumerate(zip(names[1:], counts[1:]), 1):
+        pc_list.append(
+            create_actinia_pc_item(
+                f"offset_table_{i}",
+                "db.execute",
+                {"sql": f"UPDATE {name} SET cat = cat + {offset}"},
+            )
+        )
+        pc_list.append(
+            create_actinia_pc_item(
+                f"offset_{i}",
+                "v.category",
+                {"input": name, "option": "sum", "cat": str(offset)},
+                {"output": f"{name}_offset"},
+            )
+        )
+        patch_inputs.append(f"{name}_offset")
+        removed.extend([name, f"{name}_offset"])
+        offset += count
+    patched = f"{layer_name}_patched" if areas else layer_name
+    pc_list.append(
+        create_actinia_pc_item(
+            "patch",
+            "v.patch",
+            {"input": ",".join(patch_inputs)},
+            {"output": patched},
+            flags="e",
+        )
+    )
+    if areas:
+        pc_list.append(
+            create_actinia_pc_item(
+                "clean",
+                "v.clean",
+                {"input": patched, "tool": "break,rmdupl"},
+                {"output": layer_name},
+            )
+        )
+        removed.append(patched)
+    pc_list.append(
+        create_actinia_pc_item(
+            "remove",
+            "g.remove",
+            {"type": "vector", "name": ",".join(removed)},
+            flags="f",
+        )
+    )
+    pc_list.append(
+        create_actinia_pc_item(
+            "count",
+            "db.select",
+            {
+                "sql": (
+                    f"SELECT COUNT(*), COUNT(DISTINCT cat) FROM {layer_name}"
+                )
+            },
+            flags="c",
+        )
+    )
+    return {"list": pc_list, "version": "1"}
+
 
 @unique
 class MapsetTask(Enum):
@@ -125,15 +240,25 @@ class Mapset:
         info : dict with mapset info
 
         """
-        if self.projection is None or self.region is None:
-            proc_res = self.request_info(
-                self.name,
-                self.__location_name,
-                self.__actinia,
-                self.__auth,
-            )
-            self.projection = proc_res["projection"]
-            self.region = Region(**proc_res["region"])
+        info = self.__actinia.cache.get(
+            "mapset_info",
+            (self.__location_name, self.name),
+            self.__request_info,
+        )
+        self.projection = info["projection"]
+        self.region = info["region"]
+        return info
+
+    def __request_info(self) -> dict:
+        """Request the mapset info."""
+        proc_res = self.request_info(
+            self.name,
+            self.__location_name,
+            self.__actinia,
+            self.__auth,
+        )
+        self.projection = proc_res["projection"]
+        self.region = Region.from_dict(proc_res["region"])
         return {"projection": self.projection, "region": self.region}
 
     def delete(self) -> None:
@@ -145,6 +270,7 @@ class Mapset:
             self.__auth,
         )
         del self.__actinia.locations[self.__location_name].mapsets[self.name]
+        self.__actinia.cache.invalidate(path=(self.__location_name, self.name))
 
     @classmethod
     def list_mapsets_request(
@@ -303,7 +429,7 @@ class Mapset:
             timeout=actinia.timeout,
         )["process_results"]
 
-    def __request_raster_layers(self) -> None:
+    def __request_raster_layers(self) -> dict:
         """Request the raster layers in the mapset."""
         url = (
             f"{self.__actinia.url}/locations/{self.__location_name}/"
@@ -315,8 +441,10 @@ class Mapset:
             auth=self.__auth,
             timeout=self.__actinia.timeout,
         )["process_results"]
+        known = self.raster_layers or {}
         rasters = {
-            mname: Raster(
+            mname: known.get(mname)
+            or Raster(
                 mname,
                 self.__location_name,
                 self.name,
@@ -326,6 +454,7 @@ class Mapset:
             for mname in raster_names
         }
         self.raster_layers = rasters
+        return rasters
 
     def get_raster_layers(self, *, force: bool = False) -> dict:
         """Return raster layers of the mapset.
@@ -340,11 +469,15 @@ class Mapset:
             dict: A dict of the vector maps
 
         """
-        if self.raster_layers is None or force is True:
-            self.__request_raster_layers()
+        self.raster_layers = self.__actinia.cache.get(
+            "raster_layers",
+            (self.__location_name, self.name),
+            self.__request_raster_layers,
+            force=force,
+        )
         return self.raster_layers
 
-    def __request_vector_layers(self) -> None:
+    def __request_vector_layers(self) -> dict:
         """Request the vector layers in the mapset."""
         url = (
             f"{self.__actinia.url}/locations/{self.__location_name}/"
@@ -356,8 +489,10 @@ class Mapset:
             auth=self.__auth,
             timeout=self.__actinia.timeout,
         )["process_results"]
+        known = self.vector_layers or {}
         vectors = {
-            mname: Vector(
+            mname: known.get(mname)
+            or Vector(
                 mname,
                 self.__location_name,
                 self.name,
@@ -367,6 +502,7 @@ class Mapset:
             for mname in vector_names
         }
         self.vector_layers = vectors
+        return vectors
 
     def get_vector_layers(self, *, force: bool = False) -> dict:
         """Return vector layers of the mapset.
@@ -381,19 +517,332 @@ class Mapset:
             dict: A dict of the vector maps
 
         """
-        if self.vector_layers is None or force is True:
-            self.__request_vector_layers()
+        self.vector_layers = self.__actinia.cache.get(
+            "vector_layers",
+            (self.__location_name, self.name),
+            self.__request_vector_layers,
+            force=force,
+        )
         return self.vector_layers
 
-    def upload_raster(self, layer_name: str, tif_file: str) -> None:
-        """Upload GTiff as a raster layer.
+    def fetch_all_info(
+        self,
+        kind: str = "raster",
+        max_in_flight: int = 8,
+        *,
+        force: bool = False,
+    ) -> LayerTable:
+        """Request the info of all layers of the mapset concurrently.
+
+        The info and region of the layer objects are set as well.
+
+        Parameters
+        ----------
+        kind: str
+            Layer type: "raster", "vector" or "strds"
+        max_in_flight: int
+            Maximal number of concurrent requests
+        force: bool
+            Force reloading of the layer list of the mapset
+
+        Returns
+        -------
+        LayerTable
+            Columnar table with the extents and sizes of the layers
+
+        Raises
+        ------
+        ValueError
+            ValueError for invalid kind.
+
+        """
+        if kind == "raster":
+            layers = self.get_raster_layers(force=force)
+        elif kind == "vector":
+            layers = self.get_vector_layers(force=force)
+        elif kind == "strds":
+            layers = self.get_strds(force=force)
+        else:
+            msg = "kind must be 'raster', 'vector' or 'strds'."
+            raise ValueError(msg)
+        return fetch_layer_info(kind, layers, max_in_flight)
+
+    def __upload_files(
+        self,
+        kind: str,
+        files: dict,
+        max_in_flight: int,
+        progress: Callable[[str, int, int], None] | None,
+        retries: int,
+        waiting_time: float,
+        *,
+        use_manifest: bool = True,
+        **array_kwargs,
+    ) -> tuple[dict, dict]:
+        """Upload files concurrently and poll all import jobs together.
+
+        Parameters
+        ----------
+        kind: str
+            Layer type: "raster" or "vector"
+        files: dict
+            Upload sources (see actinia.upload.prepare_upload) by layer
+            name
+        max_in_flight: int
+            Maximal number of concurrent uploads
+        progress: Callable[[str, int, int], None] | None
+            Function called with the layer name, sent and total bytes
+        retries: int
+            Maximal number of retries of requests which cannot have started
+            an import job
+        waiting_time: float
+            Seconds between polling the import jobs
+        use_manifest: bool
+            Whether to skip unchanged files and record the hashes of the
+            uploads in Actinia.upload_manifest
+        array_kwargs:
+            region, epsg and nodata of numpy arrays
+
+        Returns
+        -------
+        metrics: dict
+            Upload metrics of the imported layers by layer name
+        errors: dict
+            Exceptions of the failed uploads and imports by layer name
+
+        """
+
+        def upload(name, file):
+            url = (
+                f"{self.__actinia.url}/locations/{self.__location_name}/"
+                f"mapsets/{self.name}/{kind}_layers/{name}"
+            )
+            source, filename = prepare_upload(kind, name, file, **array_kwargs)
+            if manifest is not None:
+                known = manifest.get(
+                    self.__location_name, self.name, kind, name
+                )
+                if known is not None:
+                    sha256 = content_hash(source)
+                    if sha256 == known and self.__layer_exists(url):
+                        log.info(f"<{name}> is unchanged, skipping upload")
+                        return None, {"sha256": sha256, "skipped": True}
+            resp_dict, metrics = upload_file(
+                url,
+                source,
+                filename=filename,
+                auth=self.__auth,
+                timeout=self.__actinia.timeout,
+                retries=retries,
+                waiting_time=waiting_time,
+                progress=(
+                    None
+                    if progress is None
+                    else lambda sent, total: progress(name, sent, total)
+                ),
+            )
+            job = Job(
+                f"{kind}_upload_{self.__location_name}_{self.name}_{name}",
+                self.__actinia,
+                self.__auth,
+                resp_dict,
+            )
+            return job, {**metrics, "skipped": False}
+
+        manifest = self.__actinia.upload_manifest if use_manifest else None
+        metrics = {}
+        errors = {}
+        running = {}
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            uploads = {
+                executor.submit(upload, name, file): name
+                for name, file in files.items()
+            }
+            pending = set(uploads)
+            last_poll = monotonic()
+            while pending or running:
+                if pending:
+                    done, pending = wait(
+                        pending,
+                        timeout=waiting_time if running else None,
+                        return_when=FIRST_COMPLETED,
+                    )
+                else:
+                    done = set()
+                    sleep(max(waiting_time - (monotonic() - last_poll), 0))
+                for future in done:
+                    name = uploads[future]
+                    try:
+                        job, metrics[name] = future.result()
+                    except Exception as e:
+                        log.warning(f"Uploading <{name}> failed: {e}")
+                        errors[name] = e
+                        continue
+                    if job is not None:
+                        running[name] = job
+                if monotonic() - last_poll < waiting_time:
+                    continue
+                last_poll = monotonic()
+                for name, job in list(running.items()):
+                    try:
+                        job.poll(quiet=True)
+                    except Exception as e:
+                        job.status, job.message = "error", str(e)
+                    if job.status in ["accepted", "running"]:
+                        continue
+                    del running[name]
+                    if job.status != "finished":
+                        log.warning(
+                            f"Importing <{name}> failed: "
+                            f"{job.status}: {job.message}"
+                        )
+                        errors[name] = RuntimeError(
+                            f"{job.status}: {job.message}"
+                        )
+                        del metrics[name]
+                    elif manifest is not None:
+                        manifest.set(
+                            self.__location_name,
+                            self.name,
+                            kind,
+                            name,
+                            metrics[name]["sha256"],
+                        )
+        return metrics, errors
+
+    def __layer_exists(self, url: str) -> bool:
+        """Return if the layer of a raster or vector layer URL exists."""
+        try:
+            request_and_check(
+                "GET", url, auth=self.__auth, timeout=self.__actinia.timeout
+            )
+        except Exception:
+            return False
+        return True
+
+    def __add_layers(self, kind: str, names: list[str]) -> None:
+        """Add uploaded layers to the layer list of the mapset."""
+        if not names:
+            return
+        if kind == "raster":
+            layers = self.get_raster_layers()
+            layer_class = Raster
+        else:
+            layers = self.get_vector_layers()
+            layer_class = Vector
+        for name in names:
+            layers[name] = layer_class(
+                name,
+                self.__location_name,
+                self.name,
+                self.__actinia,
+                self.__auth,
+            )
+        for name in names:
+            self.__actinia.cache.invalidate(
+                f"{kind}_info", (self.__location_name, self.name, name)
+            )
+
+    def __remove_chunks(
+        self, layer_name: str, names: list[str], *, merged: bool = False
+    ) -> None:
+        """Remove the temporary layers of a failed chunked upload.
+
+        If merged is True, the incomplete merged layer is removed, too.
+        """
+        removed = [
+            *names,
+            *(f"{name}_offset" for name in names),
+            f"{layer_name}_patched",
+        ]
+        if merged:
+            removed.append(layer_name)
+        pc = {
+            "list": [
+                create_actinia_pc_item(
+                    "remove",
+                    "g.remove",
+                    {"type": "vector", "name": ",".join(removed)},
+                    flags="f",
+                )
+            ],
+            "version": "1",
+        }
+        try:
+            self.create_processing_job(
+                pc, f"remove_{layer_name}_chunks", mode="sync"
+            )
+        except Exception as e:
+            log.warning(f"Removing the chunks of <{layer_name}> failed: {e}")
+
+    def __upload_layer(
+        self,
+        kind: str,
+        layer_name: str,
+        file: UploadSource,
+        progress: Callable[[int, int], None] | None,
+        retries: int,
+        **array_kwargs,
+    ) -> dict:
+        """Upload a single file and raise the error if it failed."""
+        metrics, errors = self.__upload_files(
+            kind,
+            {layer_name: file},
+            1,
+            None if progress is None else lambda _, *args: progress(*args),
+            retries,
+            5,
+            **array_kwargs,
+        )
+        if errors:
+            raise errors[layer_name]
+        self.__add_layers(kind, [layer_name])
+        return metrics[layer_name]
+
+    def upload_raster(
+        self,
+        layer_name: str,
+        tif_file: UploadSource,
+        *,
+        region: Region | None = None,
+        epsg: int | None = None,
+        nodata: float | None = None,
+        progress: Callable[[int, int], None] | None = None,
+        retries: int = 2,
+    ) -> dict:
+        """Upload GTiff or numpy array as a raster layer.
+
+        The file is streamed, so the memory use does not depend on the file
+        size. If the request failed before the file was sent, or with a
+        server error without a resource id, the file is sent again from the
+        start.
 
         Parameters
         ----------
         layer_name: string
             Name for the raster layer to create
-        tif_file: string
-            Path of the GTiff file to upload
+        tif_file: str | Path | bytes | memoryview | BinaryIO | numpy.ndarray
+            Path, bytes-like object or seekable file object of the GTiff to
+            upload or a 2D numpy array, which is encoded as GTiff
+        region: Region | None
+            Extent of the numpy array
+        epsg: int | None
+            EPSG code of the projection of the numpy array
+        nodata: float | None
+            No data value of the numpy array
+        progress: Callable[[int, int], None] | None
+            Function called with the sent and total bytes
+        retries: int
+            Maximal number of retries of requests which cannot have started
+            an import job
+
+        Returns
+        -------
+        metrics: dict
+            Sent and total "bytes", "elapsed" seconds, "throughput" in bytes
+            per second, number of "attempts" and "sha256" of the upload;
+            only "sha256" and "skipped" if the layer is unchanged
+            according to Actinia.upload_manifest
 
         Raises
         ------
@@ -402,37 +851,78 @@ class Mapset:
             and text if request fails.
 
         """
-        files = {"file": (tif_file, Path(tif_file).open("rb"))}  # NOQA: SIM115
-        url = (
-            f"{self.__actinia.url}/locations/{self.__location_name}/"
-            f"mapsets/{self.name}/raster_layers/{layer_name}"
-        )
-        resp_dict = request_and_check(
-            "POST",
-            url,
-            auth=self.__auth,
-            files=files,
-            timeout=self.__actinia.timeout,
-        )
-        job = Job(
-            f"raster_upload_{self.__location_name}_{self.name}_{layer_name}",
-            self.__actinia,
-            self.__auth,
-            resp_dict,
-        )
-        job.poll_until_finished()
-        if job.status != "finished":
-            msg = f"{job.status}: {job.message}"
-            raise RuntimeError(msg)
-        if self.raster_layers is None:
-            self.get_raster_layers()
-        self.raster_layers[layer_name] = Raster(
+        return self.__upload_layer(
+            "raster",
             layer_name,
-            self.__location_name,
-            self.name,
-            self.__actinia,
-            self.__auth,
+            tif_file,
+            progress,
+            retries,
+            region=region,
+            epsg=epsg,
+            nodata=nodata,
+        )
+
+    def upload_rasters(
+        self,
+        files: dict[str, UploadSource],
+        max_in_flight: int = 4,
+        *,
+        region: Region | None = None,
+        epsg: int | None = None,
+        nodata: float | None = None,
+        progress: Callable[[str, int, int], None] | None = None,
+        retries: int = 2,
+        waiting_time: float = 5,
+    ) -> tuple[dict, dict]:
+        """Upload GTiffs as raster layers concurrently.
+
+        The import jobs of the uploaded files are polled together while
+        the remaining files are uploaded. Failed uploads do not stop the
+        other uploads.
+
+        Parameters
+        ----------
+        files: dict[str, UploadSource]
+            GTiffs or numpy arrays (see upload_raster) by name of the raster
+            layer to create
+        max_in_flight: int
+            Maximal number of concurrent uploads
+        region: Region | None
+            Extent of the numpy arrays
+        epsg: int | None
+            EPSG code of the projection of the numpy arrays
+        nodata: float | None
+            No data value of the numpy arrays
+        progress: Callable[[str, int, int], None] | None
+            Function called with the layer name, sent and total bytes
+        retries: int
+            Maximal number of retries per file of requests which cannot have
+            started an import job
+        waiting_time: float
+            Seconds between polling the import jobs
+
+        Returns
+        -------
+        metrics: dict
+            Upload metrics (see upload_raster) of the imported layers by
+            layer name
+        errors: dict
+            Exceptions of the failed uploads and imports by layer name
+
+        """
+        metrics, errors = self.__upload_files(
+            "raster",
+            files,
+            max_in_flight,
+            progress,
+            retries,
+            waiting_time,
+            region=region,
+            epsg=epsg,
+            nodata=nodata,
         )
+        self.__add_layers("raster", list(metrics))
+        return metrics, errors
 
     def delete_raster(self, layer_name: str) -> None:
         """Delete a raster layer.
@@ -453,65 +943,249 @@ class Mapset:
             auth=self.__auth,
             timeout=self.__actinia.timeout,
         )
-        if self.raster_layers is None:
-            self.get_raster_layers()
-        else:
-            del self.raster_layers[layer_name]
+        self.get_raster_layers()
+        self.raster_layers.pop(layer_name, None)
+        self.__actinia.cache.invalidate(
+            "raster_info",
+            (self.__location_name, self.name, layer_name),
+        )
+        if self.__actinia.upload_manifest is not None:
+            self.__actinia.upload_manifest.remove(
+                self.__location_name, self.name, "raster", layer_name
+            )
         log.info(f"Raster <{layer_name}> successfully deleted")
 
-    def upload_vector(self, layer_name: str, vector_file: str) -> None:
+    def upload_vector(
+        self,
+        layer_name: str,
+        vector_file: UploadSource | Mapping,
+        *,
+        progress: Callable[[int, int], None] | None = None,
+        retries: int = 2,
+        chunks: int | None = None,
+        max_in_flight: int = 4,
+        waiting_time: float = 5,
+    ) -> dict:
         """Upload vector file (GPKG, zipped Shape, GeoJSON) as a vector layer.
 
+        The file is streamed, so the memory use does not depend on the file
+        size. If the request failed before the file was sent, or with a
+        server error without a resource id, the file is sent again from the
+        start.
+
+        With chunks, a local GeoJSON file is split into chunks of
+        consecutive features, which are uploaded and imported concurrently
+        as temporary layers and merged with v.patch. The categories are
+        numbered as in a single import and the number of attribute rows of
+        the merged layer is checked.
+
         Parameters
         ----------
         layer_name: string
             Name for the vector layer to create
-        vector_file: string
-            Path of the GPKG/zipped Shapefile or GeoJSON to upload
+        vector_file: str | Path | bytes | memoryview | BinaryIO | Mapping
+            Path, bytes-like object or seekable file object of the
+            GPKG/zipped Shapefile or GeoJSON to upload or a GeoJSON mapping;
+            bytes and file objects without name are uploaded as GeoJSON
+        progress: Callable[[int, int], None] | None
+            Function called with the sent and total bytes
+        retries: int
+            Maximal number of retries of requests which cannot have started
+            an import job
+        chunks: int | None
+            Number of chunks to split a GeoJSON file into
+        max_in_flight: int
+            Maximal number of concurrent chunk uploads
+        waiting_time: float
+            Seconds between polling the import and merge jobs of chunks
+
+        Returns
+        -------
+        metrics: dict
+            Sent and total "bytes", "elapsed" seconds, "throughput" in bytes
+            per second, number of "attempts" and "sha256" of the upload;
+            only "sha256" and "skipped" if the layer is unchanged
+            according to Actinia.upload_manifest. Chunked uploads have the
+            summed metrics of the chunks, the number of "chunks" and
+            "features" and no "sha256".
 
         Raises
         ------
         RuntimeError
             RuntimeError string with response status code
             and text if request fails.
+        ValueError
+            ValueError if chunks is used for other files than GeoJSON.
 
         """
-        files = {
-            "file": (
-                vector_file,
-                Path(vector_file).open("rb"),  # NOQA: SIM115
-            ),
-        }
-        url = (
-            f"{self.__actinia.url}/locations/{self.__location_name}/"
-            f"mapsets/{self.name}/vector_layers/{layer_name}"
-        )
-        resp_dict = request_and_check(
-            "POST",
-            url,
-            files=files,
-            auth=self.__auth,
-            timeout=self.__actinia.timeout,
+        if chunks is not None and chunks > 1:
+            if not isinstance(vector_file, (str, Path)) or Path(
+                vector_file
+            ).suffix.lower() not in {".geojson", ".json"}:
+                msg = "Only local GeoJSON files can be uploaded in chunks."
+                raise ValueError(msg)
+            return self.__upload_vector_chunks(
+                layer_name,
+                Path(vector_file),
+                chunks,
+                max_in_flight,
+                progress,
+                retries,
+                waiting_time,
+            )
+        return self.__upload_layer(
+            "vector", layer_name, vector_file, progress, retries
         )
-        job = Job(
-            f"vector_upload_{self.__location_name}_{self.name}_{layer_name}",
-            self.__actinia,
-            self.__auth,
-            resp_dict,
-        )
-        job.poll_until_finished()
-        if job.status != "finished":
-            msg = f"{job.status}: {job.message}"
-            raise RuntimeError(msg)
-        if self.vector_layers is None:
-            self.get_vector_layers()
-        self.vector_layers[layer_name] = Vector(
-            layer_name,
-            self.__location_name,
-            self.name,
-            self.__actinia,
-            self.__auth,
+
+    def __upload_vector_chunks(
+        self,
+        layer_name: str,
+        path: Path,
+        chunks: int,
+        max_in_flight: int,
+        progress: Callable[[int, int], None] | None,
+        retries: int,
+        waiting_time: float,
+    ) -> dict:
+        """Upload a GeoJSON file in chunks and merge them with v.patch."""
+        start = monotonic()
+        manifest = self.__actinia.upload_manifest
+        if manifest is not None:
+            sha256 = content_hash(path)
+            known = manifest.get(
+                self.__location_name, self.name, "vector", layer_name
+            )
+            url = (
+                f"{self.__actinia.url}/locations/{self.__location_name}/"
+                f"mapsets/{self.name}/vector_layers/{layer_name}"
+            )
+            if sha256 == known and self.__layer_exists(url):
+                log.info(f"<{layer_name}> is unchanged, skipping upload")
+                return {"sha256": sha256, "skipped": True}
+        with TemporaryDirectory() as directory:
+            parts = split_features(path, chunks, directory, layer_name)
+            if not parts:
+                msg = f"<{path}> has no features."
+                raise ValueError(msg)
+            names = [f"{layer_name}_chunk_{i}" for i in range(len(parts))]
+            sent = dict.fromkeys(names, 0)
+            totals = {
+                name: part["path"].stat().st_size
+                for name, part in zip(names, parts)
+            }
+
+            def chunk_progress(name, chunk_sent, chunk_total):
+                sent[name] = chunk_sent
+                totals[name] = chunk_total
+                progress(sum(sent.values()), sum(totals.values()))
+
+            metrics, errors = self.__upload_files(
+                "vector",
+                {name: part["path"] for name, part in zip(names, parts)},
+                max_in_flight,
+                None if progress is None else chunk_progress,
+                retries,
+                waiting_time,
+                use_manifest=False,
+            )
+        merged = complete = False
+        try:
+            if errors:
+                name, error = next(iter(errors.items()))
+                msg = f"Upload of <{name}> failed: {error}"
+                raise RuntimeError(msg)
+            counts = [part["features"] for part in parts]
+            areas = any(
+                {"Polygon", "MultiPolygon"} & part["geometry_types"]
+                for part in parts
+            )
+            job = self.create_processing_job(
+                merge_chunks_process_chain(layer_name, names, counts, areas),
+                f"merge_{layer_name}",
+            )
+            job.poll_until_finished(waiting_time=waiting_time, quiet=True)
+            merged = job.status == "finished"
+            if not merged:
+                msg = f"Merging <{layer_name}> failed: {job.message}"
+                raise RuntimeError(msg)
+            stdout = next(
+                entry.get("stdout", "")
+                for entry in reversed(job.process_log)
+                if entry.get("executable") == "db.select"
+            )
+            rows, cats = (int(value) for value in stdout.split("|"))
+            if rows != sum(counts) or cats != sum(counts):
+                msg = (
+                    f"Vector <{layer_name}> has {rows} attribute rows and "
+                    f"{cats} categories instead of {sum(counts)}."
+                )
+                raise RuntimeError(msg)
+            complete = True
+        finally:
+            if not complete and metrics:
+                self.__remove_chunks(layer_name, names, merged=merged)
+        self.__add_layers("vector", [layer_name])
+        if manifest is not None:
+            manifest.set(
+                self.__location_name, self.name, "vector", layer_name, sha256
+            )
+        elapsed = monotonic() - start
+        sent_bytes = sum(m["bytes"] for m in metrics.values())
+        return {
+            "bytes": sent_bytes,
+            "total": sum(m["total"] for m in metrics.values()),
+            "elapsed": elapsed,
+            "throughput": sent_bytes / elapsed if elapsed else 0.0,
+            "attempts": sum(m["attempts"] for m in metrics.values()),
+            "chunks": len(parts),
+            "features": sum(counts),
+            "skipped": False,
+        }
+
+    def upload_vectors(
+        self,
+        files: dict[str, UploadSource | Mapping],
+        max_in_flight: int = 4,
+        *,
+        progress: Callable[[str, int, int], None] | None = None,
+        retries: int = 2,
+        waiting_time: float = 5,
+    ) -> tuple[dict, dict]:
+        """Upload vector files as vector layers concurrently.
+
+        The import jobs of the uploaded files are polled together while
+        the remaining files are uploaded. Failed uploads do not stop the
+        other uploads.
+
+        Parameters
+        ----------
+        files: dict[str, UploadSource | Mapping]
+            Vector files or GeoJSON mappings (see upload_vector) by name of
+            the vector layer to create
+        max_in_flight: int
+            Maximal number of concurrent uploads
+        progress: Callable[[str, int, int], None] | None
+            Function called with the layer name, sent and total bytes
+        retries: int
+            Maximal number of retries per file of requests which cannot have
+            started an import job
+        waiting_time: float
+            Seconds between polling the import jobs
+
+        Returns
+        -------
+        metrics: dict
+            Upload metrics (see upload_vector) of the imported layers by
+            layer name
+        errors: dict
+            Exceptions of the failed uploads and imports by layer name
+
+        """
+        metrics, errors = self.__upload_files(
+            "vector", files, max_in_flight, progress, retries, waiting_time
         )
+        self.__add_layers("vector", list(metrics))
+        return metrics, errors
 
     def delete_vector(self, layer_name: str) -> None:
         """Delete a vector layer.
@@ -532,13 +1206,19 @@ class Mapset:
             auth=self.__auth,
             timeout=self.__actinia.timeout,
         )
-        if self.vector_layers is None:
-            self.get_vector_layers()
-        else:
-            del self.vector_layers[layer_name]
+        self.get_vector_layers()
+        self.vector_layers.pop(layer_name, None)
+        self.__actinia.cache.invalidate(
+            "vector_info",
+            (self.__location_name, self.name, layer_name),
+        )
+        if self.__actinia.upload_manifest is not None:
+            self.__actinia.upload_manifest.remove(
+                self.__location_name, self.name, "vector", layer_name
+            )
         log.info(f"Vector <{layer_name}> successfully deleted")
 
-    def __request_strds(self) -> None:
+    def __request_strds(self) -> dict:
         """Request the SpaceTimeRasterDatasets in the mapset."""
         url = (
             f"{self.__actinia.url}/locations/{self.__location_name}/"
@@ -546,8 +1226,10 @@ class Mapset:
         )
         resp = request_and_check("GET", url, auth=self.__auth)
         strds_names = resp["process_results"]
+        known = self.strds or {}
         strds = {
-            sname: SpaceTimeRasterDataset(
+            sname: known.get(sname)
+            or SpaceTimeRasterDataset(
                 sname,
                 self.__location_name,
                 self.name,
@@ -557,6 +1239,7 @@ class Mapset:
             for sname in strds_names
         }
         self.strds = strds
+        return strds
 
     def get_strds(
         self,
@@ -576,8 +1259,12 @@ class Mapset:
             A dict with the SpaceTimeRasterDatasets
 
         """
-        if self.strds is None or force is True:
-            self.__request_strds()
+        self.strds = self.__actinia.cache.get(
+            "strds",
+            (self.__location_name, self.name),
+            self.__request_strds,
+            force=force,
+        )
         return self.strds
 
     def create_strds(
@@ -615,8 +1302,7 @@ class Mapset:
         if temporal_type not in {"absolute", "relative"}:
             msg = "temporal_type must be 'absolute' or 'relative'."
             raise ValueError(msg)
-        if self.strds is None:
-            self.__request_strds()
+        self.get_strds()
         if strds_name in self.strds:
             if not overwrite:
                 msg = f"SpaceTimeRasterDataset <{strds_name}> already exists."
@@ -644,8 +1330,7 @@ class Mapset:
         request_and_check("POST", url, **postkwargs)
 
         # Update STRDS list
-        if self.strds is None:
-            self.get_strds()
+        self.get_strds()
         self.strds[strds_name] = SpaceTimeRasterDataset(
             strds_name,
             self.__location_name,
@@ -653,6 +1338,9 @@ class Mapset:
             self.__actinia,
             self.__auth,
         )
+        self.__actinia.cache.invalidate(
+            path=(self.__location_name, self.name, strds_name),
+        )
         log.info(f"SpaceTimeRasterDataset <{strds_name}> successfully created")
 
     def delete_strds(self, strds_name: str) -> None:
@@ -677,12 +1365,17 @@ class Mapset:
         request_and_check("DELETE", url, auth=self.__auth)
         # Update STRDS list
         del self.strds[strds_name]
+        self.__actinia.cache.invalidate(
+            path=(self.__location_name, self.name, strds_name),
+        )
         log.info(f"SpaceTimeRasterDataset <{strds_name}> successfully deleted")
 
     def create_processing_job(
         self,
         pc: str | dict,
         name: Optional(str) = None,
+        *,
+        mode: str = "async",
     ) -> Job:
         """Create a processing job with a given processing chain.
 
@@ -692,6 +1385,12 @@ class Mapset:
             Name of the processing job (optional)
         pc: str | dict
             The actinia processing chain
+        mode: str
+            "async" uses the processing_async endpoint and returns the
+            running job, "sync" uses the processing endpoint and returns
+            the job when it is done. "auto" selects "sync" for process
+            chains which are estimated to be cheap from the number of
+            modules and the cells of the mapset region.
 
         Returns
         -------
@@ -701,14 +1400,34 @@ class Mapset:
         ------
         TypeError
             TypeError if 'pc' is invalid type.
+        ValueError
+            ValueError if 'mode' is invalid.
 
         """
+        if mode not in {"async", "sync", "auto"}:
+            msg = "mode must be 'async', 'sync' or 'auto'."
+            raise ValueError(msg)
+        # the region the job runs in, recorded for cost estimation
+        region = self.info()["region"]
+        if mode == "auto":
+            sync = use_sync_processing(
+                pc, region, estimator=self.__actinia.cost_estimator
+            )
+            mode = "sync" if sync else "async"
         # set name
         orig_name, name = set_job_names(name)
         # set endpoint in url
-        url = (
-            f"{self.__actinia.url}/locations/{self.__location_name}/"
-            f"mapsets/{self.name}/processing_async"
+        task = MapsetTask.PROCESSING_ASYNC
+        status_code = (200,)
+        if mode == "sync":
+            task = MapsetTask.PROCESSING
+            # the sync endpoint returns failed jobs with status code 400
+            status_code = (200, 400)
+        url = Mapset.__request_url(
+            self.__actinia.url,
+            self.__location_name,
+            self.name,
+            task,
         )
         # make POST request
         postkwargs = {
@@ -727,16 +1446,24 @@ class Mapset:
             msg = "Given process chain has no valid type."
             raise TypeError(msg)
 
-        resp = request_and_check("POST", url, **postkwargs)
-        # create a job
-        job = Job(orig_name, self.__actinia, self.__auth, resp)
+        resp = request_and_check(
+            "POST", url, status_code=status_code, **postkwargs
+        )
+        # create a job, which invalidates the cached resources of the
+        # mapset when it is done
+        job = Job(
+            orig_name,
+            self.__actinia,
+            self.__auth,
+            resp,
+            region,
+            cache_path=(self.__location_name, self.name),
+        )
         self.__actinia.jobs[name] = job
         return job
 
 
 # TODO: # NOQA: FIX002, TD002, TD003
-# * /locations/{location_name}/mapsets/{mapset_name}/processing - POST
-# * /locations/{location_name}/mapsets/{mapset_name}/processing_async - POST
 # * /locations/{location_name}/mapsets/{mapset_name}/lock - GET/DELETE/POST
 # * /locations/{location_name}/mapsets/{mapset_name}/raster_layers - DELETE/PUT
 # * /locations/{location_name}/mapsets/{mapset_name}/vector_layers
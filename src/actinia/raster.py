@@ -17,7 +17,14 @@ __copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
 __maintainer__ = "Anika Weinmann"
 
 from actinia.region import Region
-from actinia.utils import request_and_check
+from actinia.utils import (
+    PNG_SIGNATURE,
+    create_actinia_pc_item,
+    request_and_check,
+    stream_file,
+)
+
+RENDER_KEYS = {"n", "s", "e", "w", "width", "height"}
 
 
 class Raster:
@@ -30,40 +37,149 @@ class Raster:
         self.region = None
         self.info = None
 
-    def get_info(self):
-        """Return the information of the raster map"""
-        if self.info is None:
-            url = (
-                f"{self.__actinia.url}/locations/{self.__location_name}/"
-                f"mapsets/{self.__mapset_name}/raster_layers/{self.name}"
+    def __request_info(self):
+        """Request the information of the raster map"""
+        url = (
+            f"{self.__actinia.url}/locations/{self.__location_name}/"
+            f"mapsets/{self.__mapset_name}/raster_layers/{self.name}"
+        )
+        r_info = request_and_check(
+            "GET",
+            url,
+            **{"auth": self.__auth, "timeout": self.__actinia.timeout},
+        )["process_results"]
+        self.info = r_info
+        self.region = Region.from_dict(r_info)
+        return r_info
+
+    def get_info(self, force=False):
+        """Return the information of the raster map, cached with the TTL
+        of "raster_info"
+        """
+        info = self.__actinia.cache.get(
+            "raster_info",
+            (self.__location_name, self.__mapset_name, self.name),
+            self.__request_info,
+            force=force,
+        )
+        if info is not self.info:
+            self.info = info
+            self.region = Region.from_dict(info)
+        return self.info
+
+    def render(self, render_dict=None):
+        """Render the raster map as PNG image.
+
+        Parameters:
+            render_dict (dict): dict with the optional keys "n", "s", "e",
+                                "w" of the rendered area and "width" and
+                                "height" of the image in pixels
+
+        Returns:
+            (bytes): The rendered PNG image
+
+        Throws a ValueError for unknown keys and a RuntimeError if the
+        response is not a PNG image.
+        """
+        render_dict = render_dict or {}
+        if not set(render_dict.keys()) <= RENDER_KEYS:
+            raise ValueError(
+                "render_dict may only contain the keys"
+                " 'n', 's', 'e', 'w', 'width', 'height'"
             )
-            r_info = request_and_check(
-                "GET",
+        url = (
+            f"{self.__actinia.url}/locations/{self.__location_name}/"
+            f"mapsets/{self.__mapset_name}/raster_layers/{self.name}/render"
+        )
+        image = b"".join(
+            stream_file(
                 url,
-                **{"auth": self.__auth, "timeout": self.__actinia.timeout},
-            )["process_results"]
-            self.info = r_info
-
-            self.region = Region(
-                zone=None,
-                projection=None,
-                n=r_info["north"],
-                s=r_info["south"],
-                e=r_info["east"],
-                w=r_info["west"],
-                t=None,
-                b=None,
-                nsres=r_info["nsres"],
-                ewres=r_info["ewres"],
-                nsres3=None,
-                ewres3=None,
-                tbres=None,
-                rows=r_info["rows"],
-                cols=r_info["cols"],
-                rows3=None,
-                cols3=None,
-                depths=None,
-                cells=r_info["cells"],
-                cells3=None,
+                params=render_dict,
+                auth=self.__auth,
+                timeout=self.__actinia.timeout,
             )
-        return self.info
+        )
+        if not image.startswith(PNG_SIGNATURE):
+            raise RuntimeError(
+                f"Rendering raster <{self.name}> failed: {image[:1000]!r}"
+            )
+        return image
+
+    def tile_url(self, proxy):
+        """Serve the raster map as XYZ tiles with a local tile proxy.
+
+        Parameters:
+            proxy (TileProxy): Started tile proxy serving the tiles
+
+        Returns:
+            (string): URL template of the tiles, e.g. for
+                      leafmap.Map.add_tile_layer
+        """
+        key = ("raster", self.__location_name, self.__mapset_name, self.name)
+        return proxy.add_layer(
+            "/".join(key), self.render, key, version=self.render_version
+        )
+
+    def render_version(self):
+        """Return the version of the raster map for caching rendered images.
+
+        The version is the creation date of the raster map, which changes
+        when it is overwritten; it is taken from the cached raster info,
+        which is reloaded after changes made by the client.
+
+        Returns:
+            (string): the creation date of the raster map
+        """
+        return self.get_info().get("date")
+
+    def to_numpy(self, region=None, directory=None, waiting_time=5):
+        """Export the raster map as GeoTIFF and read it into a read-only
+        memory-mapped numpy array.
+
+        The GeoTIFF is streamed to a local file, so rasters larger than the
+        memory can be read; only the accessed parts are loaded.
+
+        Parameters:
+            region (Region): Region to export, by default the region of the
+                             raster map
+            directory (string|Path): Directory for the downloaded GeoTIFF,
+                                     see Job.download
+            waiting_time (int): Time to wait in seconds between polls of
+                                the export job
+
+        Returns:
+            (tuple): tuple of the array, its Region and the no data value
+        """
+        map_name = f"{self.name}@{self.__mapset_name}"
+        if region is None:
+            region_inputs = {"raster": map_name}
+        else:
+            region_inputs = {
+                key: str(getattr(region, key))
+                for key in ["n", "s", "e", "w", "nsres", "ewres"]
+                if getattr(region, key) is not None
+            }
+        pc = {
+            "list": [
+                create_actinia_pc_item("region", "g.region", region_inputs),
+                create_actinia_pc_item(
+                    "export",
+                    "exporter",
+                    outputs=[
+                        {
+                            "export": {"format": "GTiff", "type": "raster"},
+                            "param": "map",
+                            "value": map_name,
+                        }
+                    ],
+                ),
+            ],
+            "version": "1",
+        }
+        location = self.__actinia.get_locations()[self.__location_name]
+        job = location.create_processing_export_job(pc, f"export_{self.name}")
+        if job.poll_until_finished(waiting_time=waiting_time, quiet=True):
+            raise RuntimeError(
+                f"Export of raster <{map_name}> failed: {job.message}"
+            )
+        return job.to_numpy(directory=directory)
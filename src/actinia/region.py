@@ -16,30 +16,83 @@ __author__ = "Anika Weinmann"
 __copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
 __maintainer__ = "Anika Weinmann"
 
+import math
+
+import numpy as np
+
+REGION_FIELDS = (
+    "zone",
+    "projection",
+    "n",
+    "s",
+    "e",
+    "w",
+    "t",
+    "b",
+    "nsres",
+    "ewres",
+    "nsres3",
+    "ewres3",
+    "tbres",
+    "rows",
+    "cols",
+    "rows3",
+    "cols3",
+    "depths",
+    "cells",
+    "cells3",
+)
+INT_FIELDS = {
+    "zone",
+    "projection",
+    "rows",
+    "cols",
+    "rows3",
+    "cols3",
+    "depths",
+    "cells",
+    "cells3",
+}
+# keys of the info of raster and vector layers and STRDS
+FIELD_ALIASES = {
+    "north": "n",
+    "south": "s",
+    "east": "e",
+    "west": "w",
+    "top": "t",
+    "bottom": "b",
+    "nsres_min": "nsres",
+    "ewres_min": "ewres",
+}
+
 
 class Region:
+    """Computational region or extent of a layer."""
+
+    __slots__ = REGION_FIELDS
+
     def __init__(
         self,
-        zone,
-        projection,
-        n,
-        s,
-        e,
-        w,
-        t,
-        b,
-        nsres,
-        ewres,
-        nsres3,
-        ewres3,
-        tbres,
-        rows,
-        cols,
-        rows3,
-        cols3,
-        depths,
-        cells,
-        cells3,
+        zone=None,
+        projection=None,
+        n=None,
+        s=None,
+        e=None,
+        w=None,
+        t=None,
+        b=None,
+        nsres=None,
+        ewres=None,
+        nsres3=None,
+        ewres3=None,
+        tbres=None,
+        rows=None,
+        cols=None,
+        rows3=None,
+        cols3=None,
+        depths=None,
+        cells=None,
+        cells3=None,
     ):
         self.zone = zone
         self.projection = projection
@@ -61,3 +114,354 @@ class Region:
         self.depths = depths
         self.cells = cells
         self.cells3 = cells3
+
+    @classmethod
+    def from_dict(cls, info):
+        """Create a region from a region or layer info dict.
+
+        Parameters
+        ----------
+        info: dict
+            The region of Location.get_info and Mapset.info or the info of
+            Raster.get_info, Vector.get_info and
+            SpaceTimeRasterDataset.get_info. Numbers given as strings are
+            converted.
+
+        Returns
+        -------
+        Region
+
+        """
+        kwargs = {}
+        for key, value in info.items():
+            field = FIELD_ALIASES.get(key, key)
+            if field not in REGION_FIELDS or field in kwargs:
+                continue
+            if value is not None:
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    value = None
+                else:
+                    if field in INT_FIELDS and value.is_integer():
+                        value = int(value)
+            kwargs[field] = value
+        return cls(**kwargs)
+
+    def to_dict(self):
+        """Return the region as dict with the keys of Location.get_info."""
+        return {field: getattr(self, field) for field in REGION_FIELDS}
+
+    def to_tuple(self):
+        """Return the values of the region fields as hashable tuple."""
+        return tuple(getattr(self, field) for field in REGION_FIELDS)
+
+    def __eq__(self, other):
+        if not isinstance(other, Region):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    # regions are mutable, use to_tuple as key of dicts and sets
+    __hash__ = None
+
+    def __repr__(self):
+        return (
+            f"Region(n={self.n}, s={self.s}, e={self.e}, w={self.w}, "
+            f"nsres={self.nsres}, ewres={self.ewres})"
+        )
+
+
+def _as_float(value):
+    return np.nan if value is None else float(value)
+
+
+class RegionArray:
+    """Columnar array of 2D regions for vectorized geometry operations.
+
+    Each region is stored as row of the float64 arrays ``n``, ``s``, ``e``,
+    ``w``, ``nsres`` and ``ewres``. Unknown values are NaN.
+    """
+
+    __slots__ = ("n", "s", "e", "w", "nsres", "ewres")
+
+    def __init__(self, n, s, e, w, nsres=None, ewres=None):
+        self.n = np.asarray(n, dtype=np.float64)
+        self.s = np.asarray(s, dtype=np.float64)
+        self.e = np.asarray(e, dtype=np.float64)
+        self.w = np.asarray(w, dtype=np.float64)
+        shape = self.n.shape
+        if nsres is None:
+            nsres = np.full(shape, np.nan)
+        if ewres is None:
+            ewres = np.full(shape, np.nan)
+        self.nsres = np.broadcast_to(
+            np.asarray(nsres, dtype=np.float64), shape
+        ).copy()
+        self.ewres = np.broadcast_to(
+            np.asarray(ewres, dtype=np.float64), shape
+        ).copy()
+
+    @classmethod
+    def from_regions(cls, regions):
+        """Create a RegionArray from Region objects.
+
+        Parameters
+        ----------
+        regions: iterable of Region
+
+        Returns
+        -------
+        RegionArray
+
+        """
+        values = np.array(
+            [
+                [
+                    _as_float(r.n),
+                    _as_float(r.s),
+                    _as_float(r.e),
+                    _as_float(r.w),
+                    _as_float(r.nsres),
+                    _as_float(r.ewres),
+                ]
+                for r in regions
+            ],
+            dtype=np.float64,
+        ).reshape(-1, 6)
+        return cls(*values.T)
+
+    def __len__(self):
+        return self.n.shape[0]
+
+    def __getitem__(self, index):
+        """Return a Region for an integer index, else a RegionArray."""
+        if isinstance(index, (int, np.integer)):
+            index = range(len(self))[index]
+            return self[[index]].to_regions()[0]
+        return RegionArray(
+            self.n[index],
+            self.s[index],
+            self.e[index],
+            self.w[index],
+            self.nsres[index],
+            self.ewres[index],
+        )
+
+    def to_regions(self):
+        """Return the regions as list of Region objects."""
+        regions = []
+        for n, s, e, w, nsres, ewres, rows, cols in zip(
+            self.n.tolist(),
+            self.s.tolist(),
+            self.e.tolist(),
+            self.w.tolist(),
+            self.nsres.tolist(),
+            self.ewres.tolist(),
+            self.rows.tolist(),
+            self.cols.tolist(),
+        ):
+            region = Region(n=n, s=s, e=e, w=w)
+            if not math.isnan(nsres):
+                region.nsres = nsres
+                region.rows = rows
+            if not math.isnan(ewres):
+                region.ewres = ewres
+                region.cols = cols
+            if region.rows is not None and region.cols is not None:
+                region.cells = rows * cols
+            regions.append(region)
+        return regions
+
+    @property
+    def rows(self):
+        """Return the number of rows, -1 for unknown resolution."""
+        rows = np.rint((self.n - self.s) / self.nsres)
+        return np.where(np.isnan(rows), -1, rows).astype(np.int64)
+
+    @property
+    def cols(self):
+        """Return the number of columns, -1 for unknown resolution."""
+        cols = np.rint((self.e - self.w) / self.ewres)
+        return np.where(np.isnan(cols), -1, cols).astype(np.int64)
+
+    @property
+    def cells(self):
+        """Return the number of cells, -1 for unknown resolution."""
+        rows = self.rows
+        cols = self.cols
+        return np.where((rows < 0) | (cols < 0), -1, rows * cols)
+
+    @property
+    def area(self):
+        """Return the area of the regions in map units."""
+        return np.clip(self.n - self.s, 0, None) * np.clip(
+            self.e - self.w, 0, None
+        )
+
+    @staticmethod
+    def __bounds(other):
+        if isinstance(other, Region):
+            return (
+                _as_float(other.n),
+                _as_float(other.s),
+                _as_float(other.e),
+                _as_float(other.w),
+            )
+        return other.n, other.s, other.e, other.w
+
+    def intersects(self, other):
+        """Return a mask of the regions overlapping other.
+
+        Parameters
+        ----------
+        other: Region | RegionArray
+            A single region or an array of the same length (pairwise)
+
+        Returns
+        -------
+        mask: numpy.ndarray of bool
+
+        """
+        n, s, e, w = self.__bounds(other)
+        return (self.s < n) & (self.n > s) & (self.w < e) & (self.e > w)
+
+    def contains(self, x, y):
+        """Return a mask of the regions containing the point(s) x, y."""
+        return (self.s <= y) & (self.n >= y) & (self.w <= x) & (self.e >= x)
+
+    def intersection(self, other):
+        """Return the intersection with other, NaN where not overlapping.
+
+        Parameters
+        ----------
+        other: Region | RegionArray
+            A single region or an array of the same length (pairwise)
+
+        Returns
+        -------
+        RegionArray
+
+        """
+        n, s, e, w = self.__bounds(other)
+        result = RegionArray(
+            np.minimum(self.n, n),
+            np.maximum(self.s, s),
+            np.minimum(self.e, e),
+            np.maximum(self.w, w),
+            self.nsres,
+            self.ewres,
+        )
+        empty = ~self.intersects(other)
+        for values in (result.n, result.s, result.e, result.w):
+            values[empty] = np.nan
+        return result
+
+    def union(self, other):
+        """Return the bounding boxes of the regions and other.
+
+        Parameters
+        ----------
+        other: Region | RegionArray
+            A single region or an array of the same length (pairwise)
+
+        Returns
+        -------
+        RegionArray
+
+        """
+        n, s, e, w = self.__bounds(other)
+        return RegionArray(
+            np.fmax(self.n, n),
+            np.fmin(self.s, s),
+            np.fmax(self.e, e),
+            np.fmin(self.w, w),
+            self.nsres,
+            self.ewres,
+        )
+
+    def bounds(self):
+        """Return the bounding box of all regions as Region."""
+        return Region(
+            n=float(np.nanmax(self.n)),
+            s=float(np.nanmin(self.s)),
+            e=float(np.nanmax(self.e)),
+            w=float(np.nanmin(self.w)),
+        )
+
+    def align(self, nsres=None, ewres=None):
+        """Align the regions to a resolution grid, extending the extents.
+
+        Like ``g.region -a`` the extents are enlarged to multiples of the
+        resolution.
+
+        Parameters
+        ----------
+        nsres: float | numpy.ndarray | None
+            North-south resolution, defaults to the resolution of the regions
+        ewres: float | numpy.ndarray | None
+            East-west resolution, defaults to the resolution of the regions
+
+        Returns
+        -------
+        RegionArray
+
+        """
+        nsres = self.nsres if nsres is None else nsres
+        ewres = self.ewres if ewres is None else ewres
+        return RegionArray(
+            np.ceil(self.n / nsres) * nsres,
+            np.floor(self.s / nsres) * nsres,
+            np.ceil(self.e / ewres) * ewres,
+            np.floor(self.w / ewres) * ewres,
+            nsres,
+            ewres,
+        )
+
+    def tile(self, tile_rows, tile_cols, halo=0):
+        """Split the regions into tiles with overlapping halo cells.
+
+        The regions need a resolution. Tiles at the border of a region are
+        cut to the region, halos extend beyond it.
+
+        Parameters
+        ----------
+        tile_rows: int
+            Number of rows of a tile (without halo)
+        tile_cols: int
+            Number of columns of a tile (without halo)
+        halo: int
+            Number of cells each tile is extended in every direction
+
+        Returns
+        -------
+        tiles: RegionArray
+            The tiles of all regions
+        parents: numpy.ndarray
+            Index of the region of each tile
+
+        """
+        n_tile_rows = np.maximum(-(-self.rows // tile_rows), 1)
+        n_tile_cols = np.maximum(-(-self.cols // tile_cols), 1)
+        counts = n_tile_rows * n_tile_cols
+        parents = np.repeat(np.arange(len(self)), counts)
+        # position of each tile within its region
+        offsets = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        tile_row = offsets // n_tile_cols[parents]
+        tile_col = offsets % n_tile_cols[parents]
+        nsres = self.nsres[parents]
+        ewres = self.ewres[parents]
+        n = self.n[parents] - tile_row * tile_rows * nsres
+        w = self.w[parents] + tile_col * tile_cols * ewres
+        s = np.maximum(n - tile_rows * nsres, self.s[parents])
+        e = np.minimum(w + tile_cols * ewres, self.e[parents])
+        tiles = RegionArray(
+            n + halo * nsres,
+            s - halo * nsres,
+            e + halo * ewres,
+            w - halo * ewres,
+            nsres,
+            ewres,
+        )
+        return tiles, parents
@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+"""The render module renders STRDS frames with prefetching and caching.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import RLock
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+
+from actinia.cache import ByteCache
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+
+class Frame(NamedTuple):
+    """A rendered raster map of a STRDS as PNG image."""
+
+    index: int
+    start_time: np.datetime64
+    end_time: np.datetime64
+    image: bytes
+
+
+def _format_time(time: np.datetime64) -> str:
+    """Format a time as YYYY-MM-DD HH:MM:SS for the render requests."""
+    return str(time.astype("datetime64[s]")).replace("T", " ")
+
+
+class FrameRenderer:
+    """Render the raster maps of a STRDS one after another, e.g. to animate.
+
+    The frames ahead of the last requested frame are rendered concurrently
+    in the background. Rendered frames are kept in a ByteCache, so going
+    back or rendering the same frames again does not send requests.
+    """
+
+    def __init__(
+        self,
+        render: Callable[[dict], bytes],
+        key: tuple,
+        start_times: np.ndarray,
+        end_times: np.ndarray,
+        bbox: dict,
+        width: int,
+        height: int,
+        *,
+        prefetch: int = 8,
+        max_in_flight: int = 4,
+        cache: ByteCache | None = None,
+    ) -> None:
+        """Initialize the FrameRenderer object.
+
+        Parameters
+        ----------
+        render: Callable[[dict], bytes]
+            Function rendering a PNG image for the render parameters, e.g.
+            SpaceTimeRasterDataset.render
+        key: tuple
+            Key of the rendered dataset in the cache
+        start_times: numpy.ndarray
+            Start times of the frames
+        end_times: numpy.ndarray
+            End times of the frames, NaT for time instances
+        bbox: dict
+            "n", "s", "e" and "w" of the rendered area
+        width: int
+            Width of the images in pixels
+        height: int
+            Height of the images in pixels
+        prefetch: int
+            Number of frames rendered ahead of the last requested frame
+        max_in_flight: int
+            Maximal number of concurrent render requests
+        cache: ByteCache | None
+            Cache of the rendered images, by default in memory only
+
+        """
+        self.__render = render
+        self.__key = (
+            *key,
+            *(float(bbox[side]) for side in ("n", "s", "e", "w")),
+            int(width),
+            int(height),
+        )
+        self.start_times = np.asarray(start_times, dtype="datetime64[s]")
+        # time instances are rendered up to their start time
+        end_times = np.asarray(end_times, dtype="datetime64[s]")
+        self.end_times = np.where(
+            np.isnat(end_times), self.start_times, end_times
+        )
+        self.__bbox = {side: bbox[side] for side in ("n", "s", "e", "w")}
+        self.width = int(width)
+        self.height = int(height)
+        self.prefetch = prefetch
+        self.cache = ByteCache() if cache is None else cache
+        self.cursor = 0
+        self.rendered = 0
+        self.__executor = ThreadPoolExecutor(max_workers=max_in_flight)
+        self.__futures = {}
+        self.__lock = RLock()
+
+    def __len__(self) -> int:
+        """Return the number of frames."""
+        return len(self.start_times)
+
+    def key(self, index: int) -> tuple:
+        """Return the cache key of a frame."""
+        return (
+            *self.__key,
+            _format_time(self.start_times[index]),
+            _format_time(self.end_times[index]),
+        )
+
+    def __load(self, index: int) -> bytes:
+        """Return a frame from the cache or render it."""
+        key = self.key(index)
+        image = self.cache.get(key)
+        if image is None:
+            image = self.__render(
+                {
+                    **self.__bbox,
+                    "width": self.width,
+                    "height": self.height,
+                    "start_time": _format_time(self.start_times[index]),
+                    "end_time": _format_time(self.end_times[index]),
+                },
+            )
+            self.cache.set(key, image)
+            with self.__lock:
+                self.rendered += 1
+        return image
+
+    def __submit(self, index: int) -> Future:
+        """Return the future of a frame, submitting it if needed."""
+        with self.__lock:
+            future = self.__futures.get(index)
+            if future is None:
+                future = self.__executor.submit(self.__load, index)
+                self.__futures[index] = future
+                future.add_done_callback(
+                    lambda done: self.__discard(index, done),
+                )
+            return future
+
+    def __discard(self, index: int, future: Future) -> None:
+        """Forget the future of a finished or cancelled frame."""
+        with self.__lock:
+            if self.__futures.get(index) is future:
+                del self.__futures[index]
+
+    def __prefetch(self, index: int) -> None:
+        """Submit the frames after index and cancel the others."""
+        ahead = range(index + 1, min(index + 1 + self.prefetch, len(self)))
+        with self.__lock:
+            behind = [
+                future
+                for i, future in self.__futures.items()
+                if i != index and i not in ahead
+            ]
+        for future in behind:
+            future.cancel()
+        for i in ahead:
+            if self.key(i) not in self.cache:
+                self.__submit(i)
+
+    def __getitem__(self, index: int) -> Frame:
+        """Return a frame, rendering it if it is not cached.
+
+        Raises
+        ------
+        IndexError
+            IndexError for indices out of range.
+
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            msg = "Frame index out of range."
+            raise IndexError(msg)
+        self.cursor = index
+        future = self.__submit(index)
+        self.__prefetch(index)
+        return Frame(
+            index,
+            self.start_times[index],
+            self.end_times[index],
+            future.result(),
+        )
+
+    def __iter__(self) -> Iterator[Frame]:
+        """Yield all frames in time order."""
+        for index in range(len(self)):
+            yield self[index]
+
+    def close(self) -> None:
+        """Cancel the prefetching and stop the render threads."""
+        # shutdown(cancel_futures=True) needs Python 3.9
+        with self.__lock:
+            pending = list(self.__futures.values())
+        for future in pending:
+            future.cancel()
+        self.__executor.shutdown(wait=False)
+
+    def __enter__(self) -> FrameRenderer:
+        """Return the renderer itself."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Close the renderer."""
+        self.close()
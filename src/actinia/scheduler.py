@@ -0,0 +1,322 @@
+#!/usr/bin/env python
+
+"""The scheduler module runs process chains that depend on each other.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+from time import monotonic, sleep
+from typing import TYPE_CHECKING
+
+from actinia.batch import RUNNING_STATUS, submit_process_chain
+from actinia.resources.logger import log
+
+if TYPE_CHECKING:
+    from actinia.location import Location
+    from actinia.mapset import Mapset
+
+FAILED_STATUS = ("error", "terminated", "submission_failed", "upstream_failed")
+
+
+class Task:
+    """A process chain in a JobScheduler and its job."""
+
+    def __init__(
+        self,
+        name: str,
+        pc: str | dict,
+        target: Mapset | Location,
+        depends_on: list[Task],
+        stage: str | None = None,
+    ) -> None:
+        """Initialize the Task object."""
+        self.name = name
+        self.process_chain = pc
+        self.target = target
+        self.depends_on = depends_on
+        self.stage = stage
+        self.status = "pending"
+        self.job = None
+        self.error = None
+        self.submit_time = None
+        self.start_time = None
+        self.end_time = None
+        self.poll_errors = 0
+
+    @property
+    def duration(self) -> float:
+        """Return the seconds between submission and end of the job."""
+        if self.submit_time is None or self.end_time is None:
+            return 0.0
+        return self.end_time - self.submit_time
+
+
+class JobScheduler:
+    """Schedule process chains of a multi-stage pipeline.
+
+    Tasks declare the tasks they depend on and are submitted as soon as all
+    of them have finished. If a task fails, all tasks depending on it are
+    marked as 'upstream_failed' and are not submitted.
+    """
+
+    def __init__(
+        self,
+        max_parallel: dict | None = None,
+        default_parallel: int | None = None,
+        *,
+        retries: int = 2,
+        waiting_time: float = 5,
+    ) -> None:
+        """Initialize the JobScheduler object.
+
+        Parameters
+        ----------
+        max_parallel: dict | None
+            Maximal number of jobs in flight per stage name
+        default_parallel: int | None
+            Maximal number of jobs in flight for stages not in
+            max_parallel, unlimited if None
+        retries: int
+            Number of resubmissions of a failed submission and of
+            consecutive failed polls of a job before its task fails
+        waiting_time: float
+            Time to wait in seconds between polls and resubmissions
+
+        Raises
+        ------
+        ValueError
+            ValueError if a limit of jobs in flight is smaller than 1.
+
+        """
+        limits = [*(max_parallel or {}).values(), default_parallel]
+        if any(limit is not None and limit < 1 for limit in limits):
+            msg = "The maximal number of jobs in flight must be at least 1."
+            raise ValueError(msg)
+        self.max_parallel = max_parallel or {}
+        self.default_parallel = default_parallel
+        self.retries = retries
+        self.waiting_time = waiting_time
+        self.tasks = {}
+        self.__start_time = None
+        self.__end_time = None
+
+    def add(
+        self,
+        name: str,
+        pc: str | dict,
+        target: Mapset | Location,
+        depends_on: list[Task | str] | None = None,
+        stage: str | None = None,
+    ) -> Task:
+        """Add a process chain to the scheduler.
+
+        Parameters
+        ----------
+        name: str
+            Unique name of the task, also used as job name
+        pc: str | dict
+            The actinia process chain
+        target: Mapset | Location
+            Mapset (persistent) or location (ephemeral) to process in
+        depends_on: list[Task | str] | None
+            Tasks or task names which have to finish before the submission
+        stage: str | None
+            Name of the pipeline stage of the task
+
+        Returns
+        -------
+        Task
+
+        Raises
+        ------
+        ValueError
+            ValueError if the task name is already used or an upstream task
+            is unknown.
+
+        """
+        if name in self.tasks:
+            msg = f"Task <{name}> already exists."
+            raise ValueError(msg)
+        upstream = []
+        for dep in depends_on or []:
+            dep_name = dep.name if isinstance(dep, Task) else dep
+            if dep_name not in self.tasks:
+                msg = f"Upstream task <{dep_name}> of <{name}> is unknown."
+                raise ValueError(msg)
+            upstream.append(self.tasks[dep_name])
+        task = Task(name, pc, target, upstream, stage)
+        self.tasks[name] = task
+        return task
+
+    def __stage_limit(self, stage: str | None) -> int | None:
+        return self.max_parallel.get(stage, self.default_parallel)
+
+    def __submit(self, task: Task) -> None:
+        """Submit the process chain of a task."""
+        task.submit_time = monotonic()
+        try:
+            task.job = submit_process_chain(
+                task.target,
+                task.process_chain,
+                task.name,
+                retries=self.retries,
+                waiting_time=self.waiting_time,
+            )
+        except Exception as e:
+            log.error(f"Submission of task {task.name} failed: {e}")
+            task.error = e
+            task.status = "submission_failed"
+            task.end_time = monotonic()
+            return
+        log.info(f"Task {task.name} submitted.")
+        self.__set_status(task, task.job.status)
+
+    def __update(self, task: Task) -> None:
+        """Poll the job of a task and update the task status.
+
+        A failed poll is retried with the next poll. The task fails after
+        more than 'retries' consecutive failed polls.
+        """
+        try:
+            task.job.poll(quiet=True)
+        except Exception as e:
+            task.poll_errors += 1
+            if task.poll_errors <= self.retries:
+                log.warning(
+                    f"Polling task {task.name} failed ({e}), "
+                    f"retry {task.poll_errors}/{self.retries}."
+                )
+                return
+            task.error = e
+            task.job.status, task.job.message = "error", str(e)
+        else:
+            task.poll_errors = 0
+        self.__set_status(task, task.job.status)
+
+    def __set_status(self, task: Task, status: str) -> None:
+        """Update the status of a task and record its start and end."""
+        task.status = status
+        if task.start_time is None and task.status != "accepted":
+            task.start_time = monotonic()
+        if task.status not in RUNNING_STATUS:
+            task.end_time = monotonic()
+            if task.status == "finished":
+                log.info(f"Task {task.name} finished.")
+            else:
+                log.error(
+                    f"Task {task.name} is {task.status}: {task.job.message}"
+                )
+
+    def run(self) -> dict[str, Task]:
+        """Run all tasks and wait until they are done.
+
+        Returns
+        -------
+        tasks: dict[str, Task]
+            The tasks with their jobs and final status
+
+        """
+        self.__start_time = monotonic()
+        pending = [t for t in self.tasks.values() if t.status == "pending"]
+        running = []
+        in_flight = {}
+        while pending or running:
+            for task in list(pending):
+                upstream_status = {dep.status for dep in task.depends_on}
+                if upstream_status.intersection(FAILED_STATUS):
+                    task.status = "upstream_failed"
+                    pending.remove(task)
+                    log.warning(f"Task {task.name} skipped: upstream failed.")
+                    continue
+                if upstream_status - {"finished"}:
+                    continue
+                limit = self.__stage_limit(task.stage)
+                if limit is not None and in_flight.get(task.stage, 0) >= limit:
+                    continue
+                pending.remove(task)
+                self.__submit(task)
+                if task.status in RUNNING_STATUS:
+                    running.append(task)
+                    in_flight[task.stage] = in_flight.get(task.stage, 0) + 1
+            if not running:
+                continue
+            sleep(self.waiting_time)
+            for task in list(running):
+                self.__update(task)
+                if task.status not in RUNNING_STATUS:
+                    running.remove(task)
+                    in_flight[task.stage] -= 1
+        self.__end_time = monotonic()
+        return self.tasks
+
+    def critical_path(self) -> list[Task]:
+        """Return the chain of dependent tasks with the longest duration.
+
+        Returns
+        -------
+        path: list[Task]
+            The tasks of the critical path from first to last
+
+        """
+        longest = {}
+        for task in self.tasks.values():
+            # tasks can only depend on tasks added before, so the insertion
+            # order is a topological order
+            best = max(
+                task.depends_on,
+                key=lambda dep: longest[dep.name][0],
+                default=None,
+            )
+            if best is None:
+                longest[task.name] = (task.duration, [task])
+            else:
+                length, path = longest[best.name]
+                longest[task.name] = (length + task.duration, [*path, task])
+        if not longest:
+            return []
+        return max(longest.values(), key=lambda value: value[0])[1]
+
+    def report(self) -> str:
+        """Return a report of the critical path and the task status.
+
+        Returns
+        -------
+        report: str
+            The critical path with the duration of each task and the number
+            of tasks per stage and status
+
+        """
+        lines = []
+        if self.__start_time is not None and self.__end_time is not None:
+            total = self.__end_time - self.__start_time
+            lines.append(f"Total run time: {total:.1f}s")
+        path = self.critical_path()
+        length = sum(task.duration for task in path)
+        lines.append(f"Critical path ({length:.1f}s):")
+        for task in path:
+            stage = f" [{task.stage}]" if task.stage else ""
+            lines.append(
+                f"  {task.name}{stage}: {task.duration:.1f}s ({task.status})"
+            )
+        stages = {}
+        for task in self.tasks.values():
+            counts = stages.setdefault(task.stage, {})
+            counts[task.status] = counts.get(task.status, 0) + 1
+        lines.append("Tasks per stage:")
+        for stage, counts in stages.items():
+            status = ", ".join(f"{k}: {v}" for k, v in sorted(counts.items()))
+            lines.append(f"  {stage}: {status}")
+        return "\n".join(lines)
@@ -0,0 +1,573 @@
+#!/usr/bin/env python
+
+"""The spatial_index module provides an index of the extents of layers.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+from concurrent.futures import ThreadPoolExecutor
+from threading import RLock
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from actinia.catalog import KINDS, Catalog, CatalogEntry
+from actinia.region import Region
+from actinia.resources.logger import log
+
+if TYPE_CHECKING:
+    from actinia import Actinia
+
+# Number of grid cells per axis of each location
+GRID_SIZE = 64
+# Layers covering more grid cells are tested without the grid
+MAX_GRID_CELLS = 16
+# New layers tested without the grid before the grid is rebuilt
+MAX_UNGRIDDED = 1024
+# Cache kinds of the layer info and layer lists by layer type
+INFO_KINDS = {"raster_info": "raster", "vector_info": "vector"}
+LIST_GETTERS = {
+    "raster": "get_raster_layers",
+    "vector": "get_vector_layers",
+    "strds": "get_strds",
+}
+
+
+class _Grid:
+    """Uniform grid of the layers of a location in CSR layout."""
+
+    def __init__(self, rows: np.ndarray, n, s, e, w, size: int) -> None:
+        self.built_rows = 0
+        self.size = size
+        if len(rows) == 0:
+            self.origin = (0.0, 0.0)
+            self.cell = (1.0, 1.0)
+            self.offsets = np.zeros(size * size + 1, dtype=np.int64)
+            self.ids = np.zeros(0, dtype=np.int64)
+            self.large = np.zeros(0, dtype=np.int64)
+            return
+        west, south = float(w[rows].min()), float(s[rows].min())
+        width = max(float(e[rows].max()) - west, 1e-9)
+        height = max(float(n[rows].max()) - south, 1e-9)
+        self.origin = (west, south)
+        self.cell = (width / size, height / size)
+        ix0, iy0 = self.cells(w[rows], s[rows])
+        ix1, iy1 = self.cells(e[rows], n[rows])
+        nx = ix1 - ix0 + 1
+        counts = nx * (iy1 - iy0 + 1)
+        small = counts <= MAX_GRID_CELLS
+        self.large = rows[~small]
+        rows, ix0, iy0, nx, counts = (
+            rows[small],
+            ix0[small],
+            iy0[small],
+            nx[small],
+            counts[small],
+        )
+        # expand each layer to the grid cells it covers
+        k = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        nx = np.repeat(nx, counts)
+        cell_ids = (np.repeat(iy0, counts) + k // nx) * size + (
+            np.repeat(ix0, counts) + k % nx
+        )
+        order = np.argsort(cell_ids, kind="stable")
+        self.ids = np.repeat(rows, counts)[order]
+        self.offsets = np.searchsorted(
+            cell_ids[order], np.arange(size * size + 1)
+        )
+
+    def cells(self, x, y) -> tuple[np.ndarray, np.ndarray]:
+        """Return the grid column and row of coordinates."""
+        ix = np.floor((np.asarray(x) - self.origin[0]) / self.cell[0])
+        iy = np.floor((np.asarray(y) - self.origin[1]) / self.cell[1])
+        return (
+            np.clip(ix, 0, self.size - 1).astype(np.int64),
+            np.clip(iy, 0, self.size - 1).astype(np.int64),
+        )
+
+    def candidates(self, n, s, e, w) -> np.ndarray:
+        """Return the rows of layers in the grid cells of a bounding box."""
+        ix0, iy0 = self.cells(w, s)
+        ix1, iy1 = self.cells(e, n)
+        if (ix1 - ix0 + 1) * (iy1 - iy0 + 1) > self.size * self.size // 4:
+            return np.arange(self.built_rows)
+        parts = [self.large]
+        for iy in range(int(iy0), int(iy1) + 1):
+            start = self.offsets[iy * self.size + ix0]
+            stop = self.offsets[iy * self.size + ix1 + 1]
+            parts.append(self.ids[start:stop])
+        return np.unique(np.concatenate(parts))
+
+
+class SpatialIndex:
+    """Index of the extents of raster, vector and STRDS layers.
+
+    The extents are stored in numpy arrays and indexed per location by a
+    uniform grid, as the locations may have different projections. Layers
+    added or deleted with the client are updated before the next query
+    (see Actinia.cache). Mapsets changed as a whole, e.g. by processing
+    jobs, are only marked as stale and updated in bulk with refresh.
+    """
+
+    def __init__(self, actinia: Actinia, grid_size: int = GRID_SIZE) -> None:
+        """Initialize the SpatialIndex object.
+
+        Parameters
+        ----------
+        actinia: Actinia
+            The Actinia instance of the server
+        grid_size: int
+            Number of grid cells per axis of each location
+
+        """
+        self.__actinia = actinia
+        self.grid_size = grid_size
+        self.errors = {}
+        self.__lock = RLock()
+        self.__pending = set()
+        self.__stale = set()
+        self.__set_arrays([], np.zeros((4, 0)))
+        actinia.cache.add_listener(self.__on_invalidate)
+
+    def __set_arrays(self, entries: list, bounds: np.ndarray) -> None:
+        self.__entries = list(entries)
+        self.__rows = {entry: i for i, entry in enumerate(self.__entries)}
+        self.__n, self.__s, self.__e, self.__w = (
+            np.array(values, dtype=np.float64) for values in bounds
+        )
+        self.__alive = np.ones(len(self.__entries), dtype=bool)
+        self.__locations = sorted({entry.location for entry in entries})
+        self.__location_ids = np.array(
+            [self.__locations.index(e.location) for e in entries],
+            dtype=np.int32,
+        )
+        self.__kinds = np.array(
+            [KINDS.index(e.kind) for e in entries], dtype=np.uint8
+        )
+        self.__grids = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed layers."""
+        self.__update_layers()
+        with self.__lock:
+            return int(self.__alive.sum())
+
+    @property
+    def stale(self) -> set[tuple[str, str]]:
+        """Return the (location, mapset) changed since the last refresh."""
+        with self.__lock:
+            return set(self.__stale)
+
+    def __on_invalidate(self, kind: str | None, path: tuple) -> None:
+        """Queue the layers and mark the mapsets changed by the client."""
+        with self.__lock:
+            if len(path) >= 3 and kind in INFO_KINDS:
+                self.__pending.add((*path[:2], INFO_KINDS[kind], path[2]))
+            elif len(path) >= 3 and kind is None:
+                self.__pending.add((*path[:2], "strds", path[2]))
+            elif len(path) == 2 and kind is None:
+                self.__stale.add(tuple(path))
+            elif len(path) < 2 and kind is None:
+                self.__stale.update(
+                    (entry.location, entry.mapset)
+                    for entry in self.__entries
+                    if entry.location in path or not path
+                )
+
+    def __layer_objects(self, location: str, mapset: str, kind: str) -> dict:
+        """Return the layer objects of a mapset, empty if it is deleted."""
+        locations = self.__actinia.get_locations()
+        if location not in locations:
+            return {}
+        mapsets = locations[location].get_mapsets()
+        if mapset not in mapsets:
+            return {}
+        return getattr(mapsets[mapset], LIST_GETTERS[kind])()
+
+    def __update(self, pending: set, max_in_flight: int = 8) -> None:
+        """Update queued layers and all layers of queued mapsets.
+
+        The layers and their info are requested without holding the lock,
+        so queries are not blocked; the lock is only taken to swap in the
+        results. If a request fails, the items are queued again.
+        """
+        try:
+            with self.__lock:
+                indexed = list(self.__entries)
+            layers = {}
+            for item in pending:
+                if len(item) == 4:
+                    location, mapset, kind, name = item
+                    objects = self.__layer_objects(location, mapset, kind)
+                    entry = CatalogEntry(location, mapset, kind, name)
+                    layers[entry] = objects.get(name)
+                    continue
+                for kind in KINDS:
+                    objects = self.__layer_objects(*item, kind)
+                    for entry in indexed:
+                        if entry[:3] == (*item, kind):
+                            layers[entry] = None
+                    for name, layer in objects.items():
+                        layers[CatalogEntry(*item, kind, name)] = layer
+            entries, bounds = self.__fetch_extents(
+                {e: layer for e, layer in layers.items() if layer is not None},
+                max_in_flight,
+            )
+        except Exception:
+            with self.__lock:
+                self.__pending |= {item for item in pending if len(item) == 4}
+                self.__stale |= {item for item in pending if len(item) == 2}
+            raise
+        with self.__lock:
+            self.__remove(list(layers))
+            self.__append(entries, bounds)
+
+    def __update_layers(self) -> None:
+        """Update the layers queued by cache invalidations."""
+        with self.__lock:
+            pending, self.__pending = self.__pending, set()
+        if pending:
+            self.__update(pending)
+
+    def refresh(self, max_in_flight: int = 8) -> SpatialIndex:
+        """Update the layers of the stale mapsets concurrently.
+
+        Parameters
+        ----------
+        max_in_flight: int
+            Maximal number of concurrent requests
+
+        Returns
+        -------
+        SpatialIndex
+            The spatial index itself
+
+        """
+        with self.__lock:
+            pending = self.__pending | self.__stale
+            self.__pending, self.__stale = set(), set()
+        self.__update(pending, max_in_flight)
+        return self
+
+    def __fetch_extents(
+        self, layers: dict, max_in_flight: int = 8
+    ) -> tuple[list, list]:
+        """Request the info of layers and return their entries and extents."""
+
+        def fetch(item):
+            entry, layer = item
+            try:
+                return Region.from_dict(layer.get_info())
+            except Exception as e:
+                log.warning(f"Requesting info of <{entry.name}> failed: {e}")
+                self.errors[entry] = e
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            regions = list(executor.map(fetch, layers.items()))
+        entries, bounds = [], []
+        for entry, region in zip(layers, regions):
+            if region is None:
+                continue
+            extent = [region.n, region.s, region.e, region.w]
+            if any(value is None for value in extent):
+                log.warning(f"{entry} has no extent and is not indexed")
+                continue
+            entries.append(entry)
+            bounds.append(extent)
+        return entries, bounds
+
+    def build(
+        self,
+        catalog: Catalog | None = None,
+        max_in_flight: int = 8,
+    ) -> SpatialIndex:
+        """Request the extents of all layers of a catalog concurrently.
+
+        Parameters
+        ----------
+        catalog: Catalog | None
+            Catalog of the layers to index, defaults to a new snapshot
+        max_in_flight: int
+            Maximal number of concurrent requests
+
+        Returns
+        -------
+        SpatialIndex
+            The spatial index itself
+
+        """
+        if catalog is None:
+            catalog = Catalog(self.__actinia).snapshot(max_in_flight)
+        layers = {}
+        for kind in KINDS:
+            for entry in catalog.by_kind(kind):
+                try:
+                    layers[entry] = catalog.layer(entry)
+                except KeyError:
+                    log.warning(f"{entry} does not exist anymore")
+        self.errors = {}
+        # changes made while requesting are queued again
+        with self.__lock:
+            self.__pending = set()
+            self.__stale = set()
+        entries, bounds = self.__fetch_extents(layers, max_in_flight)
+        with self.__lock:
+            self.__set_arrays([], np.zeros((4, 0)))
+            self.__append(entries, bounds)
+        return self
+
+    def insert(self, entry: CatalogEntry, region: Region) -> None:
+        """Insert or replace the extent of a layer.
+
+        Parameters
+        ----------
+        entry: CatalogEntry
+            The layer
+        region: Region
+            The extent of the layer
+
+        """
+        bounds = [region.n, region.s, region.e, region.w]
+        if any(value is None for value in bounds):
+            log.warning(f"{entry} has no extent and is not indexed")
+            self.__remove([entry])
+            return
+        with self.__lock:
+            self.__remove([entry])
+            self.__append([entry], [bounds])
+
+    def __append(self, entries: list, bounds: list) -> None:
+        """Append layers, which are not in the index, in one step."""
+        if not entries:
+            return
+        for entry in entries:
+            if entry.location not in self.__locations:
+                self.__locations.append(entry.location)
+        self.__rows.update(
+            (entry, len(self.__entries) + i) for i, entry in enumerate(entries)
+        )
+        self.__entries.extend(entries)
+        new = np.array(bounds, dtype=np.float64).T
+        self.__n, self.__s, self.__e, self.__w = (
+            np.concatenate([values, added])
+            for values, added in zip(
+                (self.__n, self.__s, self.__e, self.__w), new
+            )
+        )
+        self.__alive = np.concatenate(
+            [self.__alive, np.ones(len(entries), dtype=bool)]
+        )
+        self.__location_ids = np.concatenate(
+            [
+                self.__location_ids,
+                np.array(
+                    [self.__locations.index(e.location) for e in entries],
+                    dtype=np.int32,
+                ),
+            ]
+        )
+        self.__kinds = np.concatenate(
+            [
+                self.__kinds,
+                np.array(
+                    [KINDS.index(e.kind) for e in entries], dtype=np.uint8
+                ),
+            ]
+        )
+
+    def remove(self, entry: CatalogEntry) -> None:
+        """Remove a layer from the index."""
+        with self.__lock:
+            self.__remove([entry])
+
+    def __remove(self, entries: list) -> None:
+        with self.__lock:
+            for entry in entries:
+                row = self.__rows.pop(entry, None)
+                if row is not None:
+                    self.__alive[row] = False
+            if (~self.__alive).sum() > max(len(self.__alive) // 2, 1024):
+                self.__compact()
+
+    def __compact(self) -> None:
+        """Drop removed layers and rebuild the grids."""
+        alive = self.__alive
+        entries = [e for e, keep in zip(self.__entries, alive) if keep]
+        bounds = [
+            values[alive]
+            for values in (self.__n, self.__s, self.__e, self.__w)
+        ]
+        self.__set_arrays(entries, bounds)
+
+    def __grid(self, location_id: int) -> _Grid:
+        """Return the grid of a location, rebuilding it if outdated."""
+        grid = self.__grids.get(location_id)
+        ungridded = len(self.__entries) - (grid.built_rows if grid else 0)
+        if grid is None or ungridded > MAX_UNGRIDDED:
+            rows = np.nonzero(
+                (self.__location_ids == location_id) & self.__alive
+            )[0]
+            grid = _Grid(
+                rows,
+                self.__n,
+                self.__s,
+                self.__e,
+                self.__w,
+                self.grid_size,
+            )
+            grid.built_rows = len(self.__entries)
+            self.__grids[location_id] = grid
+        return grid
+
+    def __query(
+        self,
+        n: float,
+        s: float,
+        e: float,
+        w: float,
+        location: str | None,
+        kind: str | None,
+        strict: bool,
+    ) -> list[CatalogEntry]:
+        self.__update_layers()
+        with self.__lock:
+            if location is None:
+                location_ids = range(len(self.__locations))
+            elif location in self.__locations:
+                location_ids = [self.__locations.index(location)]
+            else:
+                return []
+            result = []
+            for location_id in location_ids:
+                grid = self.__grid(location_id)
+                # layers inserted after building the grid
+                new_rows = np.arange(grid.built_rows, len(self.__entries))
+                rows = np.concatenate([grid.candidates(n, s, e, w), new_rows])
+                rows = rows[
+                    self.__alive[rows]
+                    & (self.__location_ids[rows] == location_id)
+                ]
+                if kind is not None:
+                    rows = rows[self.__kinds[rows] == KINDS.index(kind)]
+                if strict:
+                    hit = (
+                        (self.__s[rows] < n)
+                        & (self.__n[rows] > s)
+                        & (self.__w[rows] < e)
+                        & (self.__e[rows] > w)
+                    )
+                else:
+                    hit = (
+                        (self.__s[rows] <= n)
+                        & (self.__n[rows] >= s)
+                        & (self.__w[rows] <= e)
+                        & (self.__e[rows] >= w)
+                    )
+                result.extend(self.__entries[i] for i in rows[hit])
+            return result
+
+    def query(
+        self,
+        bbox: Region | tuple,
+        location: str | None = None,
+        kind: str | None = None,
+    ) -> list[CatalogEntry]:
+        """Return the layers overlapping a bounding box.
+
+        Parameters
+        ----------
+        bbox: Region | tuple
+            Region or tuple (n, s, e, w) in the projection of the location
+        location: str | None
+            Location of the layers, None for all locations
+        kind: str | None
+            Layer type: "raster", "vector", "strds" or None for all
+
+        Returns
+        -------
+        entries: list[CatalogEntry]
+
+        """
+        if isinstance(bbox, Region):
+            bbox = (bbox.n, bbox.s, bbox.e, bbox.w)
+        n, s, e, w = (float(value) for value in bbox)
+        return self.__query(n, s, e, w, location, kind, strict=True)
+
+    def query_point(
+        self,
+        x: float,
+        y: float,
+        location: str | None = None,
+        kind: str | None = None,
+    ) -> list[CatalogEntry]:
+        """Return the layers containing a point.
+
+        Parameters
+        ----------
+        x: float
+            East coordinate in the projection of the location
+        y: float
+            North coordinate in the projection of the location
+        location: str | None
+            Location of the layers, None for all locations
+        kind: str | None
+            Layer type: "raster", "vector", "strds" or None for all
+
+        Returns
+        -------
+        entries: list[CatalogEntry]
+
+        """
+        x, y = float(x), float(y)
+        return self.__query(y, y, x, x, location, kind, strict=False)
+
+    def to_arrays(self) -> tuple[dict, dict]:
+        """Return the metadata and arrays to persist the index.
+
+        Returns
+        -------
+        meta: dict
+            JSON serializable layers of the index
+        arrays: dict
+            The extents of the layers as numpy arrays
+
+        """
+        self.__update_layers()
+        with self.__lock:
+            self.__compact()
+            meta = {"entries": [list(entry) for entry in self.__entries]}
+            arrays = {
+                "n": self.__n,
+                "s": self.__s,
+                "e": self.__e,
+                "w": self.__w,
+            }
+        return meta, arrays
+
+    @classmethod
+    def from_arrays(
+        cls, actinia: Actinia, meta: dict, arrays: dict
+    ) -> SpatialIndex:
+        """Create a SpatialIndex from the return values of to_arrays."""
+        index = cls(actinia)
+        entries = [CatalogEntry(*entry) for entry in meta["entries"]]
+        index.__set_arrays(
+            entries, [arrays[key] for key in ("n", "s", "e", "w")]
+        )
+        return index
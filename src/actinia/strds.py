@@ -18,16 +18,270 @@ __author__ = "Anika Weinmann, Stefan Blumentrath"
 __copyright__ = "Copyright 2022-2024, mundialis GmbH & Co. KG"
 __maintainer__ = "Anika Weinmann"
 
+import hashlib
 import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional
+from time import monotonic, sleep
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, Optional
 
+import numpy as np
+import requests
+
+from actinia.geojson import iter_features
+from actinia.job import Job
+from actinia.raster import Raster
+from actinia.region import Region
+from actinia.render import FrameRenderer
 from actinia.resources.logger import log
-from actinia.utils import request_and_check
+from actinia.temporal_index import TemporalIndex, to_datetime64
+from actinia.utils import (
+    DOWNLOAD_DIR,
+    PNG_SIGNATURE,
+    request_and_check,
+    stream_file,
+)
 
 if TYPE_CHECKING:
     from actinia import Actinia
+    from actinia.cache import ByteCache
+    from actinia.tiles import TileProxy
+
+# No data values of the STRDS sampling
+NULL_VALUES = ("*", "", "nan", "-nan", "null", "none")
+# Statistics of the areal univariate statistics of a STRDS
+STATISTICS = (
+    "number",
+    "minimum",
+    "maximum",
+    "range",
+    "average",
+    "median",
+    "stddev",
+    "sum",
+    "variance",
+    "coeff_var",
+)
+# Feature property to match the statistics to the features of a chunk
+CHUNK_INDEX = "actinia_chunk_index"
+
+
+class Cube(NamedTuple):
+    """A time series of raster maps as memory-mapped (t, y, x) array."""
+
+    data: np.ndarray
+    start_times: np.ndarray
+    end_times: np.ndarray
+    names: list[str]
+    region: Region
+
+
+class SampleResult(NamedTuple):
+    """Values of a STRDS sampled at points as (points, times) array."""
+
+    ids: np.ndarray
+    start_times: np.ndarray
+    end_times: np.ndarray
+    values: np.ndarray
+    metrics: dict | None = None
+
+    @classmethod
+    def from_response(
+        cls,
+        response: dict | list[list[str]],
+        metrics: dict | None = None,
+    ) -> SampleResult:
+        """Decode the response of the STRDS sampling.
+
+        Parameters
+        ----------
+        response: dict | list[list[str]]
+            Response of SpaceTimeRasterDataset.sample_strds or its
+            "process_results" table with the header row ["start_time",
+            "end_time", *ids] and a row of values per raster map
+        metrics: dict | None
+            Metrics of the sampling
+
+        Returns
+        -------
+        result: SampleResult
+            The values as float array with NaN for no data
+
+        """
+        table = response
+        if isinstance(response, dict):
+            table = response["process_results"]
+        if not table:
+            table = [["start_time", "end_time"]]
+        header, *rows = table
+        times = np.array([row[:2] for row in rows], dtype=object)
+        times = times.reshape(-1, 2)
+        values = np.array([row[2:] for row in rows], dtype=str)
+        values = values.reshape(len(rows), len(header) - 2)
+        return cls(
+            ids=np.array(header[2:], dtype=str),
+            start_times=np.array(
+                [_datetime64(time) for time in times[:, 0]],
+                dtype="datetime64[s]",
+            ),
+            end_times=np.array(
+                [_datetime64(time) for time in times[:, 1]],
+                dtype="datetime64[s]",
+            ),
+            values=_decode_values(values).T,
+            metrics=metrics,
+        )
+
+    def as_array(self, dtype: str = "float64") -> np.ndarray:
+        """Return the values as (points, times) array of dtype."""
+        return self.values.astype(dtype, copy=False)
+
+
+class ZonalStatistics(NamedTuple):
+    """Statistics of a STRDS in polygons as (polygons, times, stats) array."""
+
+    ids: np.ndarray
+    times: np.ndarray
+    statistics: tuple[str, ...]
+    values: np.ndarray
+    metrics: dict | None = None
+
+    def statistic(self, name: str) -> np.ndarray:
+        """Return the (polygons, times) array of one statistic."""
+        return self.values[:, :, self.statistics.index(name)]
+
+
+def _decode_statistics(results: list[dict], n_features: int) -> np.ndarray:
+    """Convert the areal univariate statistics to a (features, stats) array.
+
+    The results are matched to the features by their CHUNK_INDEX property
+    or, if it is missing, by position. Features without raster values
+    have no statistics and are NaN.
+    """
+    values = np.full((n_features, len(STATISTICS)), np.nan)
+    for position, result in enumerate(results):
+        index = result.get(CHUNK_INDEX)
+        row = position if index in {None, ""} else int(index)
+        values[row] = [
+            _to_float(result.get(f"raster_{name}")) for name in STATISTICS
+        ]
+    return values
+
+
+def _indexed_features(features: list[dict]) -> list[dict]:
+    """Return copies of features with their position as CHUNK_INDEX."""
+    return [
+        {
+            **feature,
+            "properties": {
+                **(feature.get("properties") or {}),
+                CHUNK_INDEX: position,
+            },
+        }
+        for position, feature in enumerate(features)
+    ]
+
+
+def _is_transient(error: Exception) -> bool:
+    """Check if a request failed because of the connection or the server."""
+    if isinstance(
+        error,
+        (requests.exceptions.ConnectionError, requests.exceptions.Timeout),
+    ):
+        return True
+    # request_and_check passes the HTTPError as second argument
+    http_error = error.args[1] if len(error.args) > 1 else None
+    response = getattr(http_error, "response", None)
+    return response is not None and response.status_code >= 500
+
+
+def _to_float(value: object) -> float:
+    """Convert a statistic to float, NaN if it is missing."""
+    return np.nan if value in {None, ""} else float(value)
+
+
+def _timestamp(time: object) -> str:
+    """Format a time as YYYY-MM-DDTHH:MM:SS for the actinia URLs."""
+    return str(to_datetime64(time))
+
+
+def _decode_values(values: np.ndarray) -> np.ndarray:
+    """Convert sampled values to floats, no data values to NaN."""
+    values = np.char.strip(np.asarray(values, dtype=str))
+    null = np.isin(np.char.lower(values), NULL_VALUES)
+    return np.where(null, "nan", values).astype(np.float64)
+
+
+def _points_array(
+    points: list[list[str]] | np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the ids and the (N, 2) coordinates of sampling points.
+
+    Points are lists of [id, x, y], (N, 2) arrays of coordinates with the
+    rows as ids or structured arrays with the fields "id", "x" and "y".
+
+    Raises
+    ------
+    ValueError
+        ValueError if the ids are not unique.
+
+    """
+    if isinstance(points, np.ndarray) and points.dtype.names:
+        ids = points["id"].astype(str)
+        xy = np.column_stack([points["x"], points["y"]])
+    elif isinstance(points, np.ndarray):
+        xy = points.reshape(-1, 2)
+        ids = np.arange(len(xy)).astype(str)
+    else:
+        ids = np.array([str(point[0]) for point in points], dtype=str)
+        xy = np.array(
+            [(point[1], point[2]) for point in points], dtype=object
+        ).reshape(-1, 2)
+    if np.unique(ids).size != len(ids):
+        msg = "The ids of the sampling points have to be unique."
+        raise ValueError(msg)
+    return ids, xy.astype(np.float64)
+
+
+def _points_json(ids: np.ndarray, xy: np.ndarray) -> list[list[str]]:
+    """Return points as [id, x, y] strings for the sampling requests."""
+    # repr of the floats, which keeps the coordinates exactly
+    coordinates = xy.astype(str)
+    return np.column_stack([ids, coordinates]).tolist()
+
+
+def _datetime64(time: str | None) -> np.datetime64:
+    """Convert a time of a registered raster map to numpy.datetime64."""
+    if not time or time == "None":
+        return np.datetime64("NaT", "s")
+    return np.datetime64(str(time).replace(" ", "T"), "s")
+
+
+def _morton_order(xy: np.ndarray) -> np.ndarray:
+    """Return the order of points along a Z-order (Morton) curve."""
+    if len(xy) == 0:
+        return np.arange(0)
+    low = xy.min(axis=0)
+    span = xy.max(axis=0) - low
+    span[span == 0] = 1
+    cells = ((xy - low) / span * 0xFFFF).astype(np.uint64)
+    codes = np.zeros(len(xy), dtype=np.uint64)
+    for bit in range(16):
+        for axis in range(2):
+            value = (cells[:, axis] >> np.uint64(bit)) & np.uint64(1)
+            codes |= value << np.uint64(2 * bit + axis)
+    return np.argsort(codes, kind="stable")
+
+
+def _chunks(items: list, chunk_size: int) -> list[list]:
+    """Split a list into lists of at most chunk_size items."""
+    chunks = []
+    for start in range(0, len(items), chunk_size):
+        stop = start + chunk_size
+        chunks.append(items[start:stop])
+    return chunks
 
 
 class SpaceTimeRasterDataset:
@@ -49,6 +303,7 @@ class SpaceTimeRasterDataset:
         self.__auth = auth
         self.raster_layers = None
         self.info = None
+        self.__temporal_index = None
 
     def get_info(self, *, force: Optional(bool) = False) -> dict:
         """Return the information of the SpaceTimeRasterDataset (STRDS).
@@ -64,21 +319,29 @@ class SpaceTimeRasterDataset:
             dict with information about the SpaceTimeRasterDataset
 
         """
-        if self.info is None or force is True:
-            url = (
-                f"{self.__actinia.url}/locations/{self.__location_name}/"
-                f"mapsets/{self.__mapset_name}/strds/{self.name}"
-            )
-            resp = request_and_check("GET", url, auth=self.__auth)
-            strds_info = resp["process_results"]
-            self.info = strds_info
+        self.info = self.__actinia.cache.get(
+            "strds_info",
+            (self.__location_name, self.__mapset_name, self.name),
+            self.__request_info,
+            force=force,
+        )
         return self.info
 
+    def __request_info(self) -> dict:
+        """Request the information of the SpaceTimeRasterDataset."""
+        url = (
+            f"{self.__actinia.url}/locations/{self.__location_name}/"
+            f"mapsets/{self.__mapset_name}/strds/{self.name}"
+        )
+        resp = request_and_check("GET", url, auth=self.__auth)
+        return resp["process_results"]
+
     def get_strds_raster_layers(
         self,
         where: Optional(str) = None,
         *,
         force: Optional(bool) = False,
+        local: bool = False,
     ) -> dict:
         """Return a list of Raster Layers from a SpaceTimeRasterDataset.
 
@@ -89,6 +352,10 @@ class SpaceTimeRasterDataset:
             WHERE keyword
         force: bool
             Force uptating STRDS info
+        local: bool
+            Answer the query with the temporal index (see
+            get_temporal_index) instead of a request; only simple
+            conditions joined by AND are supported
 
         Raises
         ------
@@ -101,39 +368,99 @@ class SpaceTimeRasterDataset:
             dict with information about the SpaceTimeRasterDataset
 
         """
+        if local:
+            index = self.get_temporal_index(force=force)
+            self.raster_layers = index.layers(index.where(where))
+            return self.raster_layers
+        self.raster_layers = self.__actinia.cache.get(
+            "strds_raster_layers",
+            (self.__location_name, self.__mapset_name, self.name, where or ""),
+            lambda: self.__request_raster_layers(where),
+            force=force,
+        )
+        return self.raster_layers
+
+    def __request_raster_layers(self, where: str | None) -> list[dict]:
+        """Request the raster layers of the SpaceTimeRasterDataset."""
         possible_status = 400
-        if self.raster_layers is None or force is True:
-            url = (
-                f"{self.__actinia.url}/locations/{self.__location_name}/"
-                f"mapsets/{self.__mapset_name}/strds/{self.name}/raster_layers"
-            )
-            if where:
-                url += f"?where={where}"
-            # Empty STRDS returns status code 400
-            resp = request_and_check(
-                "GET",
-                url,
-                auth=self.__auth,
-                status_code=(
-                    200,
-                    possible_status,
-                ),
-            )
-            if "Dataset is empty" in str(resp["process_log"]):
-                log.info("No raster layer found in STRDS <%s>.", self.name)
-                self.raster_layers = []
-            # All other cases with status 400 should raise an error
-            elif resp["http_code"] == possible_status:
-                error_msg = "Request failed with the following response:\n%s"
-                raise RuntimeError(error_msg, resp)
-            else:
-                self.raster_layers = resp["process_results"]
+        url = (
+            f"{self.__actinia.url}/locations/{self.__location_name}/"
+            f"mapsets/{self.__mapset_name}/strds/{self.name}/raster_layers"
+        )
+        if where:
+            url += f"?where={where}"
+        # Empty STRDS returns status code 400
+        resp = request_and_check(
+            "GET",
+            url,
+            auth=self.__auth,
+            status_code=(
+                200,
+                possible_status,
+            ),
+        )
+        if "Dataset is empty" in str(resp["process_log"]):
+            log.info("No raster layer found in STRDS <%s>.", self.name)
+            return []
+        # All other cases with status 400 should raise an error
+        if resp["http_code"] == possible_status:
+            error_msg = "Request failed with the following response:\n%s"
+            raise RuntimeError(error_msg, resp)
+        return resp["process_results"]
 
-        return self.raster_layers
+    def get_temporal_index(self, *, force: bool = False) -> TemporalIndex:
+        """Return the temporal index of the registered raster maps.
+
+        All registered raster maps are requested once and stored in numpy
+        arrays sorted by start time, which answer time range, point in
+        time and simple attribute queries without requests. Raster maps
+        registered or unregistered with this object are updated in the
+        index, other changes of the mapset, e.g. by processing jobs,
+        rebuild it on the next call.
+
+        Parameters
+        ----------
+        force: bool
+            Rebuild the index
+
+        Returns
+        -------
+        index: TemporalIndex
+            The temporal index
 
-    def register_raster_layers(self, raster_list: list[dict]) -> None:
+        """
+        if self.__temporal_index is None:
+            self.__temporal_index = TemporalIndex(self.__request_raster_layers)
+            self.__temporal_index.stale = True
+            self.__actinia.cache.add_listener(self.__on_invalidate)
+        if force or self.__temporal_index.stale:
+            self.__temporal_index.build()
+        return self.__temporal_index
+
+    def __on_invalidate(self, kind: str | None, path: tuple) -> None:
+        """Mark the temporal index as stale on changes of the mapset."""
+        strds_path = (self.__location_name, self.__mapset_name, self.name)
+        if kind is None and len(path) < len(strds_path):
+            if strds_path[: len(path)] == tuple(path):
+                self.__temporal_index.stale = True
+
+    def register_raster_layers(
+        self,
+        raster_list: list[dict],
+        *,
+        chunk_size: int = 1000,
+        max_in_flight: int = 4,
+        retries: int = 2,
+        waiting_time: float = 5,
+    ) -> dict:
         """Register Raster Layers in a SpaceTimeRasterDataset (STRDS).
 
+        Raster layers which are already registered with the same start and
+        end time are skipped, so failed registrations can be repeated with
+        the same list. The other raster layers are sent sorted by start time
+        in chunks, the temporal index (see get_temporal_index) is updated
+        with a request per chunk.
+
         Parameters
         ----------
         raster_list: List of raster layer dicts
@@ -146,54 +473,217 @@ class SpaceTimeRasterDataset:
                 End time of the raster layer to register in STRDS
 
             Time values have to be formatted: "YYYY-MM-DD HH:MM:SS"
+        chunk_size: int
+            Maximal number of raster layers per request
+        max_in_flight: int
+            Maximal number of concurrent requests
+        retries: int
+            Maximal number of retries of a failed chunk
+        waiting_time: float
+            Seconds to wait before retrying a failed chunk
+
+        Returns
+        -------
+        metrics: dict
+            Number of "registered" and "skipped" raster layers and number
+            of "chunks"
+
+        Raises
+        ------
+        RuntimeError
+            RuntimeError listing the raster layers of failed chunks.
 
         """
-        putkwargs = {
-            "headers": self.__actinia.headers,
-            "auth": self.__auth,
-            "timeout": self.__actinia.timeout,
-            "data": json.dumps(raster_list),
-        }
-        url = (
-            f"{self.__actinia.url}/locations/{self.__location_name}/"
-            f"mapsets/{self.__mapset_name}/strds/{self.name}/raster_layers"
+        index = self.get_temporal_index()
+        rows = {}
+        for row, name in enumerate(index["id"]):
+            rows[name] = row
+            rows.setdefault(name.partition("@")[0], row)
+        missing = []
+        for raster in raster_list:
+            row = rows.get(raster["name"])
+            if row is not None:
+                start = to_datetime64(raster.get("start_time"))
+                end = to_datetime64(raster.get("end_time"))
+                registered = (index["start_time"][row], index["end_time"][row])
+                if all(
+                    time == other or (np.isnat(time) and np.isnat(other))
+                    for time, other in zip((start, end), registered)
+                ):
+                    continue
+            missing.append(raster)
+        missing.sort(key=lambda raster: to_datetime64(raster["start_time"]))
+        chunks = _chunks(missing, chunk_size)
+        done = self.__send_chunks(
+            "PUT", chunks, max_in_flight, retries, waiting_time
         )
-        request_and_check("PUT", url, **putkwargs)
+        # sequentially, as a refresh replaces all maps in its time window
+        for chunk in done:
+            starts = [to_datetime64(x["start_time"]) for x in chunk]
+            index.refresh(min(starts), max(starts))
+        self.__raise_failed(chunks, done, "Registering")
+        return {
+            "registered": len(missing),
+            "skipped": len(raster_list) - len(missing),
+            "chunks": len(chunks),
+        }
 
-    def unregister_raster_layers(self, raster_layers: list[str]) -> None:
+    def unregister_raster_layers(
+        self,
+        raster_layers: list[str],
+        *,
+        chunk_size: int = 1000,
+        max_in_flight: int = 4,
+        retries: int = 2,
+        waiting_time: float = 5,
+    ) -> dict:
         """Unregister Raster Layers from a SpaceTimeRasterDataset (STRDS).
 
+        Raster layers which are not registered are skipped, the others are
+        sent in chunks and removed from the temporal index.
+
         Parameters
         ----------
         raster_layers: list of strings
             List with names of the raster layers to unregister
             from STRDS
+        chunk_size: int
+            Maximal number of raster layers per request
+        max_in_flight: int
+            Maximal number of concurrent requests
+        retries: int
+            Maximal number of retries of a failed chunk
+        waiting_time: float
+            Seconds to wait before retrying a failed chunk
+
+        Returns
+        -------
+        metrics: dict
+            Number of "unregistered" and "skipped" raster layers and
+            number of "chunks"
+
+        Raises
+        ------
+        RuntimeError
+            RuntimeError listing the raster layers of failed chunks.
+
+        """
+        index = self.get_temporal_index()
+        registered = set(index["id"])
+        registered.update(name.partition("@")[0] for name in index["id"])
+        registered_layers = [
+            name for name in raster_layers if name in registered
+        ]
+        chunks = _chunks(registered_layers, chunk_size)
+        done = self.__send_chunks(
+            "DELETE", chunks, max_in_flight, retries, waiting_time
+        )
+        for chunk in done:
+            index.remove(chunk)
+        self.__raise_failed(chunks, done, "Unregistering")
+        return {
+            "unregistered": len(registered_layers),
+            "skipped": len(raster_layers) - len(registered_layers),
+            "chunks": len(chunks),
+        }
+
+    def __send_chunks(
+        self,
+        method: str,
+        chunks: list[list],
+        max_in_flight: int,
+        retries: int,
+        waiting_time: float,
+    ) -> list[list]:
+        """Send chunks of raster layers concurrently to the STRDS.
+
+        Returns
+        -------
+        done: list[list]
+            The chunks which were sent successfully, in order
 
         """
-        delkwargs = {
+        kwargs = {
             "headers": self.__actinia.headers,
             "auth": self.__auth,
             "timeout": self.__actinia.timeout,
-            "data": json.dumps(raster_layers),
         }
         url = (
             f"{self.__actinia.url}/locations/{self.__location_name}/"
             f"mapsets/{self.__mapset_name}/strds/{self.name}/raster_layers"
         )
-        request_and_check("DEL", url, **delkwargs)
+
+        def send(number: int, chunk: list) -> bool:
+            attempt = 0
+            while True:
+                attempt += 1
+                try:
+                    request_and_check(
+                        method, url, data=json.dumps(chunk), **kwargs
+                    )
+                except requests.exceptions.RequestException as e:
+                    if attempt > retries:
+                        log.warning(
+                            f"Sending chunk {number} of STRDS <{self.name}> "
+                            f"failed: {e}"
+                        )
+                        return False
+                    log.warning(
+                        f"Sending chunk {number} of STRDS <{self.name}> "
+                        f"failed ({e}), retrying in {waiting_time} seconds"
+                    )
+                    sleep(waiting_time)
+                else:
+                    return True
+
+        if not chunks:
+            return []
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            results = list(executor.map(send, range(len(chunks)), chunks))
+        self.__invalidate()
+        return [chunk for chunk, ok in zip(chunks, results) if ok]
+
+    def __raise_failed(
+        self, chunks: list[list], done: list[list], action: str
+    ) -> None:
+        """Raise a RuntimeError if not all chunks were sent."""
+        if len(done) == len(chunks):
+            return
+        sent = {id(chunk) for chunk in done}
+        failed = [
+            raster["name"] if isinstance(raster, dict) else raster
+            for chunk in chunks
+            if id(chunk) not in sent
+            for raster in chunk
+        ]
+        msg = (
+            f"{action} {len(failed)} raster layers of STRDS <{self.name}> "
+            f"failed: {', '.join(failed)}"
+        )
+        raise RuntimeError(msg)
+
+    def __invalidate(self) -> None:
+        """Invalidate the cached info and raster layers of the STRDS."""
+        self.__actinia.cache.invalidate(
+            path=(self.__location_name, self.__mapset_name, self.name),
+        )
 
     def sample_strds(
         self,
-        points: list[list[str]] | dict | Path | str,
+        points: list[list[str]] | np.ndarray | dict | Path | str,
         *,
         async_request: bool = False,
     ) -> dict:
         """Sample SpaceTimeRasterDataset at point locations.
 
+        The response can be decoded with SampleResult.from_response.
+
         Parameters
         ----------
-        points: list[tuple] | dict | Path | str
-            Point locations to sample
+        points: list[tuple] | numpy.ndarray | dict | Path | str
+            Point locations to sample as list of [id, x, y], (N, 2) array
+            of coordinates, structured array with the fields "id", "x"
+            and "y", dict with "points" or path to a GeoJSON file
         async_request: bool
             If True, the request is sent asynchronously
 
@@ -224,16 +714,209 @@ class SpaceTimeRasterDataset:
             if not points.exists():
                 msg = f"File <{points}> does not exist"
                 raise OSError(msg)
-            url += f"sampling_{'a' if async_request else ''}sync_geojson"
+            url += f"/sampling_{'a' if async_request else ''}sync_geojson"
             postkwargs["data"] = points.read_text(encoding="UTF8")
         else:
+            if isinstance(points, np.ndarray):
+                points = _points_json(*_points_array(points))
             if isinstance(points, list):
                 postkwargs["data"] = json.dumps({"points": points})
             else:
                 postkwargs["data"] = json.dumps(points)
-            url += f"sampling_{'a' if async_request else ''}sync"
+            url += f"/sampling_{'a' if async_request else ''}sync"
         return request_and_check("POST", url, **postkwargs)
 
+    def sample_points(
+        self,
+        points: list[list[str]] | np.ndarray,
+        *,
+        where: str | None = None,
+        chunk_size: int = 5000,
+        max_in_flight: int = 4,
+        async_request: bool = False,
+        retries: int = 2,
+        waiting_time: float = 5,
+    ) -> SampleResult:
+        """Sample SpaceTimeRasterDataset at many point locations.
+
+        The points are sorted along a Z-order curve and split into chunks
+        of neighbouring points, which are sampled concurrently. The results
+        are merged in the order of the input points.
+
+        Parameters
+        ----------
+        points: list[list[str]] | numpy.ndarray
+            Point locations to sample as list of [id, x, y], (N, 2) array
+            of coordinates with the row numbers as ids or structured array
+            with the fields "id", "x" and "y"; the ids have to be unique
+        where: str | None
+            WHERE condition to select the raster maps
+        chunk_size: int
+            Maximal number of points per request
+        max_in_flight: int
+            Maximal number of concurrent requests
+        async_request: bool
+            If True, the chunks are sampled asynchronously
+        retries: int
+            Maximal number of retries of a chunk after connection errors,
+            server errors and failed jobs
+        waiting_time: float
+            Seconds between polling asynchronous jobs and before retrying
+            a failed chunk
+
+        Returns
+        -------
+        result: SampleResult
+            Values as (points, times) array with NaN for no data and the
+            number of "points" and "chunks", the "elapsed" seconds and
+            the "throughput" in points per second as metrics
+
+        Raises
+        ------
+        ValueError
+            ValueError if the ids of the points are not unique.
+        RuntimeError
+            RuntimeError if a chunk failed after all retries.
+
+        """
+        started = monotonic()
+        ids, xy = _points_array(points)
+        chunks = _chunks(_morton_order(xy), chunk_size)
+
+        def sample(chunk: np.ndarray) -> SampleResult:
+            data = {"points": _points_json(ids[chunk], xy[chunk])}
+            if where:
+                data["where"] = where
+            endpoint = f"sampling_{'a' if async_request else ''}sync"
+            return self.__with_retries(
+                lambda: SampleResult.from_response(
+                    self.__post_results(
+                        endpoint, json.dumps(data), async_request, waiting_time
+                    )
+                ),
+                retries,
+                waiting_time,
+                f"Sampling {len(chunk)} points",
+            )
+
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            results = list(executor.map(sample, chunks))
+        # the raster maps of all chunks, sorted by time; as integers, as
+        # NaT end times of time instances are not equal to each other
+        times = sorted(
+            {
+                time
+                for result in results
+                for time in zip(
+                    result.start_times.view(np.int64).tolist(),
+                    result.end_times.view(np.int64).tolist(),
+                )
+            },
+        )
+        time_index = {time: i for i, time in enumerate(times)}
+        values = np.full((len(ids), len(times)), np.nan)
+        for chunk, result in zip(chunks, results):
+            rows = chunk
+            if not np.array_equal(result.ids, ids[chunk]):
+                # the server did not keep the order of the points
+                row_of = dict(zip(ids[chunk], chunk))
+                rows = np.array([row_of[id_] for id_ in result.ids], int)
+            columns = [
+                time_index[time]
+                for time in zip(
+                    result.start_times.view(np.int64).tolist(),
+                    result.end_times.view(np.int64).tolist(),
+                )
+            ]
+            values[np.ix_(rows, columns)] = result.values
+        times = np.array(times, dtype=np.int64).reshape(-1, 2)
+        times = times.view("datetime64[s]")
+        elapsed = monotonic() - started
+        metrics = {
+            "points": len(ids),
+            "chunks": len(chunks),
+            "elapsed": elapsed,
+            "throughput": len(ids) / elapsed if elapsed else 0.0,
+        }
+        log.info(
+            f"Sampled {len(ids)} points of STRDS <{self.name}> in "
+            f"{len(chunks)} chunks with {metrics['throughput']:.0f} "
+            "points/s"
+        )
+        return SampleResult(
+            ids=ids,
+            start_times=times[:, 0],
+            end_times=times[:, 1],
+            values=values,
+            metrics=metrics,
+        )
+
+    def __post_results(
+        self,
+        endpoint: str,
+        data: str,
+        async_request: bool,
+        waiting_time: float,
+    ) -> list:
+        """POST to an endpoint of the STRDS and return the process results.
+
+        Asynchronous jobs are polled until they are finished.
+
+        Raises
+        ------
+        RuntimeError
+            RuntimeError if the asynchronous job failed.
+
+        """
+        postkwargs = {
+            "headers": self.__actinia.headers,
+            "auth": self.__auth,
+            "timeout": self.__actinia.timeout,
+            "data": data,
+        }
+        url = (
+            f"{self.__actinia.url}/locations/{self.__location_name}/"
+            f"mapsets/{self.__mapset_name}/strds/{self.name}/{endpoint}"
+        )
+        resp = request_and_check("POST", url, **postkwargs)
+        if async_request:
+            job = Job(
+                f"{endpoint.rpartition('/')[2]}_{self.__location_name}_"
+                f"{self.name}",
+                self.__actinia,
+                self.__auth,
+                resp,
+            )
+            if job.poll_until_finished(waiting_time, quiet=True) != 0:
+                msg = f"Job {job.name} failed: {job.status}: {job.message}"
+                raise RuntimeError(msg)
+            resp = {"process_results": job.process_results}
+        return resp["process_results"]
+
+    def __with_retries(
+        self,
+        function: Callable[[], Any],
+        retries: int,
+        waiting_time: float,
+        description: str,
+    ) -> Any:
+        """Call function, retrying after failed jobs and transient errors."""
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return function()
+            except (requests.exceptions.RequestException, RuntimeError) as e:
+                if attempt > retries or not (
+                    isinstance(e, RuntimeError) or _is_transient(e)
+                ):
+                    raise
+                log.warning(
+                    f"{description} of STRDS <{self.name}> failed, "
+                    f"retrying in {waiting_time} seconds"
+                )
+                sleep(waiting_time)
+
     def compute_strds_statistics(
         self,
         polygon: dict | Path | str,
@@ -245,11 +928,12 @@ class SpaceTimeRasterDataset:
 
         Parameters
         ----------
-        polygon: list[tuple] | dict | Path | str
-            Polygon to compute statistics for either as list of tuples
-            with valid coordinates, GeoJSON dict, or path to GeoJSON file
-        timestamp: datetime | None
-            Timestamp to compute statistics for
+        polygon: dict | Path | str
+            Polygons to compute statistics for as GeoJSON dict or path to
+            a GeoJSON file, with the coordinate reference system
+        timestamp: datetime | str | None
+            Timestamp of the raster map to compute statistics for, by
+            default the start time of the STRDS
         async_request: bool
             If True, the request is sent asynchronously
 
@@ -269,10 +953,13 @@ class SpaceTimeRasterDataset:
             "auth": self.__auth,
             "timeout": self.__actinia.timeout,
         }
+        if timestamp is None:
+            timestamp = self.get_info()["start_time"]
         url = (
             f"{self.__actinia.url}/locations/{self.__location_name}/"
-            f"mapsets/{self.__mapset_name}/strds/{self.name}"
-            f"timestamp/{timestamp.strftime('%Y-%m-%dT%H:%M:%S')}"
+            f"mapsets/{self.__mapset_name}/strds/{self.name}/"
+            f"timestamp/{_timestamp(timestamp)}/"
+            f"area_stats_univar_{'a' if async_request else ''}sync"
         )
         if isinstance(polygon, str):
             polygon = Path(polygon)
@@ -280,25 +967,213 @@ class SpaceTimeRasterDataset:
             if not polygon.exists():
                 msg = f"File <{polygon}> does not exist"
                 raise OSError(msg)
-            url += f"sampling_{'a' if async_request else ''}sync_geojson"
             postkwargs["data"] = polygon.read_text(encoding="UTF8")
         else:
             postkwargs["data"] = json.dumps(polygon)
-            url += f"sampling_{'a' if async_request else ''}sync"
         return request_and_check("POST", url, **postkwargs)
 
-    def render(self, render_dict: dict) -> dict:
+    def compute_zonal_statistics(
+        self,
+        polygons: dict | Path | str,
+        timestamps: list | np.ndarray | None = None,
+        *,
+        where: str | None = None,
+        chunk_size: int = 1000,
+        max_in_flight: int = 4,
+        async_request: bool = False,
+        retries: int = 2,
+        waiting_time: float = 5,
+    ) -> ZonalStatistics:
+        """Compute statistics of many polygons at many timestamps.
+
+        The polygons are sent in chunks, each chunk and timestamp in its
+        own request with compute_strds_statistics, concurrently. The
+        results are cached in Actinia.cache until raster maps of the STRDS
+        are (un)registered, so failed computations can be repeated and
+        only request the missing results.
+
+        Parameters
+        ----------
+        polygons: dict | Path | str
+            GeoJSON FeatureCollection with the coordinate reference system
+            or path to a GeoJSON file
+        timestamps: list | numpy.ndarray | None
+            Timestamps of the raster maps, by default the start times of
+            the raster maps selected by where
+        where: str | None
+            Simple WHERE condition to select the raster maps (see
+            TemporalIndex.where), if no timestamps are given
+        chunk_size: int
+            Maximal number of polygons per request
+        max_in_flight: int
+            Maximal number of concurrent requests
+        async_request: bool
+            If True, the statistics are computed asynchronously
+        retries: int
+            Maximal number of retries of a request after connection
+            errors, server errors and failed jobs
+        waiting_time: float
+            Seconds between polling asynchronous jobs and before retrying
+            a failed request
+
+        Returns
+        -------
+        statistics: ZonalStatistics
+            Statistics as (polygons, times, statistics) array with NaN for
+            polygons without raster values, the "id" of the features or
+            their position as ids and the number of "requests", "cached"
+            results and the "elapsed" seconds as metrics
+
+        Raises
+        ------
+        RuntimeError
+            RuntimeError listing the timestamps of failed requests.
+
+        """
+        started = monotonic()
+        members = {}
+        if isinstance(polygons, dict):
+            features = polygons["features"]
+            members = polygons
+        else:
+            features = list(iter_features(polygons, members=members))
+        header = {
+            key: value
+            for key, value in members.items()
+            if key not in {"type", "bbox", "features"}
+        }
+        if timestamps is None:
+            index = self.get_temporal_index()
+            times = np.unique(index["start_time"][index.where(where)])
+        else:
+            times = np.unique(
+                np.array(
+                    [to_datetime64(time) for time in timestamps],
+                    dtype="datetime64[s]",
+                )
+            )
+        chunks = _chunks(features, chunk_size)
+        bodies = [
+            json.dumps(
+                {
+                    "type": "FeatureCollection",
+                    **header,
+                    "features": _indexed_features(chunk),
+                }
+            )
+            for chunk in chunks
+        ]
+        digests = [
+            hashlib.sha256(body.encode()).hexdigest() for body in bodies
+        ]
+        endpoint = f"area_stats_univar_{'a' if async_request else ''}sync"
+        cache = self.__actinia.cache
+        tasks = [
+            (number, column)
+            for column in range(len(times))
+            for number in range(len(chunks))
+        ]
+        paths = {
+            task: (
+                self.__location_name,
+                self.__mapset_name,
+                self.name,
+                _timestamp(times[task[1]]),
+                digests[task[0]],
+            )
+            for task in tasks
+        }
+        cached = sum(
+            cache.peek("strds_statistics", path) is not None
+            for path in paths.values()
+        )
+
+        def compute(task: tuple[int, int]) -> np.ndarray:
+            number, column = task
+            time = _timestamp(times[column])
+            return cache.get(
+                "strds_statistics",
+                paths[task],
+                lambda: self.__with_retries(
+                    lambda: _decode_statistics(
+                        self.__post_results(
+                            f"timestamp/{time}/{endpoint}",
+                            bodies[number],
+                            async_request,
+                            waiting_time,
+                        ),
+                        len(chunks[number]),
+                    ),
+                    retries,
+                    waiting_time,
+                    f"Computing statistics at {time}",
+                ),
+            )
+
+        values = np.full((len(features), len(times), len(STATISTICS)), np.nan)
+        offsets = np.cumsum([0] + [len(chunk) for chunk in chunks])
+        failed = set()
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            futures = {executor.submit(compute, task): task for task in tasks}
+            for future, (number, column) in futures.items():
+                try:
+                    chunk_values = future.result()
+                except Exception as e:
+                    log.warning(
+                        f"Computing statistics at "
+                        f"{_timestamp(times[column])} failed: {e}"
+                    )
+                    failed.add(_timestamp(times[column]))
+                    continue
+                start, stop = offsets[number], offsets[number + 1]
+                values[start:stop, column] = chunk_values
+        if failed:
+            msg = (
+                f"Computing statistics of STRDS <{self.name}> failed at "
+                f"{', '.join(sorted(failed))}"
+            )
+            raise RuntimeError(msg)
+        return ZonalStatistics(
+            ids=np.array(
+                [
+                    str(feature.get("id", position))
+                    for position, feature in enumerate(features)
+                ],
+                dtype=str,
+            ),
+            times=times,
+            statistics=STATISTICS,
+            values=values,
+            metrics={
+                "requests": len(tasks) - cached,
+                "cached": cached,
+                "elapsed": monotonic() - started,
+            },
+        )
+
+    def render(self, render_dict: dict) -> bytes:
         """Render Raster layers in a SpaceTimeRasterDataset (STRDS).
 
+        The raster maps starting after start_time and ending before
+        end_time are rendered into one image.
+
+        Parameters
+        ----------
+        render_dict: dict
+            dict with the keys "n", "s", "e", "w", "width", "height",
+            "start_time" and "end_time"
+
         Returns
         -------
-        render: dict
-            dict with render response.
+        render: bytes
+            The rendered PNG image
 
         Raises
         ------
         ValueError:
             ValueError if dict does not containt required keys.
+        RuntimeError:
+            RuntimeError if the response is not a PNG image.
 
         """
         if set(render_dict.keys()) != {
@@ -317,14 +1192,329 @@ class SpaceTimeRasterDataset:
                 " 'start_time', 'end_time'"
             )
             raise ValueError(msg)
-        getkwargs = {
-            "headers": self.__actinia.headers,
-            "auth": self.__auth,
-            "timeout": self.__actinia.timeout,
-            "data": json.dumps(render_dict),
-        }
         url = (
             f"{self.__actinia.url}/locations/{self.__location_name}/"
             f"mapsets/{self.__mapset_name}/strds/{self.name}/render"
         )
-        return request_and_check("GET", url, **getkwargs)
+        image = b"".join(
+            stream_file(
+                url,
+                params=render_dict,
+                auth=self.__auth,
+                timeout=self.__actinia.timeout,
+            ),
+        )
+        if not image.startswith(PNG_SIGNATURE):
+            msg = f"Rendering STRDS <{self.name}> failed: {image[:1000]!r}"
+            raise RuntimeError(msg)
+        return image
+
+    def render_version(self) -> tuple:
+        """Return the version of the STRDS for caching rendered images.
+
+        The version changes when raster maps are (un)registered. It is
+        taken from the cached STRDS info, which is reloaded after changes
+        made by the client.
+
+        Returns
+        -------
+        version: tuple
+            Modification time, number of maps, start and end time
+
+        """
+        info = self.get_info()
+        return tuple(
+            info.get(key)
+            for key in (
+                "modification_time",
+                "number_of_maps",
+                "start_time",
+                "end_time",
+            )
+        )
+
+    def frames(
+        self,
+        region: Region | dict,
+        width: int = 800,
+        height: int = 600,
+        *,
+        start: object = None,
+        end: object = None,
+        where: str | None = None,
+        prefetch: int = 8,
+        max_in_flight: int = 4,
+        cache: ByteCache | None = None,
+    ) -> FrameRenderer:
+        """Return a FrameRenderer rendering the raster maps one by one.
+
+        The frames are the raster maps selected with the temporal index
+        (see get_temporal_index), sorted by start time. The cached images
+        are keyed by the render_version of the STRDS, so images of
+        changed STRDS are rendered again.
+
+        Parameters
+        ----------
+        region: Region | dict
+            Region or dict with "n", "s", "e" and "w" of the rendered area
+        width: int
+            Width of the images in pixels
+        height: int
+            Height of the images in pixels
+        start: str | datetime | numpy.datetime64 | None
+            Start of the time range of the raster maps
+        end: str | datetime | numpy.datetime64 | None
+            End of the time range of the raster maps
+        where: str | None
+            Simple WHERE condition to select the raster maps
+        prefetch: int
+            Number of frames rendered ahead of the last requested frame
+        max_in_flight: int
+            Maximal number of concurrent render requests
+        cache: ByteCache | None
+            Cache of the rendered images, by default Actinia.render_cache
+
+        Returns
+        -------
+        frames: FrameRenderer
+            The frames, which can be indexed and iterated
+
+        """
+        if isinstance(region, Region):
+            region = region.to_dict()
+        index = self.get_temporal_index()
+        rows = index.select(where, start=start, end=end)
+        if cache is None:
+            cache = self.__actinia.render_cache
+        return FrameRenderer(
+            self.render,
+            (
+                "strds",
+                self.__location_name,
+                self.__mapset_name,
+                self.name,
+                *self.render_version(),
+            ),
+            index["start_time"][rows],
+            index["end_time"][rows],
+            region,
+            width,
+            height,
+            prefetch=prefetch,
+            max_in_flight=max_in_flight,
+            cache=cache,
+        )
+
+    def tile_url(
+        self,
+        proxy: TileProxy,
+        start_time: object,
+        end_time: object = None,
+    ) -> str:
+        """Serve a time step of the STRDS as XYZ tiles with a tile proxy.
+
+        The raster maps starting after start_time and ending before
+        end_time are rendered into the tiles, see render.
+
+        Parameters
+        ----------
+        proxy: TileProxy
+            Started tile proxy serving the tiles
+        start_time: str | datetime | numpy.datetime64
+            Start of the rendered time range
+        end_time: str | datetime | numpy.datetime64 | None
+            End of the rendered time range, by default the start time
+
+        Returns
+        -------
+        url_template: str
+            URL template of the tiles, e.g. for leafmap.Map.add_tile_layer
+
+        """
+        key = ("strds", self.__location_name, self.__mapset_name, self.name)
+        name = "/".join(key)
+        proxy.add_layer(name, self.render, key, version=self.render_version)
+        return proxy.url_template(name, start_time, end_time)
+
+    def to_cube(
+        self,
+        region: Region | None = None,
+        where: str | None = None,
+        *,
+        path: str | Path | None = None,
+        max_in_flight: int = 4,
+        dtype: str = "float32",
+        waiting_time: int = 5,
+    ) -> Cube:
+        """Export the raster maps of the STRDS into a (t, y, x) array.
+
+        The raster maps are exported concurrently and each map is written
+        into its slice of a memory-mapped array in path. Slices which are
+        already present in path from an earlier call with the same maps
+        and region are not exported again, so an interrupted or failed
+        download can be resumed by calling the method again. No data cells
+        are NaN for floating point dtypes.
+
+        Parameters
+        ----------
+        region: Region | None
+            Region to export, by default the extent and the finest
+            resolution of the STRDS
+        where: str | None
+            WHERE-clause to select the raster maps, see
+            get_strds_raster_layers
+        path: str | Path | None
+            Directory for the cube, by default a directory in DOWNLOAD_DIR
+            named by location, mapset and STRDS
+        max_in_flight: int
+            Maximal number of concurrent export jobs
+        dtype: str
+            Data type of the cube
+        waiting_time: int
+            Time to wait in seconds between polls of the export jobs
+
+        Returns
+        -------
+        cube: Cube
+            The memory-mapped data, ordered by start time, with the start
+            and end times, the names of the raster maps and the region
+
+        Raises
+        ------
+        ValueError
+            ValueError if the STRDS has no raster maps for where or the
+            region has no resolution.
+        RuntimeError
+            RuntimeError if exports failed; the cube is kept for resuming.
+
+        """
+        layers = self.get_strds_raster_layers(where)
+        if not layers:
+            msg = f"No raster layer found in STRDS <{self.name}>."
+            raise ValueError(msg)
+        layers = sorted(layers, key=lambda layer: str(layer["start_time"]))
+        names = [layer["id"] for layer in layers]
+        if region is None:
+            info = self.get_info()
+            region = Region(
+                n=float(info["north"]),
+                s=float(info["south"]),
+                e=float(info["east"]),
+                w=float(info["west"]),
+                nsres=float(info["nsres_min"]),
+                ewres=float(info["ewres_min"]),
+            )
+        if region.nsres is None or region.ewres is None:
+            msg = "The region must have a resolution."
+            raise ValueError(msg)
+        rows = round((region.n - region.s) / region.nsres)
+        cols = round((region.e - region.w) / region.ewres)
+        if path is None:
+            path = DOWNLOAD_DIR / "_".join(
+                [self.__location_name, self.__mapset_name, self.name],
+            )
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "names": names,
+            "region": [
+                region.n,
+                region.s,
+                region.e,
+                region.w,
+                region.nsres,
+                region.ewres,
+            ],
+            "dtype": np.dtype(dtype).str,
+        }
+        meta_path = path / "cube.json"
+        resume = meta_path.exists() and (
+            json.loads(meta_path.read_text()) == meta
+        )
+        mode = "r+" if resume else "w+"
+        shape = (len(names), rows, cols)
+        data = np.lib.format.open_memmap(
+            path / "cube.npy",
+            mode=mode,
+            dtype=dtype,
+            shape=shape,
+        )
+        done = np.lib.format.open_memmap(
+            path / "done.npy",
+            mode=mode,
+            dtype=bool,
+            shape=(len(names),),
+        )
+        if not resume:
+            meta_path.write_text(json.dumps(meta))
+        start_times = np.array([_datetime64(x["start_time"]) for x in layers])
+        end_times = np.array([_datetime64(x["end_time"]) for x in layers])
+        np.save(path / "start_times.npy", start_times)
+        np.save(path / "end_times.npy", end_times)
+
+        def export(index: int) -> None:
+            name, mapset = names[index].split("@")
+            raster = Raster(
+                name,
+                self.__location_name,
+                mapset,
+                self.__actinia,
+                self.__auth,
+            )
+            directory = path / f"slice_{index}"
+            array, _, nodata = raster.to_numpy(
+                region,
+                directory=directory,
+                waiting_time=waiting_time,
+            )
+            if array.shape != (rows, cols):
+                msg = (
+                    f"Exported raster <{names[index]}> has shape "
+                    f"{array.shape} instead of {(rows, cols)}."
+                )
+                raise ValueError(msg)
+            data[index] = array
+            if nodata is not None and data.dtype.kind == "f":
+                data[index][array == nodata] = np.nan
+            del array
+            data.flush()
+            done[index] = True
+            done.flush()
+            shutil.rmtree(directory, ignore_errors=True)
+
+        missing = np.flatnonzero(~done)
+        log.info(
+            "Exporting %d of %d raster maps of STRDS <%s>.",
+            len(missing),
+            len(names),
+            self.name,
+        )
+        errors = {}
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            futures = {
+                names[index]: executor.submit(export, index)
+                for index in missing
+            }
+            for name, future in futures.items():
+                error = future.exception()
+                if error is not None:
+                    log.error("Export of <%s> failed: %s", name, error)
+                    errors[name] = error
+        if errors:
+            msg = (
+                f"Export of {len(errors)} raster maps of STRDS <{self.name}> "
+                f"failed: {', '.join(errors)}. Call to_cube again to resume."
+            )
+            raise RuntimeError(msg)
+        region = Region(
+            n=region.n,
+            s=region.s,
+            e=region.e,
+            w=region.w,
+            nsres=region.nsres,
+            ewres=region.ewres,
+            rows=rows,
+            cols=cols,
+            cells=rows * cols,
+        )
+        return Cube(data, start_times, end_times, names, region)
@@ -0,0 +1,419 @@
+#!/usr/bin/env python
+
+"""The temporal_index module provides an index of the maps of a STRDS.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import re
+from threading import RLock
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+# Numeric columns of the registered raster maps kept in the index
+NUMERIC_COLUMNS = (
+    "north",
+    "south",
+    "east",
+    "west",
+    "nsres",
+    "ewres",
+    "rows",
+    "cols",
+    "min",
+    "max",
+)
+TIME_COLUMNS = ("start_time", "end_time")
+TEXT_COLUMNS = ("id", "name", "mapset")
+OPERATORS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "=": np.equal,
+    "==": np.equal,
+    "!=": np.not_equal,
+    "<>": np.not_equal,
+}
+TERM = re.compile(
+    r"""^\s*(\w+)\s*(<=|>=|<>|!=|==|=|<|>)\s*('[^']*'|"[^"]*"|[^\s'"]+)\s*$""",
+)
+AND = re.compile(r"\s+and\s+", re.IGNORECASE)
+
+
+def _split_ids(ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Split map ids into names and mapsets."""
+    if len(ids) == 0:
+        return ids, ids
+    parts = np.char.partition(ids, "@")
+    return parts[:, 0], parts[:, 2]
+
+
+def _to_float(value: object) -> float:
+    """Convert a numeric value of the server to float, NaN for None."""
+    return np.nan if value in {None, "None"} else float(value)
+
+
+def to_datetime64(time: object) -> np.datetime64:
+    """Convert a time string or datetime to numpy.datetime64 in seconds."""
+    if time is None or str(time) in {"", "None", "NaT"}:
+        return np.datetime64("NaT", "s")
+    return np.datetime64(str(time).strip("'\"").replace(" ", "T"), "s")
+
+
+class TemporalIndex:
+    """Index of the registered raster maps of a STRDS in numpy arrays.
+
+    The maps are sorted by start time, so time range and point in time
+    queries use binary search instead of a request to the server. Simple
+    WHERE conditions of columns compared with values and joined by AND
+    are answered locally as well.
+    """
+
+    def __init__(self, fetch: Callable[[str | None], list[dict]]) -> None:
+        """Initialize the TemporalIndex object.
+
+        Parameters
+        ----------
+        fetch: Callable[[str | None], list[dict]]
+            Function requesting the registered raster maps for a WHERE
+            condition, e.g. SpaceTimeRasterDataset.get_strds_raster_layers
+
+        """
+        self.__fetch = fetch
+        self.__lock = RLock()
+        self.stale = False
+        self.__set_arrays(self.__to_arrays([]))
+
+    @staticmethod
+    def __to_arrays(layers: list[dict]) -> dict:
+        """Convert the layer dicts of the server to column arrays."""
+        arrays = {
+            column: np.array(
+                [to_datetime64(layer.get(column)) for layer in layers],
+                dtype="datetime64[s]",
+            )
+            for column in TIME_COLUMNS
+        }
+        ids = [
+            layer.get("id") or f"{layer['name']}@{layer.get('mapset')}"
+            for layer in layers
+        ]
+        arrays["id"] = np.array(ids, dtype=str)
+        columns = [
+            column
+            for column in NUMERIC_COLUMNS
+            if layers and column in layers[0]
+        ]
+        for column in columns:
+            arrays[column] = np.array(
+                [_to_float(layer.get(column)) for layer in layers],
+                dtype=np.float64,
+            )
+        return arrays
+
+    def __set_arrays(self, arrays: dict) -> None:
+        """Sort the column arrays and compute the search arrays."""
+        order = np.lexsort((arrays["id"], arrays["start_time"]))
+        self.__arrays = {key: value[order] for key, value in arrays.items()}
+        start = self.__arrays["start_time"]
+        end = self.__arrays["end_time"]
+        # maps with time instances end at their start
+        self.__end = np.where(np.isnat(end), start, end)
+        # latest end of the maps up to each row, as the ends are not sorted
+        self.__end_max = (
+            np.maximum.accumulate(self.__end) if len(start) else self.__end
+        )
+        self.__rows = {name: i for i, name in enumerate(self.__arrays["id"])}
+
+    def build(self) -> TemporalIndex:
+        """Request all registered raster maps and index them.
+
+        Returns
+        -------
+        index: TemporalIndex
+            The index itself
+
+        """
+        layers = self.__fetch(None)
+        with self.__lock:
+            self.__set_arrays(self.__to_arrays(layers))
+            self.stale = False
+        return self
+
+    def refresh(self, start: object, end: object) -> None:
+        """Request the raster maps starting in a time range again.
+
+        This is used to update the index after registering raster maps
+        without requesting all maps.
+
+        Parameters
+        ----------
+        start: str | datetime | numpy.datetime64
+            Earliest start time of the changed maps
+        end: str | datetime | numpy.datetime64
+            Latest start time of the changed maps
+
+        """
+        start, end = to_datetime64(start), to_datetime64(end)
+        where = (
+            f"start_time >= '{start.astype(object):%Y-%m-%d %H:%M:%S}' AND "
+            f"start_time <= '{end.astype(object):%Y-%m-%d %H:%M:%S}'"
+        )
+        layers = self.__to_arrays(self.__fetch(where))
+        with self.__lock:
+            times = self.__arrays["start_time"]
+            keep = (times < start) | (times > end)
+            # maps registered again with another start time
+            keep &= ~np.isin(self.__arrays["id"], layers["id"])
+            self.__merge(keep, layers)
+
+    def remove(self, names: Iterable[str]) -> None:
+        """Remove unregistered raster maps from the index.
+
+        Parameters
+        ----------
+        names: Iterable[str]
+            Names of the raster maps, with or without mapset
+
+        """
+        names = set(names)
+        with self.__lock:
+            ids = self.__arrays["id"]
+            short, _ = _split_ids(ids)
+            keep = ~(np.isin(ids, list(names)) | np.isin(short, list(names)))
+            self.__merge(keep, self.__to_arrays([]))
+
+    def __merge(self, keep: np.ndarray, arrays: dict) -> None:
+        """Replace the index by the kept rows and new column arrays."""
+        columns = set(self.__arrays) | set(arrays)
+        merged = {}
+        for column in columns:
+            old = self.__arrays.get(column)
+            new = arrays.get(column)
+            if old is None:
+                old = np.full(len(keep), np.nan)
+            if new is None:
+                new = np.full(len(arrays["id"]), np.nan)
+            merged[column] = np.concatenate([old[keep], new])
+        self.__set_arrays(merged)
+
+    def __len__(self) -> int:
+        """Return the number of indexed raster maps."""
+        return len(self.__arrays["id"])
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """Return a column array, sorted by start time."""
+        return self.__arrays[column]
+
+    @property
+    def columns(self) -> list[str]:
+        """Return the names of the column arrays."""
+        return list(self.__arrays)
+
+    def index(self, name: str) -> int:
+        """Return the row of a raster map given as name@mapset."""
+        return self.__rows[name]
+
+    def during(self, start: object, end: object) -> np.ndarray:
+        """Return the rows of the maps overlapping a time range.
+
+        Parameters
+        ----------
+        start: str | datetime | numpy.datetime64
+            Start of the time range, inclusive
+        end: str | datetime | numpy.datetime64
+            End of the time range, exclusive
+
+        Returns
+        -------
+        rows: numpy.ndarray
+            Sorted rows of the maps
+
+        """
+        start, end = to_datetime64(start), to_datetime64(end)
+        with self.__lock:
+            times = self.__arrays["start_time"]
+            stop = np.searchsorted(times, end, "left")
+            first = min(
+                np.searchsorted(self.__end_max, start, "right"),
+                np.searchsorted(times, start, "left"),
+            )
+            rows = np.arange(first, max(stop, first))
+            overlaps = (self.__end[rows] > start) | (times[rows] >= start)
+            return rows[overlaps]
+
+    def at(self, time: object) -> np.ndarray:
+        """Return the rows of the maps valid at a point in time.
+
+        Parameters
+        ----------
+        time: str | datetime | numpy.datetime64
+            The point in time
+
+        Returns
+        -------
+        rows: numpy.ndarray
+            Sorted rows of the maps
+
+        """
+        time = to_datetime64(time)
+        with self.__lock:
+            times = self.__arrays["start_time"]
+            stop = np.searchsorted(times, time, "right")
+            first = min(
+                np.searchsorted(self.__end_max, time, "right"),
+                np.searchsorted(times, time, "left"),
+            )
+            rows = np.arange(first, max(stop, first))
+            valid = (self.__end[rows] > time) | (times[rows] == time)
+            return rows[valid]
+
+    def where(self, where: str | None) -> np.ndarray:
+        """Return the rows of the maps matching a simple WHERE condition.
+
+        Supported are comparisons (<, <=, >, >=, =, !=) of the time, id,
+        name, mapset and numeric columns with a value, joined by AND, e.g.
+        "start_time >= '2023-01-01' AND max > 100".
+
+        Parameters
+        ----------
+        where: str | None
+            WHERE condition without the WHERE keyword, all maps if None
+
+        Returns
+        -------
+        rows: numpy.ndarray
+            Sorted rows of the maps
+
+        Raises
+        ------
+        ValueError
+            ValueError for conditions which are not supported.
+
+        """
+        with self.__lock:
+            mask = np.ones(len(self), dtype=bool)
+            terms = AND.split(where) if where else []
+            for term in terms:
+                match = TERM.match(term)
+                if match is None:
+                    msg = f"Unsupported condition <{term}>."
+                    raise ValueError(msg)
+                column, operator, value = match.groups()
+                mask &= OPERATORS[operator](
+                    self.__column(column),
+                    self.__value(column, value),
+                )
+            return np.flatnonzero(mask)
+
+    def __column(self, column: str) -> np.ndarray:
+        """Return a column array for comparisons."""
+        if column in {"name", "mapset"}:
+            names, mapsets = _split_ids(self.__arrays["id"])
+            return names if column == "name" else mapsets
+        if column not in self.__arrays:
+            msg = f"Unsupported column <{column}>."
+            raise ValueError(msg)
+        return self.__arrays[column]
+
+    @staticmethod
+    def __value(column: str, value: str) -> object:
+        """Convert a value of a condition to the type of the column."""
+        if column in TIME_COLUMNS:
+            return to_datetime64(value)
+        if column in TEXT_COLUMNS:
+            return value.strip("'\"")
+        return float(value)
+
+    def select(
+        self,
+        where: str | None = None,
+        *,
+        start: object = None,
+        end: object = None,
+        at: object = None,
+    ) -> np.ndarray:
+        """Return the rows of the maps matching all given conditions.
+
+        Parameters
+        ----------
+        where: str | None
+            Simple WHERE condition, see where
+        start: str | datetime | numpy.datetime64 | None
+            Start of a time range the maps overlap
+        end: str | datetime | numpy.datetime64 | None
+            End of a time range the maps overlap
+        at: str | datetime | numpy.datetime64 | None
+            Point in time the maps are valid at
+
+        Returns
+        -------
+        rows: numpy.ndarray
+            Sorted rows of the maps
+
+        """
+        with self.__lock:
+            rows = self.where(where)
+            if start is not None or end is not None:
+                start = np.datetime64("0001-01-01") if start is None else start
+                end = np.datetime64("9999-12-31") if end is None else end
+                rows = np.intersect1d(rows, self.during(start, end))
+            if at is not None:
+                rows = np.intersect1d(rows, self.at(at))
+            return rows
+
+    def layers(self, rows: np.ndarray | None = None) -> list[dict]:
+        """Return the maps of rows as dicts like get_strds_raster_layers.
+
+        Parameters
+        ----------
+        rows: numpy.ndarray | None
+            Rows of the maps, all maps if None
+
+        Returns
+        -------
+        layers: list[dict]
+            The maps with id, name, mapset, time and numeric columns
+
+        """
+        with self.__lock:
+            if rows is None:
+                rows = np.arange(len(self))
+            layers = []
+            for row in rows:
+                name, _, mapset = str(self.__arrays["id"][row]).partition("@")
+                layer = {
+                    "id": str(self.__arrays["id"][row]),
+                    "name": name,
+                    "mapset": mapset,
+                }
+                for column in TIME_COLUMNS:
+                    time = self.__arrays[column][row]
+                    layer[column] = (
+                        "None"
+                        if np.isnat(time)
+                        else str(time).replace("T", " ")
+                    )
+                for column in NUMERIC_COLUMNS:
+                    if column in self.__arrays:
+                        layer[column] = float(self.__arrays[column][row])
+                layers.append(layer)
+            return layers
@@ -0,0 +1,539 @@
+#!/usr/bin/env python
+"""The tiles module serves XYZ tiles of rendered raster maps locally.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, RLock, Thread
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qs, quote, unquote, urlencode, urlsplit
+
+import numpy as np
+
+from actinia.cache import ByteCache
+from actinia.resources.logger import log
+from actinia.temporal_index import to_datetime64
+from actinia.utils import DOWNLOAD_DIR
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+TILE_SIZE = 256
+# Half the extent of the Web Mercator tile grid in meters
+ORIGIN_SHIFT = 20037508.342789244
+WEB_MERCATOR = ("EPSG:3857", "EPSG:900913", "EPSG:102100")
+
+
+def tile_bounds(z: int, x: int, y: int) -> dict:
+    """Return "n", "s", "e" and "w" of an XYZ tile in EPSG:3857 meters.
+
+    Raises
+    ------
+    ValueError
+        ValueError for tiles outside of the tile grid.
+
+    """
+    n_tiles = 2**z if z >= 0 else 0
+    if not (0 <= x < n_tiles and 0 <= y < n_tiles):
+        msg = f"Tile {z}/{x}/{y} is outside of the tile grid."
+        raise ValueError(msg)
+    size = 2 * ORIGIN_SHIFT / n_tiles
+    return {
+        "n": ORIGIN_SHIFT - y * size,
+        "s": ORIGIN_SHIFT - (y + 1) * size,
+        "e": -ORIGIN_SHIFT + (x + 1) * size,
+        "w": -ORIGIN_SHIFT + x * size,
+    }
+
+
+def tile_bbox(
+    z: int,
+    x: int,
+    y: int,
+    transform: Callable | None = None,
+    densify: int = 21,
+) -> dict:
+    """Return the bounding box of an XYZ tile in the location CRS.
+
+    The edges of the tile are transformed with densify points each, so
+    the bounding box contains the curved edges of the transformed tile.
+
+    Parameters
+    ----------
+    z: int
+        Zoom level of the tile
+    x: int
+        Column of the tile
+    y: int
+        Row of the tile
+    transform: Callable | None
+        Function transforming arrays of EPSG:3857 x and y coordinates to
+        the location CRS, e.g. pyproj.Transformer.transform; the tile
+        bounds in EPSG:3857 if None
+    densify: int
+        Number of transformed points per edge
+
+    Returns
+    -------
+    bbox: dict
+        "n", "s", "e" and "w" of the tile
+
+    """
+    bounds = tile_bounds(z, x, y)
+    if transform is None:
+        return bounds
+    steps = np.linspace(0.0, 1.0, densify)
+    xs = bounds["w"] + steps * (bounds["e"] - bounds["w"])
+    ys = bounds["s"] + steps * (bounds["n"] - bounds["s"])
+    west = np.full(densify, bounds["w"])
+    east = np.full(densify, bounds["e"])
+    south = np.full(densify, bounds["s"])
+    north = np.full(densify, bounds["n"])
+    tx, ty = transform(
+        np.concatenate([xs, xs, west, east]),
+        np.concatenate([south, north, ys, ys]),
+    )
+    return {
+        "n": float(np.max(ty)),
+        "s": float(np.min(ty)),
+        "e": float(np.max(tx)),
+        "w": float(np.min(tx)),
+    }
+
+
+def _transformer(crs: str) -> Callable:
+    """Return a function transforming EPSG:3857 coordinates to crs.
+
+    Raises
+    ------
+    ImportError
+        ImportError if pyproj is not installed.
+
+    """
+    try:
+        from pyproj import Transformer
+    except ImportError as e:
+        msg = (
+            f"Serving tiles of a location in {crs} requires pyproj, "
+            "install it e.g. with 'pip install pyproj'."
+        )
+        raise ImportError(msg) from e
+    return Transformer.from_crs("EPSG:3857", crs, always_xy=True).transform
+
+
+def _format_time(time: object) -> str | None:
+    """Format a time as YYYY-MM-DD HH:MM:SS for the render requests."""
+    time = to_datetime64(time)
+    if np.isnat(time):
+        return None
+    return str(time).replace("T", " ")
+
+
+class _TileHandler(BaseHTTPRequestHandler):
+    """Answer GET requests of /{layer}/{z}/{x}/{y}.png with tiles."""
+
+    def do_GET(self) -> None:
+        """Send the requested tile or an error."""
+        url = urlsplit(self.path)
+        parts = url.path.strip("/").rsplit("/", 3)
+        query = parse_qs(url.query)
+        try:
+            layer, z, x, name = parts
+            y, extension = name.split(".")
+            if extension != "png":
+                raise ValueError(extension)
+            tile = (unquote(layer), int(z), int(x), int(y))
+        except ValueError:
+            self.send_error(404, "Not a tile", "Use /{layer}/{z}/{x}/{y}.png")
+            return
+        try:
+            image = self.server.proxy.tile(
+                *tile,
+                start_time=query.get("start_time", [None])[0],
+                end_time=query.get("end_time", [None])[0],
+            )
+        except (KeyError, ValueError) as e:
+            self.send_error(404, "Unknown tile", str(e))
+            return
+        except Exception as e:
+            self.send_error(502, "Rendering failed", str(e))
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(image)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(image)
+
+    def log_message(self, message: str, *args) -> None:
+        """Log the requests at debug level instead of printing them."""
+        log.debug("Tile proxy: " + message % args)
+
+
+class TileProxy:
+    """Local HTTP server of XYZ tiles rendered by actinia.
+
+    Each tile is rendered with the render endpoint of a raster map or of
+    a STRDS time step and cached in a ByteCache, by default in memory
+    and on disk. Concurrent requests of the same tile wait for one render
+    request and the neighbouring tiles of requested tiles are rendered in
+    the background, so panning a map in a notebook mostly hits the cache.
+
+    The tiles are served as /{layer}/{z}/{x}/{y}.png, for STRDS with the
+    query parameters start_time and end_time, see url_template.
+    """
+
+    def __init__(
+        self,
+        *,
+        crs: str = "EPSG:3857",
+        cache: ByteCache | None = None,
+        prefetch: int = 1,
+        max_in_flight: int = 4,
+        max_pending: int = 32,
+        tile_size: int = TILE_SIZE,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """Initialize the TileProxy object.
+
+        Parameters
+        ----------
+        crs: str
+            CRS of the location of the rendered maps; other CRS than
+            EPSG:3857 require pyproj and the tiles are rendered for their
+            bounding box in the location CRS
+        cache: ByteCache | None
+            Cache of the tiles, by default in memory and in the "tiles"
+            directory of DOWNLOAD_DIR
+        prefetch: int
+            Number of rings of neighbouring tiles rendered in the
+            background, 0 disables the prefetching
+        max_in_flight: int
+            Maximal number of concurrent render requests
+        max_pending: int
+            Maximal number of tiles waiting to be rendered, above which no
+            tiles are prefetched
+        tile_size: int
+            Width and height of the tiles in pixels
+        host: str
+            Address of the server
+        port: int
+            Port of the server, a free port if 0
+
+        """
+        self.crs = crs
+        self.__transform = None
+        if crs.upper() not in WEB_MERCATOR:
+            self.__transform = _transformer(crs)
+        if cache is None:
+            cache = ByteCache(directory=DOWNLOAD_DIR / "tiles")
+        self.cache = cache
+        self.prefetch = prefetch
+        self.max_pending = max_pending
+        self.tile_size = tile_size
+        self.__layers = {}
+        self.__futures = {}
+        self.__lock = RLock()
+        self.__transform_lock = Lock()
+        self.__metrics = {
+            "requests": 0,
+            "rendered": 0,
+            "prefetched": 0,
+            "errors": 0,
+        }
+        self.__executor = ThreadPoolExecutor(max_workers=max_in_flight)
+        self.__server = ThreadingHTTPServer((host, port), _TileHandler)
+        self.__server.daemon_threads = True
+        self.__server.proxy = self
+        self.__thread = None
+
+    @property
+    def url(self) -> str:
+        """Return the URL of the server."""
+        host, port = self.__server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def add_layer(
+        self,
+        name: str,
+        render: Callable[[dict], bytes],
+        key: tuple | None = None,
+        version: Callable[[], object] | None = None,
+    ) -> str:
+        """Serve the tiles of a raster map or STRDS.
+
+        Parameters
+        ----------
+        name: str
+            Name of the layer in the tile URLs
+        render: Callable[[dict], bytes]
+            Function rendering a PNG image for the render parameters,
+            e.g. Raster.render or SpaceTimeRasterDataset.render
+        key: tuple | None
+            Key of the rendered map in the cache, by default the name
+        version: Callable[[], object] | None
+            Function returning the version of the map, e.g. its
+            modification time, which is part of the cache keys, so the
+            tiles of changed maps are rendered again
+
+        Returns
+        -------
+        url_template: str
+            The URL template of the tiles of the layer
+
+        """
+        with self.__lock:
+            self.__layers[name] = (
+                render,
+                (name,) if key is None else tuple(key),
+                version,
+            )
+        return self.url_template(name)
+
+    def remove_layer(self, name: str) -> None:
+        """Stop serving the tiles of a layer, keeping the cached tiles."""
+        with self.__lock:
+            self.__layers.pop(name, None)
+
+    def url_template(
+        self,
+        name: str,
+        start_time: object = None,
+        end_time: object = None,
+    ) -> str:
+        """Return the URL template of the tiles of a layer.
+
+        The template can be added to interactive maps, e.g. with
+        leafmap.Map.add_tile_layer or ipyleaflet.TileLayer.
+
+        Parameters
+        ----------
+        name: str
+            Name of the layer
+        start_time: str | datetime | numpy.datetime64 | None
+            Start of the rendered time range of a STRDS
+        end_time: str | datetime | numpy.datetime64 | None
+            End of the rendered time range of a STRDS, by default the
+            start time
+
+        Returns
+        -------
+        url_template: str
+            URL with the placeholders {z}, {x} and {y}
+
+        """
+        url = f"{self.url}/{quote(name, safe='/')}/{{z}}/{{x}}/{{y}}.png"
+        start_time = _format_time(start_time)
+        if start_time is None:
+            return url
+        end_time = _format_time(end_time) or start_time
+        query = urlencode({"start_time": start_time, "end_time": end_time})
+        return f"{url}?{query}"
+
+    def __params(
+        self,
+        z: int,
+        x: int,
+        y: int,
+        times: tuple[str | None, str | None],
+    ) -> dict:
+        """Return the render parameters of a tile."""
+        with self.__transform_lock:
+            params = tile_bbox(z, x, y, self.__transform)
+        params["width"] = params["height"] = self.tile_size
+        if times[0] is not None:
+            params["start_time"], params["end_time"] = times
+        return params
+
+    def __load(self, name: str, tile: tuple, key: tuple) -> bytes:
+        """Return a tile from the cache or render it."""
+        if key in self.cache:
+            image = self.cache.get(key)
+            if image is not None:
+                return image
+        with self.__lock:
+            render = self.__layers[name][0]
+        try:
+            image = render(self.__params(*tile))
+        except Exception:
+            with self.__lock:
+                self.__metrics["errors"] += 1
+            raise
+        self.cache.set(key, image)
+        with self.__lock:
+            self.__metrics["rendered"] += 1
+        return image
+
+    def __layer_key(self, name: str) -> tuple:
+        """Return the cache key of the current version of a layer.
+
+        Raises
+        ------
+        KeyError
+            KeyError for unknown layers.
+
+        """
+        with self.__lock:
+            if name not in self.__layers:
+                msg = f"Unknown layer <{name}>."
+                raise KeyError(msg)
+            _, key, version = self.__layers[name]
+        if version is None:
+            return key
+        return (*key, version())
+
+    def __key(self, layer_key: tuple, tile: tuple) -> tuple:
+        """Return the cache key of a tile of a layer."""
+        z, x, y, times = tile
+        return (*layer_key, self.crs, self.tile_size, z, x, y, *times)
+
+    def __submit(self, name: str, tile: tuple, key: tuple) -> Future:
+        """Return the future of a tile, submitting it if needed."""
+        with self.__lock:
+            future = self.__futures.get(key)
+            if future is None:
+                future = self.__executor.submit(self.__load, name, tile, key)
+                self.__futures[key] = future
+                future.add_done_callback(
+                    lambda done: self.__discard(key, done),
+                )
+            return future
+
+    def __discard(self, key: tuple, future: Future) -> None:
+        """Forget the future of a finished or cancelled tile."""
+        with self.__lock:
+            if self.__futures.get(key) is future:
+                del self.__futures[key]
+
+    def __prefetch(self, name: str, layer_key: tuple, tile: tuple) -> None:
+        """Submit the uncached neighbouring tiles of a tile."""
+        z, x, y, times = tile
+        n_tiles = 2**z
+        rings = range(-self.prefetch, self.prefetch + 1)
+        for dy in rings:
+            for dx in rings:
+                row, column = y + dy, (x + dx) % n_tiles
+                if (dx == dy == 0) or not 0 <= row < n_tiles:
+                    continue
+                neighbour = (z, column, row, times)
+                key = self.__key(layer_key, neighbour)
+                with self.__lock:
+                    if key in self.__futures or key in self.cache:
+                        continue
+                    if len(self.__futures) >= self.max_pending:
+                        return
+                    self.__metrics["prefetched"] += 1
+                    self.__submit(name, neighbour, key)
+
+    def tile(
+        self,
+        name: str,
+        z: int,
+        x: int,
+        y: int,
+        start_time: object = None,
+        end_time: object = None,
+    ) -> bytes:
+        """Return a tile from the cache or render it.
+
+        Parameters
+        ----------
+        name: str
+            Name of the layer
+        z: int
+            Zoom level of the tile
+        x: int
+            Column of the tile
+        y: int
+            Row of the tile
+        start_time: str | datetime | numpy.datetime64 | None
+            Start of the rendered time range of a STRDS
+        end_time: str | datetime | numpy.datetime64 | None
+            End of the rendered time range of a STRDS, by default the
+            start time
+
+        Returns
+        -------
+        tile: bytes
+            The rendered PNG image
+
+        Raises
+        ------
+        KeyError
+            KeyError for unknown layers.
+        ValueError
+            ValueError for tiles outside of the tile grid.
+
+        """
+        tile_bounds(z, x, y)
+        times = (None, None)
+        start_time = _format_time(start_time)
+        if start_time is not None:
+            times = (start_time, _format_time(end_time) or start_time)
+        tile = (z, x, y, times)
+        layer_key = self.__layer_key(name)
+        key = self.__key(layer_key, tile)
+        with self.__lock:
+            self.__metrics["requests"] += 1
+        image = self.cache.get(key)
+        if image is None:
+            image = self.__submit(name, tile, key).result()
+        if self.prefetch > 0:
+            self.__prefetch(name, layer_key, tile)
+        return image
+
+    @property
+    def metrics(self) -> dict:
+        """Return the number of tile requests, rendered, prefetched and
+        failed tiles and the metrics of the cache.
+        """
+        with self.__lock:
+            return {**self.__metrics, "cache": self.cache.metrics}
+
+    def start(self) -> TileProxy:
+        """Start serving the tiles in a background thread."""
+        if self.__thread is None:
+            self.__thread = Thread(
+                target=self.__server.serve_forever,
+                daemon=True,
+            )
+            self.__thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and the render threads."""
+        if self.__thread is not None:
+            self.__server.shutdown()
+            self.__thread.join()
+            self.__thread = None
+        self.__server.server_close()
+        # shutdown(cancel_futures=True) needs Python 3.9
+        with self.__lock:
+            pending = list(self.__futures.values())
+        for future in pending:
+            future.cancel()
+        self.__executor.shutdown(wait=False)
+
+    def __enter__(self) -> TileProxy:
+        """Start the server and return the proxy."""
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        """Stop the server."""
+        self.stop()
@@ -0,0 +1,491 @@
+#!/usr/bin/env python
+
+"""The upload module streams files to actinia.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import hashlib
+import json
+import os
+import uuid
+from collections.abc import Mapping
+from pathlib import Path
+from threading import Lock
+from time import monotonic, sleep
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterator
+
+import numpy as np
+import requests
+
+from actinia.geotiff import encode
+from actinia.resources.logger import log
+from actinia.utils import is_retryable, request_and_check
+
+if TYPE_CHECKING:
+    from actinia.region import Region
+
+# Size of the blocks read from the file and the progress interval
+CHUNK_SIZE = 1024 * 1024
+
+
+# File name extensions of in-memory uploads by layer type
+EXTENSIONS = {"raster": ".tif", "vector": ".geojson"}
+
+
+def prepare_upload(
+    kind: str,
+    layer_name: str,
+    source: str | Path | bytes | memoryview | BinaryIO | Mapping | np.ndarray,
+    region: Region | None = None,
+    epsg: int | None = None,
+    nodata: float | None = None,
+) -> tuple[str | Path | bytes | memoryview | BinaryIO, str | None]:
+    """Convert an upload source and choose its file name.
+
+    Parameters
+    ----------
+    kind: str
+        Layer type: "raster" or "vector"
+    layer_name: str
+        Name of the layer to create
+    source: str | Path | bytes | memoryview | BinaryIO | Mapping | ndarray
+        Path, bytes-like object or file object of a GeoTIFF or vector
+        file, a GeoJSON mapping or a 2D numpy array
+    region: Region | None
+        Extent of a numpy array
+    epsg: int | None
+        EPSG code of the CRS of a numpy array
+    nodata: float | None
+        No data value of a numpy array
+
+    Returns
+    -------
+    source: str | Path | bytes | memoryview | BinaryIO
+        Source for MultipartEncoder
+    filename: str | None
+        File name, None for paths
+
+    Raises
+    ------
+    ValueError
+        ValueError if a numpy array is given without region.
+
+    """
+    if isinstance(source, (str, Path)):
+        return source, None
+    if isinstance(source, np.ndarray):
+        if region is None:
+            msg = "A region is required to upload a numpy array."
+            raise ValueError(msg)
+        return encode(source, region, epsg, nodata), f"{layer_name}.tif"
+    if isinstance(source, Mapping):
+        source = json.dumps(source).encode("UTF8")
+        return source, f"{layer_name}.geojson"
+    filename = getattr(source, "name", None)
+    if not isinstance(filename, str):
+        filename = f"{layer_name}{EXTENSIONS[kind]}"
+    return source, filename
+
+
+class MultipartEncoder:
+    """Streaming multipart/form-data body with a single file.
+
+    The file is read in blocks while the request is sent, so the memory
+    use does not depend on the file size. Bytes-like objects are sent
+    from a memoryview without copying them. As the encoder has a length
+    and a ``read`` method, requests sends it with a Content-Length header.
+    """
+
+    def __init__(
+        self,
+        source: str | Path | bytes | memoryview | BinaryIO,
+        field: str = "file",
+        filename: str | None = None,
+        progress: Callable[[int, int], None] | None = None,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None:
+        """Initialize the MultipartEncoder object.
+
+        Parameters
+        ----------
+        source: str | Path | bytes | memoryview | BinaryIO
+            Path of the file, bytes-like object or seekable binary file
+            object to send; file objects are read from their current
+            position and not closed
+        field: str
+            Name of the form field
+        filename: str | None
+            File name sent to the server, defaults to the base name of the
+            path or of the name of the file object
+        progress: Callable[[int, int], None] | None
+            Function called with the sent and total bytes after each chunk
+        chunk_size: int
+            Number of bytes read from the file at once
+
+        Raises
+        ------
+        ValueError
+            ValueError if a file object is not seekable or no file name is
+            given for a bytes-like object.
+
+        """
+        self.progress = progress
+        self.chunk_size = chunk_size
+        self.boundary = uuid.uuid4().hex
+        self.path = None
+        self.__buffer = None
+        self.__file = None
+        self.__owns_file = False
+        if isinstance(source, (str, Path)):
+            self.path = Path(source)
+            self.__size = self.path.stat().st_size
+            self.__offset = 0
+            filename = self.path.name if filename is None else filename
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            self.__buffer = memoryview(source).cast("B")
+            self.__size = self.__buffer.nbytes
+        elif hasattr(source, "read"):
+            if not (hasattr(source, "seekable") and source.seekable()):
+                msg = "File objects to upload must be seekable."
+                raise ValueError(msg)
+            self.__file = source
+            self.__offset = source.tell()
+            self.__size = source.seek(0, 2) - self.__offset
+            source.seek(self.__offset)
+            if filename is None and getattr(source, "name", None):
+                # only the base name, the local path is not sent
+                filename = Path(source.name).name
+        else:
+            msg = f"Cannot upload object of type {type(source).__name__}."
+            raise TypeError(msg)
+        if filename is None:
+            msg = "A file name is required to upload bytes."
+            raise ValueError(msg)
+        filename = str(filename).replace('"', "%22")
+        self.filename = filename
+        self.__head = (
+            f"--{self.boundary}\r\n"
+            f'Content-Disposition: form-data; name="{field}"; '
+            f'filename="{filename}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n"
+        ).encode("UTF8")
+        self.__tail = f"\r\n--{self.boundary}--\r\n".encode("UTF8")
+        self.reset()
+
+    @property
+    def content_type(self) -> str:
+        """Return the Content-Type header of the body."""
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        """Return the number of bytes of the body."""
+        return len(self.__head) + self.__size + len(self.__tail)
+
+    def reset(self) -> None:
+        """Rewind the body to send it again."""
+        self.bytes_read = 0
+        self.__hash = hashlib.sha256()
+        self.__reported = 0
+        self.__start = None
+        self.elapsed = 0.0
+        if self.__file is not None:
+            self.__file.seek(self.__offset)
+
+    def close(self) -> None:
+        """Close the file opened by the encoder."""
+        if self.__owns_file:
+            self.__file.close()
+            self.__file = None
+            self.__owns_file = False
+
+    def __enter__(self) -> MultipartEncoder:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __read_source(self, position: int, size: int) -> bytes | memoryview:
+        """Return size bytes of the source starting at position."""
+        if self.__buffer is not None:
+            stop = position + size
+            return self.__buffer[position:stop]
+        if self.__file is None:
+            self.__file = self.path.open("rb")
+            self.__owns_file = True
+        return self.__file.read(size)
+
+    def read(self, size: int = -1) -> bytes:
+        """Return the next bytes of the body, at most size bytes."""
+        if self.__start is None:
+            self.__start = monotonic()
+        total = len(self)
+        if size is None or size < 0:
+            size = total - self.bytes_read
+        parts = []
+        wanted = size
+        position = self.bytes_read
+        head_end = len(self.__head)
+        file_end = head_end + self.__size
+        if wanted > 0 and position < head_end:
+            stop = position + wanted
+            part = self.__head[position:stop]
+            parts.append(part)
+            wanted -= len(part)
+            position += len(part)
+        if wanted > 0 and head_end <= position < file_end:
+            size = min(wanted, file_end - position)
+            part = self.__read_source(position - head_end, size)
+            if len(part) < size:
+                msg = f"<{self.filename}> changed while uploading."
+                raise OSError(msg)
+            self.__hash.update(part)
+            parts.append(part)
+            wanted -= len(part)
+            position += len(part)
+        if wanted > 0 and position >= file_end:
+            start = position - file_end
+            stop = start + wanted
+            part = self.__tail[start:stop]
+            parts.append(part)
+            position += len(part)
+        self.bytes_read = position
+        self.elapsed = monotonic() - self.__start
+        if self.progress is not None and (
+            position - self.__reported >= self.chunk_size
+            or (position == total and self.__reported < total)
+        ):
+            self.__reported = position
+            self.progress(position, total)
+        return b"".join(parts)
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Iterate over the body in chunks."""
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+    @property
+    def sha256(self) -> str | None:
+        """Return the SHA-256 of the file once it has been read, else None."""
+        if self.bytes_read < len(self) - len(self.__tail):
+            return None
+        return self.__hash.hexdigest()
+
+    @property
+    def metrics(self) -> dict:
+        """Return the sent and total bytes, seconds, bytes per second and
+        the SHA-256 of the file.
+        """
+        return {
+            "bytes": self.bytes_read,
+            "total": len(self),
+            "elapsed": self.elapsed,
+            "throughput": (
+                self.bytes_read / self.elapsed if self.elapsed else 0.0
+            ),
+            "sha256": self.sha256,
+        }
+
+
+def content_hash(
+    source: str | Path | bytes | memoryview | BinaryIO,
+    chunk_size: int = CHUNK_SIZE,
+) -> str:
+    """Return the SHA-256 of an upload source, reading files in blocks.
+
+    File objects are read from their current position, which is restored.
+
+    Parameters
+    ----------
+    source: str | Path | bytes | memoryview | BinaryIO
+        Path of the file, bytes-like object or seekable file object
+    chunk_size: int
+        Number of bytes read from the file at once
+
+    Returns
+    -------
+    sha256: str
+        Hexadecimal SHA-256 digest
+
+    """
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+        return digest.hexdigest()
+    if isinstance(source, (str, Path)):
+        with Path(source).open("rb") as file:
+            for block in iter(lambda: file.read(chunk_size), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    position = source.tell()
+    for block in iter(lambda: source.read(chunk_size), b""):
+        digest.update(block)
+    source.seek(position)
+    return digest.hexdigest()
+
+
+class UploadManifest:
+    """Client-side record of the SHA-256 of uploaded layers.
+
+    The manifest is a JSON file with the hashes of the uploaded files per
+    location, mapset, layer type and layer name. It is written after
+    every change, so it survives failed ingests.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        """Initialize the UploadManifest object.
+
+        Parameters
+        ----------
+        path: str | Path
+            Path of the JSON file, created on the first upload
+
+        """
+        self.path = Path(path).expanduser()
+        self.__lock = Lock()
+        if self.path.exists():
+            self.__entries = json.loads(self.path.read_text(encoding="UTF8"))
+        else:
+            self.__entries = {}
+
+    def get(
+        self, location: str, mapset: str, kind: str, name: str
+    ) -> str | None:
+        """Return the SHA-256 of an uploaded layer or None."""
+        with self.__lock:
+            mapset_entries = self.__entries.get(f"{location}/{mapset}", {})
+            return mapset_entries.get(kind, {}).get(name)
+
+    def set(
+        self, location: str, mapset: str, kind: str, name: str, sha256: str
+    ) -> None:
+        """Record the SHA-256 of an uploaded layer."""
+        with self.__lock:
+            mapset_entries = self.__entries.setdefault(
+                f"{location}/{mapset}", {}
+            )
+            mapset_entries.setdefault(kind, {})[name] = sha256
+            self.__save()
+
+    def remove(
+        self,
+        location: str,
+        mapset: str,
+        kind: str | None = None,
+        name: str | None = None,
+    ) -> None:
+        """Remove the records of a layer, all layers of a type or a mapset."""
+        with self.__lock:
+            key = f"{location}/{mapset}"
+            if kind is None:
+                self.__entries.pop(key, None)
+            elif name is None:
+                self.__entries.get(key, {}).pop(kind, None)
+            else:
+                self.__entries.get(key, {}).get(kind, {}).pop(name, None)
+            self.__save()
+
+    def __save(self) -> None:
+        """Write the manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f"{self.path.suffix}.tmp")
+        tmp_path.write_text(json.dumps(self.__entries), encoding="UTF8")
+        os.replace(tmp_path, self.path)
+
+
+def upload_file(
+    url: str,
+    source: str | Path | bytes | memoryview | BinaryIO,
+    *,
+    filename: str | None = None,
+    auth: tuple,
+    timeout: tuple | float | None = None,
+    retries: int = 2,
+    waiting_time: float = 5,
+    progress: Callable[[int, int], None] | None = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> tuple[dict, dict]:
+    """Stream a file to actinia as multipart/form-data POST request.
+
+    actinia does not support resuming uploads, so the file is sent again
+    from the start if the request failed before the body was sent or the
+    server answered with a 5xx status code without a resource id. Other
+    failures are not retried, since the import job may have been started.
+
+    Parameters
+    ----------
+    url: str
+        URL of the upload endpoint
+    source: str | Path | bytes | memoryview | BinaryIO
+        Path of the file, bytes-like object or seekable file object to
+        upload (see MultipartEncoder)
+    filename: str | None
+        File name sent to the server, required for bytes-like objects
+    auth: tuple
+        Tuple of user and password
+    timeout: tuple | float | None
+        Connection and read timeout of the request
+    retries: int
+        Maximal number of retries of failed requests which cannot have
+        started an import job
+    waiting_time: float
+        Seconds to wait before retrying
+    progress: Callable[[int, int], None] | None
+        Function called with the sent and total bytes
+    chunk_size: int
+        Number of bytes read from the file at once
+
+    Returns
+    -------
+    resp_dict: dict
+        The response of actinia
+    metrics: dict
+        Sent and total "bytes", "elapsed" seconds, "throughput" in bytes
+        per second and number of "attempts"
+
+    """
+    with MultipartEncoder(
+        source, filename=filename, progress=progress, chunk_size=chunk_size
+    ) as encoder:
+        attempt = 0
+        while True:
+            attempt += 1
+            encoder.reset()
+            try:
+                resp_dict = request_and_check(
+                    "POST",
+                    url,
+                    auth=auth,
+                    timeout=timeout,
+                    data=encoder,
+                    headers={"Content-Type": encoder.content_type},
+                )
+                break
+            except requests.exceptions.RequestException as e:
+                unsent = encoder.bytes_read == 0 and isinstance(
+                    e, requests.exceptions.ConnectionError
+                )
+                if attempt > retries or not (unsent or is_retryable(e)):
+                    raise
+                log.warning(
+                    f"Uploading <{encoder.filename}> failed ({e}), retrying "
+                    f"in {waiting_time} seconds"
+                )
+                sleep(waiting_time)
+        return resp_dict, {**encoder.metrics, "attempts": attempt}
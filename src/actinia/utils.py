@@ -17,8 +17,25 @@ __copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
 __maintainer__ = "Anika Weinmann"
 
 import json
+import os
 import requests
+import tempfile
 from datetime import datetime
+from pathlib import Path
+from urllib3.exceptions import NewConnectionError
+
+# Process chains with at most SYNC_MAX_CELLS cells per module and at most
+# SYNC_MAX_MODULES modules are processed synchronously in "auto" mode
+SYNC_MAX_CELLS = 5000000
+SYNC_MAX_MODULES = 5
+# Process chains with an estimated run time of at most SYNC_MAX_RUNTIME
+# seconds are processed synchronously if a cost estimator is given
+SYNC_MAX_RUNTIME = 10
+# Directory of downloaded job results
+DOWNLOAD_DIR = Path(tempfile.gettempdir()) / "actinia"
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# First bytes of PNG images, e.g. of the render endpoints
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
 
 
 def request_and_check(method, url, status_code=(200,), retries=0, **kwargs):
@@ -71,6 +88,168 @@ def request_and_check(method, url, status_code=(200,), retries=0, **kwargs):
         ) from None
 
 
+def is_retryable(error):
+    """Check if a failed POST request can be sent again without duplicates.
+
+    This is the case if the connection failed before the request was sent
+    or if the server answered with a 5xx status code without the resource
+    id of a created job.
+
+    Parameters:
+        error (Exception): Error raised by request_and_check
+
+    Returns:
+        (bool): returns True if the request can be sent again
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    if isinstance(error, requests.exceptions.ConnectionError):
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(reason, NewConnectionError)
+    # request_and_check passes the HTTPError as second argument
+    if not isinstance(error, requests.exceptions.RequestException):
+        return False
+    http_error = error.args[1] if len(error.args) > 1 else None
+    response = getattr(http_error, "response", None)
+    if response is None or response.status_code < 500:
+        return False
+    try:
+        resp_dict = json.loads(response.text)
+    except json.JSONDecodeError:
+        return True
+    return not (isinstance(resp_dict, dict) and "resource_id" in resp_dict)
+
+
+def download_file(url, path, retries=2, **kwargs):
+    """Stream a file, e.g. an exported job result, to a local file.
+
+    The file is written to a temporary file next to path and renamed when
+    it is complete, so path never holds a partial download.
+
+    Parameters:
+        url (string): URL of the file
+        path (string|Path): Local path to write the file to
+        retries (int): Maximal number of retries after connection errors
+        **kwargs:
+            auth (tuple): Tuple of user and password
+            timeout (tuple): Tuple of connection timeout and read timeout
+
+    Returns:
+        (Path): returns the path of the downloaded file
+
+    Throws an error if the request does not have the status code 200.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.part")
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            with tmp_path.open("wb") as file:
+                for chunk in stream_file(url, **kwargs):
+                    file.write(chunk)
+            break
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.ChunkedEncodingError,
+            requests.exceptions.Timeout,
+        ):
+            if attempt > retries:
+                raise
+    os.replace(tmp_path, path)
+    return path
+
+
+def stream_file(url, chunk_size=DOWNLOAD_CHUNK_SIZE, **kwargs):
+    """Stream a file, e.g. an exported job result, in chunks.
+
+    Parameters:
+        url (string): URL of the file
+        chunk_size (int): Maximal number of bytes per chunk
+        **kwargs:
+            auth (tuple): Tuple of user and password
+            timeout (tuple): Tuple of connection timeout and read timeout
+
+    Returns:
+        (generator): yields the file content as bytes chunks
+
+    Throws an error if the request does not have the status code 200.
+    """
+    with requests.get(url, stream=True, **kwargs) as resp:
+        if resp.status_code == 401:
+            raise Exception(
+                "Wrong user or password. Please check your inputs."
+            )
+        if resp.status_code != 200:
+            raise requests.exceptions.RequestException(
+                f"Error {resp.status_code}: {resp.text}"
+            )
+        yield from resp.iter_content(chunk_size)
+
+
+def load_process_chain(pc):
+    """Load a process chain given as dict, JSON string or JSON file.
+
+    Parameters:
+        pc (dict|string): Process chain as dict, JSON string or path to a
+                          JSON file
+
+    Returns:
+        (dict): returns the process chain as dictionary
+
+    Throws a TypeError if the process chain has no valid type.
+    """
+    if isinstance(pc, dict):
+        return pc
+    if isinstance(pc, str):
+        if os.path.isfile(pc):
+            with open(pc, "r") as pc_file:
+                return json.load(pc_file)
+        return json.loads(pc)
+    raise TypeError("Given process chain has no valid type.")
+
+
+def use_sync_processing(
+    pc,
+    region,
+    max_cells=SYNC_MAX_CELLS,
+    max_modules=SYNC_MAX_MODULES,
+    estimator=None,
+    max_runtime=SYNC_MAX_RUNTIME,
+):
+    """Decide if a process chain is cheap enough for synchronous processing.
+
+    The cost of a process chain is estimated with the run time predicted
+    by a cost estimator if it has enough recorded run times of all its
+    modules, otherwise from the number of modules and the number of cells
+    of the computational region.
+
+    Parameters:
+        pc (dict|string): Process chain as dict, JSON string or JSON file
+        region (Region): Computational region the chain is processed in
+        max_cells (int): Maximal number of cells for synchronous processing
+        max_modules (int): Maximal number of modules for synchronous
+                           processing
+        estimator (CostEstimator): Optional cost estimator
+        max_runtime (float): Maximal estimated run time in seconds for
+                             synchronous processing if the estimator
+                             covers the process chain
+
+    Returns:
+        (bool): returns True if the process chain should be processed
+                synchronously
+    """
+    if region is None or region.cells is None:
+        return False
+    if estimator is not None and estimator.covers(pc):
+        return estimator.estimate(pc, region)["runtime"] <= max_runtime
+    modules = load_process_chain(pc).get("list", [])
+    if len(modules) > max_modules:
+        return False
+    return int(region.cells) <= max_cells
+
+
 def set_job_names(name, default_name="unknown_job"):
     """Function to set the date/time to the job name"""
     now = datetime.now()
@@ -16,11 +16,89 @@ __author__ = "Anika Weinmann"
 __copyright__ = "Copyright 2022, mundialis GmbH & Co. KG"
 __maintainer__ = "Anika Weinmann"
 
+import io
 import json
+import logging
+import zipfile
 
+import numpy as np
+
+from actinia.geojson import iter_batches, iter_features
 from actinia.resources.logger import log
 from actinia.region import Region
-from actinia.utils import request_and_check
+from actinia.utils import (
+    create_actinia_pc_item,
+    request_and_check,
+    stream_file,
+)
+
+# numpy dtypes of the attribute column types, other types are read as
+# fixed width unicode strings
+ATTRIBUTE_DTYPES = {
+    "INTEGER": "i8",
+    "SMALLINT": "i8",
+    "BIGINT": "i8",
+    "INT": "i8",
+    "DOUBLE PRECISION": "f8",
+    "DOUBLE": "f8",
+    "REAL": "f8",
+    "FLOAT": "f8",
+}
+# null value of v.db.select, which cannot be confused with a number or "nan"
+NULL_VALUE = "\\N"
+
+
+def decode_attributes(text, dtype):
+    """Decode tab separated attribute rows into a structured masked array.
+
+    Parameters:
+        text (string): Rows of v.db.select without header and with
+                       NULL_VALUE as null value
+        dtype (numpy.dtype): Structured dtype of the columns, text columns
+                             have the kind "U"
+
+    Returns:
+        (numpy.ma.MaskedArray): returns the structured array, masked where
+                                the values are null; the column types do
+                                not depend on the nulls, null values are 0
+                                in integer, NaN in float and "" in text
+                                columns; text columns are as wide as their
+                                longest value
+    """
+    if not text.strip():
+        return np.ma.MaskedArray(
+            np.empty(0, dtype=dtype),
+            mask=np.zeros(0, dtype=np.ma.make_mask_descr(dtype)),
+        )
+    cells = np.loadtxt(
+        io.StringIO(text),
+        dtype=str,
+        delimiter="\t",
+        comments=None,
+        ndmin=2,
+    )
+    columns = {}
+    nulls = {}
+    for index, name in enumerate(dtype.names):
+        column = cells[:, index]
+        nulls[name] = column == NULL_VALUE
+        kind = dtype[name].kind
+        if kind in "iuf":
+            values = np.where(nulls[name], "0", column).astype(dtype[name])
+            if kind == "f":
+                values[nulls[name]] = np.nan
+        else:
+            values = np.where(nulls[name], "", column)
+        columns[name] = values
+    array = np.empty(
+        len(cells),
+        dtype=[(name, values.dtype) for name, values in columns.items()],
+    )
+    mask = np.empty(len(cells), dtype=np.ma.make_mask_descr(array.dtype))
+    for name, values in columns.items():
+        array[name] = values
+        mask[name] = nulls[name]
+    return np.ma.MaskedArray(array, mask=mask)
 
 
 class Vector:
@@ -33,44 +111,219 @@ class Vector:
         self.region = None
         self.info = None
 
-    def get_info(self):
-        """Return the information of the vector map"""
-        if self.info is None:
-            url = (
-                f"{self.__actinia.url}/locations/{self.__location_name}/"
-                f"mapsets/{self.__mapset_name}/vector_layers/{self.name}"
+    def __request_info(self):
+        """Request the information of the vector map"""
+        url = (
+            f"{self.__actinia.url}/locations/{self.__location_name}/"
+            f"mapsets/{self.__mapset_name}/vector_layers/{self.name}"
+        )
+        v_info = request_and_check(
+            "GET",
+            url,
+            **{"auth": self.__auth, "timeout": self.__actinia.timeout},
+        )["process_results"]
+        self.info = v_info
+        self.region = Region.from_dict(v_info)
+        return v_info
+
+    def get_info(self, force=False):
+        """Return the information of the vector map, cached with the TTL
+        of "vector_info"
+        """
+        info = self.__actinia.cache.get(
+            "vector_info",
+            (self.__location_name, self.__mapset_name, self.name),
+            self.__request_info,
+            force=force,
+        )
+        if info is not self.info:
+            self.info = info
+            self.region = Region.from_dict(info)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug(json.dumps(self.info, indent=4))
+        return self.info
+
+    def __run_stdout(self, pc_item):
+        """Run a module synchronously and return its stdout"""
+        location = self.__actinia.get_locations()[self.__location_name]
+        job = location.create_processing_export_job(
+            {"list": [pc_item], "version": "1"},
+            f"{pc_item['module']}_{self.name}",
+            mode="sync",
+        )
+        if job.status != "finished":
+            raise RuntimeError(
+                f"{pc_item['module']} of vector <{self.name}> failed: "
+                f"{job.message}"
             )
-            v_info = request_and_check(
-                "GET",
-                url,
-                **{"auth": self.__auth, "timeout": self.__actinia.timeout},
-            )["process_results"]
-            self.info = v_info
-
-            self.region = Region(
-                zone=None,
-                projection=None,
-                n=v_info["north"],
-                s=v_info["south"],
-                e=v_info["east"],
-                w=v_info["west"],
-                t=v_info["top"],
-                b=v_info["bottom"],
-                nsres=None,
-                ewres=None,
-                nsres3=None,
-                ewres3=None,
-                tbres=None,
-                rows=None,
-                cols=None,
-                rows3=None,
-                cols3=None,
-                depths=None,
-                cells=None,
-                cells3=None,
+        for entry in reversed(job.process_log):
+            if entry.get("executable") == pc_item["module"]:
+                return entry.get("stdout", "")
+        return ""
+
+    def read_attributes(self, columns=None, where=None, batch_size=100000):
+        """Read the attribute table in batches into structured numpy arrays.
+
+        The table is paged by ranges of batch_size categories with one
+        v.db.select per page. The tab separated output is decoded into
+        columns typed by the attribute table: integer, float and fixed
+        width unicode string columns. Null values are masked, see
+        decode_attributes.
+
+        Parameters:
+            columns (list): Attribute columns to read, by default all
+            where (string): WHERE condition to select rows, without the
+                            WHERE keyword
+            batch_size (int): Range of categories per batch
+
+        Returns:
+            (generator): yields structured masked arrays of the rows with
+                         categories in the range of the batch, empty
+                         batches are skipped
+        """
+        attributes = {
+            attribute["column"]: attribute["type"].upper()
+            for attribute in self.get_info()["Attributes"]
+        }
+        if columns is None:
+            columns = list(attributes)
+        unknown = [column for column in columns if column not in attributes]
+        if unknown:
+            raise ValueError(
+                f"Vector <{self.name}> has no columns {', '.join(unknown)}."
             )
-        log.info(json.dumps(self.info, indent=4))
-        return self.info
+        dtype = np.dtype(
+            [
+                (column, ATTRIBUTE_DTYPES.get(attributes[column], "U"))
+                for column in columns
+            ]
+        )
+        map_name = f"{self.name}@{self.__mapset_name}"
+        report = self.__run_stdout(
+            create_actinia_pc_item(
+                "category",
+                "v.category",
+                {"input": map_name, "option": "report"},
+                flags="g",
+            )
+        )
+        # lines of layer, type, count, min and max category; the attribute
+        # table is linked to layer 1
+        rows = [line.split() for line in report.splitlines()]
+        cats = [
+            int(value)
+            for row in rows
+            if len(row) == 5 and row[0] == "1"
+            for value in row[3:]
+        ]
+        if not cats:
+            return
+        for low in range(min(cats) - 1, max(cats), batch_size):
+            condition = f"cat > {low} AND cat <= {low + batch_size}"
+            if where:
+                condition += f" AND ({where})"
+            text = self.__run_stdout(
+                create_actinia_pc_item(
+                    "select",
+                    "v.db.select",
+                    {
+                        "map": map_name,
+                        "columns": ",".join(columns),
+                        "where": condition,
+                        "separator": "tab",
+                        "null_value": NULL_VALUE,
+                    },
+                    flags="c",
+                )
+            )
+            batch = decode_attributes(text, dtype)
+            if len(batch):
+                yield batch
+
+    def iter_features(
+        self, where=None, columns=None, batch_size=None, waiting_time=5
+    ):
+        """Export the vector map as GeoJSON and yield its features.
+
+        The GeoJSON is streamed and parsed incrementally, so the memory use
+        does not depend on the number of features. The export job is
+        started when the first feature is requested.
+
+        Parameters:
+            where (string): WHERE condition to select features, without the
+                            WHERE keyword
+            columns (list): Attribute columns to return, by default all
+            batch_size (int): If set, batches of up to batch_size features
+                              are yielded as dict of columnar numpy arrays,
+                              see actinia.geojson.iter_batches
+            waiting_time (int): Time to wait in seconds between polls of
+                                the export job
+
+        Returns:
+            (generator): yields the GeoJSON features as dict or batches
+        """
+        features = self.__export_features(where, waiting_time)
+        if batch_size:
+            yield from iter_batches(features, batch_size, columns)
+            return
+        for feature in features:
+            if columns is not None:
+                properties = feature.get("properties") or {}
+                feature["properties"] = {
+                    column: properties.get(column) for column in columns
+                }
+            yield feature
+
+    def __export_features(self, where, waiting_time):
+        """Run an export job and yield the features of the GeoJSON"""
+        map_name = f"{self.name}@{self.__mapset_name}"
+        pc_list = []
+        if where:
+            pc_list.append(
+                create_actinia_pc_item(
+                    "extract",
+                    "v.extract",
+                    {"input": map_name, "where": where},
+                    {"output": self.name},
+                )
+            )
+            map_name = self.name
+        pc_list.append(
+            create_actinia_pc_item(
+                "export",
+                "exporter",
+                outputs=[
+                    {
+                        "export": {"format": "GeoJSON", "type": "vector"},
+                        "param": "map",
+                        "value": map_name,
+                    }
+                ],
+            )
+        )
+        location = self.__actinia.get_locations()[self.__location_name]
+        job = location.create_processing_export_job(
+            {"list": pc_list, "version": "1"}, f"export_{self.name}"
+        )
+        if job.poll_until_finished(waiting_time=waiting_time, quiet=True):
+            raise RuntimeError(
+                f"Export of vector <{map_name}> failed: {job.message}"
+            )
+        url = job.urls["resources"][0]
+        if not url.endswith(".zip"):
+            kwargs = {"auth": self.__auth, "timeout": self.__actinia.timeout}
+            yield from iter_features(stream_file(url, **kwargs))
+            return
+        # zipped exports are downloaded, as the GeoJSON is at the end of
+        # the zip file
+        with zipfile.ZipFile(job.download()[0]) as zip_file:
+            member = next(
+                name
+                for name in zip_file.namelist()
+                if name.endswith((".geojson", ".json"))
+            )
+            with zip_file.open(member) as file:
+                yield from iter_features(file)
 
 
 # TODO:
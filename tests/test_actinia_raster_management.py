@@ -18,8 +18,12 @@ __maintainer__ = "Anika Weinmann"
 
 import os
 
+import numpy as np
+
 from actinia import Actinia
+from actinia.layer_table import LayerTable
 from actinia.raster import Raster
+from actinia.region import Region
 
 from .actinia_config import (
     ACTINIA_BASEURL,
@@ -98,9 +102,18 @@ class TestActiniaRaster(object):
         #  upload
         dir_path = os.path.dirname(os.path.realpath(__file__))
         tif_path = os.path.join(dir_path, UPLOAD_RASTER_TIF)
-        self.testactinia.locations[LOCATION_NAME].mapsets[
-            NEW_MAPSET_NAME
-        ].upload_raster(UPLOAD_RASTER_NAME, tif_path)
+        progress = []
+        metrics = (
+            self.testactinia.locations[LOCATION_NAME]
+            .mapsets[NEW_MAPSET_NAME]
+            .upload_raster(
+                UPLOAD_RASTER_NAME,
+                tif_path,
+                progress=lambda sent, total: progress.append((sent, total)),
+            )
+        )
+        assert metrics["bytes"] == metrics["total"] > os.path.getsize(tif_path)
+        assert progress[-1] == (metrics["total"], metrics["total"])
         raster_layers = (
             self.testactinia.locations[LOCATION_NAME]
             .mapsets[NEW_MAPSET_NAME]
@@ -118,3 +131,63 @@ class TestActiniaRaster(object):
             .raster_layers
         )
         assert UPLOAD_RASTER_NAME not in raster_layers
+
+    def test_upload_rasters(self):
+        """Test concurrent upload_rasters with a failing file."""
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        tif_path = os.path.join(dir_path, UPLOAD_RASTER_TIF)
+        mapset = self.testactinia.locations[LOCATION_NAME].mapsets[
+            NEW_MAPSET_NAME
+        ]
+        files = {f"{UPLOAD_RASTER_NAME}_{i}": tif_path for i in range(3)}
+        files["missing"] = "missing.tif"
+        metrics, errors = mapset.upload_rasters(files, 2, waiting_time=1)
+        assert list(errors) == ["missing"]
+        for name in metrics:
+            assert name in mapset.raster_layers
+            mapset.delete_raster(name)
+        assert len(metrics) == 3
+
+    def test_upload_numpy_array(self):
+        """Test upload_raster with a numpy array."""
+        mapset = self.testactinia.locations[LOCATION_NAME].mapsets[
+            NEW_MAPSET_NAME
+        ]
+        region = Region(n=228500, s=215000, e=645000, w=630000)
+        array = np.arange(135 * 150, dtype=np.float32).reshape(135, 150)
+        mapset.upload_raster(
+            UPLOAD_RASTER_NAME, array, region=region, epsg=3358
+        )
+        info = mapset.raster_layers[UPLOAD_RASTER_NAME].get_info()
+        assert float(info["nsres"]) == 100
+        assert float(info["max"]) == array.max()
+        mapset.delete_raster(UPLOAD_RASTER_NAME)
+
+    def test_to_numpy(self):
+        """Test exporting a raster into a numpy array."""
+        raster = (
+            self.testactinia.locations[LOCATION_NAME]
+            .mapsets[MAPSET_NAME]
+            .raster_layers[RASTER_NAME]
+        )
+        region = Region(
+            n=228500, s=215000, e=645000, w=630000, nsres=100, ewres=100
+        )
+        array, array_region, _ = raster.to_numpy(region)
+        assert isinstance(array, np.ndarray)
+        assert array.shape == (135, 150)
+        assert array_region.n == 228500
+        assert array_region.ewres == 100
+
+    def test_fetch_all_info(self):
+        """Test fetch_all_info method."""
+        mapset = self.testactinia.locations[LOCATION_NAME].mapsets[MAPSET_NAME]
+        table = mapset.fetch_all_info("raster", max_in_flight=4)
+        assert isinstance(table, LayerTable), "No LayerTable returned"
+        assert len(table) == len(mapset.raster_layers)
+        assert not table.errors, "Requesting raster info failed"
+        idx = table.index(RASTER_NAME)
+        assert table.cells[idx] == 2025000, "cells are not correct"
+        raster = mapset.raster_layers[RASTER_NAME]
+        assert raster.info is not None, "raster info is not set"
+        assert table.regions.n[idx] == raster.region.n
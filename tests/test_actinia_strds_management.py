@@ -17,7 +17,10 @@ __maintainer__ = "Anika Weinmann"
 
 from pathlib import Path
 
+import numpy as np
+
 from actinia import Actinia
+from actinia.region import Region
 from actinia.strds import SpaceTimeRasterDataset
 
 from .actinia_config import (
@@ -31,6 +34,7 @@ from .actinia_config import (
 NEW_MAPSET_NAME = "new_test_mapset"
 UPLOAD_RASTER_TIF = "../test_data/elevation.tif"
 UPLOAD_RASTER_NAME = "test_raster"
+FEATURE_RASTER_NAME = "test_strds_raster"
 STRDS_INFO_KEYS = {
     "aggregation_type",
     "bottom",
@@ -78,6 +82,10 @@ class TestActiniaSpaceTimeRasterDatasets:
         cls.testactinia.get_locations()
         cls.testactinia.locations[LOCATION_NAME].get_mapsets()
         cls.testactinia.locations[LOCATION_NAME].create_mapset(NEW_MAPSET_NAME)
+        tif_path = Path(__file__).resolve().parent / UPLOAD_RASTER_TIF
+        cls.testactinia.locations[LOCATION_NAME].mapsets[
+            NEW_MAPSET_NAME
+        ].upload_raster(FEATURE_RASTER_NAME, str(tif_path.resolve()))
 
     @classmethod
     def teardown_class(cls) -> None:
@@ -151,3 +159,116 @@ class TestActiniaSpaceTimeRasterDatasets:
             .mapsets[NEW_MAPSET_NAME]
             .delete_strds(STRDS_NAME)
         )
+
+    def create_strds(self, name: str) -> SpaceTimeRasterDataset:
+        """Create a STRDS with the feature raster registered."""
+        mapset = self.testactinia.locations[LOCATION_NAME].mapsets[
+            NEW_MAPSET_NAME
+        ]
+        mapset.create_strds(name, "test title", "test description", "absolute")
+        strds = mapset.strds[name]
+        strds.register_raster_layers(
+            [
+                {
+                    "name": FEATURE_RASTER_NAME,
+                    "start_time": "2023-01-01 00:00:00",
+                    "end_time": "2023-01-02 00:00:00",
+                },
+            ],
+        )
+        return strds
+
+    def delete_strds(self, name: str) -> None:
+        """Delete a STRDS created by create_strds."""
+        self.testactinia.locations[LOCATION_NAME].mapsets[
+            NEW_MAPSET_NAME
+        ].delete_strds(name)
+
+    def test_register_unregister(self) -> None:
+        """Test skipping registered rasters and unregistering rasters."""
+        name = f"{STRDS_NAME}_register"
+        strds = self.create_strds(name)
+        raster_list = [
+            {
+                "name": FEATURE_RASTER_NAME,
+                "start_time": "2023-01-01 00:00:00",
+                "end_time": "2023-01-02 00:00:00",
+            },
+        ]
+        resp = strds.register_raster_layers(raster_list)
+        assert resp == {"registered": 0, "skipped": 1, "chunks": 0}
+        assert len(strds.get_temporal_index()) == 1
+        resp = strds.unregister_raster_layers([FEATURE_RASTER_NAME])
+        assert resp["unregistered"] == 1
+        assert len(strds.get_temporal_index()) == 0
+        resp = strds.register_raster_layers(raster_list)
+        assert resp == {"registered": 1, "skipped": 0, "chunks": 1}
+        self.delete_strds(name)
+
+    def test_sample_points(self) -> None:
+        """Test sampling the STRDS at points in two chunks."""
+        name = f"{STRDS_NAME}_sample"
+        strds = self.create_strds(name)
+        points = np.array([[635000, 220000], [640000, 225000]])
+        resp = strds.sample_points(points, chunk_size=1)
+        assert resp.ids.tolist() == ["0", "1"]
+        assert resp.values.shape == (2, 1)
+        assert resp.metrics["chunks"] == 2
+        self.delete_strds(name)
+
+    def test_zonal_statistics(self) -> None:
+        """Test zonal statistics of two polygons and their cache."""
+        name = f"{STRDS_NAME}_zonal"
+        strds = self.create_strds(name)
+        polygons = {
+            "type": "FeatureCollection",
+            "crs": {
+                "type": "name",
+                "properties": {"name": "urn:ogc:def:crs:EPSG::3358"},
+            },
+            "features": [
+                {
+                    "type": "Feature",
+                    "id": feature_id,
+                    "properties": {},
+                    "geometry": {
+                        "type": "Polygon",
+                        "coordinates": [
+                            [
+                                [west, 216000],
+                                [west + 4000, 216000],
+                                [west + 4000, 220000],
+                                [west, 220000],
+                                [west, 216000],
+                            ],
+                        ],
+                    },
+                }
+                for feature_id, west in (("a", 631000), ("b", 636000))
+            ],
+        }
+        resp = strds.compute_zonal_statistics(polygons, chunk_size=1)
+        assert resp.values.shape == (2, 1, len(resp.statistics))
+        assert resp.ids.tolist() == ["a", "b"]
+        assert (resp.statistic("number") > 0).all()
+        resp = strds.compute_zonal_statistics(polygons, chunk_size=1)
+        assert resp.metrics["cached"] == 2
+        self.delete_strds(name)
+
+    def test_to_cube(self, tmp_path: Path) -> None:
+        """Test exporting the STRDS into a cube."""
+        name = f"{STRDS_NAME}_cube"
+        strds = self.create_strds(name)
+        region = Region(
+            n=228500,
+            s=215000,
+            e=645000,
+            w=630000,
+            nsres=100,
+            ewres=100,
+        )
+        cube = strds.to_cube(region, path=tmp_path)
+        assert cube.data.shape == (1, 135, 150)
+        assert cube.start_times[0] == np.datetime64("2023-01-01T00:00:00")
+        assert (tmp_path / "done.npy").exists()
+        self.delete_strds(name)
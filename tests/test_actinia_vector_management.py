@@ -18,6 +18,8 @@ __maintainer__ = "Anika Weinmann"
 
 import os
 
+import numpy as np
+
 from actinia import Actinia
 from actinia.vector import Vector
 
@@ -94,6 +96,55 @@ class TestActiniaVector(object):
         assert vector.info == resp, "vector info is not set correctly"
         assert vector.region is not None, "vector region is not set"
 
+    def test_iter_features(self):
+        """Test iter_features method."""
+        vector = (
+            self.testactinia.locations[LOCATION_NAME]
+            .mapsets[MAPSET_NAME]
+            .vector_layers[VECTOR_NAME]
+        )
+        features = list(
+            vector.iter_features(where="cat < 10", columns=["cat", "NAME"])
+        )
+        assert features, "no features exported"
+        assert set(features[0]["properties"]) == {"cat", "NAME"}
+        batches = list(vector.iter_features(batch_size=100))
+        assert all(len(batch["cat"]) <= 100 for batch in batches)
+
+    def test_upload_vector_chunks(self):
+        """Test upload_vector in chunks."""
+        dir_path = os.path.dirname(os.path.realpath(__file__))
+        geojson_path = os.path.join(dir_path, UPLOAD_VECTOR_GEOJSON)
+        mapset = self.testactinia.locations[LOCATION_NAME].mapsets[
+            NEW_MAPSET_NAME
+        ]
+        metrics = mapset.upload_vector(
+            UPLOAD_VECTOR_NAME, geojson_path, chunks=3, waiting_time=1
+        )
+        assert metrics["chunks"] == 3
+        assert metrics["features"] == 71
+        info = mapset.vector_layers[UPLOAD_VECTOR_NAME].get_info()
+        assert info["points"] == "71"
+        assert set(mapset.get_vector_layers(force=True)) == {
+            UPLOAD_VECTOR_NAME
+        }
+        mapset.delete_vector(UPLOAD_VECTOR_NAME)
+
+    def test_read_attributes(self):
+        """Test read_attributes method."""
+        vector = (
+            self.testactinia.locations[LOCATION_NAME]
+            .mapsets[MAPSET_NAME]
+            .vector_layers[VECTOR_NAME]
+        )
+        batches = list(vector.read_attributes(["cat", "NAME"], batch_size=500))
+        assert batches, "no attributes read"
+        assert batches[0].dtype.names == ("cat", "NAME")
+        assert batches[0]["cat"].dtype == np.int64
+        assert all(len(batch) <= 500 for batch in batches)
+        (batch,) = vector.read_attributes(["cat"], where="cat < 10")
+        assert batch["cat"].max() < 10
+
     def test_upload_and_delete_vector(self):
         """Test upload_vector and delete_vector methods."""
         #  upload
@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+"""Test cases for the bulk submission of process chains.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import json
+from threading import Lock, current_thread
+
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from actinia.batch import JobBatch, submit_process_chain
+
+
+def server_error(status_code: int, resp_dict: dict) -> Exception:
+    """Return the error request_and_check raises for a response."""
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(resp_dict).encode()
+    http_error = requests.exceptions.HTTPError(response=response)
+    return requests.exceptions.RequestException(
+        f"Error {status_code}: {response.text}",
+        http_error,
+    )
+
+
+def refused() -> Exception:
+    """Return the error of a refused connection."""
+    reason = NewConnectionError(None, "Connection refused")
+    return requests.exceptions.ConnectionError(
+        MaxRetryError(None, "/processing_async", reason),
+    )
+
+
+class FakeJob:
+    """Job which is running for a number of polls."""
+
+    def __init__(self, name: str, polls: int) -> None:
+        """Initialize the FakeJob object."""
+        self.name = name
+        self.status = "accepted" if polls else "finished"
+        self.message = ""
+        self.polls = polls
+        self.poll_threads = set()
+
+    def poll(self, quiet: bool = False, retries: int = 0) -> None:
+        """Count down the polls until the job is finished."""
+        self.poll_threads.add(current_thread().name)
+        self.polls -= 1
+        self.status = "running" if self.polls > 0 else "finished"
+
+
+class FakeMapset:
+    """Mapset failing the first submissions with the given errors."""
+
+    def __init__(self, errors: list[Exception], polls: int = 2) -> None:
+        """Initialize the FakeMapset object."""
+        self.errors = errors
+        self.polls = polls
+        self.lock = Lock()
+        self.submissions = 0
+        self.jobs = []
+
+    def create_processing_job(self, pc: dict, name: str) -> FakeJob:
+        """Return a new job or raise the next error."""
+        with self.lock:
+            self.submissions += 1
+            if self.errors:
+                raise self.errors.pop(0)
+            job = FakeJob(name, self.polls)
+            self.jobs.append(job)
+            return job
+
+
+class TestSubmitProcessChain:
+    """Test which failed submissions are resubmitted."""
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            requests.exceptions.ConnectTimeout(),
+            refused(),
+            server_error(503, {"message": "Service unavailable"}),
+        ],
+    )
+    def test_retry(self, error: Exception) -> None:
+        """Test resubmitting requests which cannot have created a job."""
+        mapset = FakeMapset([error])
+        retried = []
+        job = submit_process_chain(
+            mapset,
+            {},
+            "job",
+            retries=1,
+            waiting_time=0,
+            on_retry=retried.append,
+        )
+        assert isinstance(job, FakeJob)
+        assert mapset.submissions == 2
+        assert retried == [error]
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            requests.exceptions.ReadTimeout(),
+            requests.exceptions.ConnectionError("Connection aborted."),
+            server_error(500, {"resource_id": "resource_id-1"}),
+            server_error(400, {"message": "Invalid process chain"}),
+        ],
+    )
+    def test_no_retry(self, error: Exception) -> None:
+        """Test not resubmitting requests which may have created a job."""
+        mapset = FakeMapset([error])
+        with pytest.raises(type(error)):
+            submit_process_chain(mapset, {}, "job", retries=2, waiting_time=0)
+        assert mapset.submissions == 1
+
+
+class TestJobBatch:
+    """Test the bounded submission and the shared polling of jobs."""
+
+    def test_batch(self) -> None:
+        """Test the results, polling threads and metrics of a batch."""
+        mapset = FakeMapset([requests.exceptions.ConnectTimeout()])
+        batch = JobBatch(
+            [{}] * 5,
+            mapset,
+            max_in_flight=2,
+            retries=1,
+            waiting_time=0.01,
+        )
+        items = batch.wait()
+        assert [item.name for item in items] == [
+            f"batch_job_{i}" for i in range(5)
+        ]
+        assert all(item.status == "finished" for item in items)
+        assert mapset.submissions == 6
+        threads = set().union(*(job.poll_threads for job in mapset.jobs))
+        assert len(threads) == 1
+        metrics = batch.metrics
+        assert metrics["finished"] == 5
+        assert metrics["resubmissions"] == 1
+
+    def test_submission_failed(self) -> None:
+        """Test that a failed submission does not stop the batch."""
+        error = server_error(400, {"message": "Invalid process chain"})
+        mapset = FakeMapset([error], polls=0)
+        items = list(JobBatch([{}] * 2, mapset, waiting_time=0.01))
+        assert items[0].status == "submission_failed"
+        assert items[0].error is error
+        assert items[1].status == "finished"
+        assert JobBatch([], mapset).wait() == []
+
+    def test_unexpected_error(self) -> None:
+        """Test that unexpected errors are raised instead of hanging."""
+
+        class BrokenMapset:
+            def create_processing_job(self, pc: dict, name: str) -> object:
+                # a job without status
+                return object()
+
+        batch = JobBatch([{}] * 3, BrokenMapset(), waiting_time=0.01)
+        with pytest.raises(AttributeError):
+            batch.wait()
+        with pytest.raises(AttributeError):
+            list(batch)
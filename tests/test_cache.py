@@ -0,0 +1,166 @@
+#!/usr/bin/env python
+"""Test cases for the object cache.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import gc
+from threading import Event
+from time import sleep
+
+from actinia.cache import ByteCache, ObjectCache
+
+
+class TestObjectCache:
+    """Test the ObjectCache."""
+
+    def test_ttl_and_invalidation(self) -> None:
+        """Test caching, expiry and invalidation by path."""
+        cache = ObjectCache({"raster_layers": 60, "raster_info": 0}, 0)
+        loads = []
+
+        def loader():
+            loads.append(1)
+            return len(loads)
+
+        path = ("nc_spm_08", "PERMANENT")
+        assert cache.get("raster_layers", path, loader) == 1
+        assert cache.get("raster_layers", path, loader) == 1
+        assert cache.get("raster_layers", path, loader, force=True) == 2
+        # TTL 0 without stale values always loads
+        assert cache.get("raster_info", (*path, "elevation"), loader) == 3
+        assert cache.get("raster_info", (*path, "elevation"), loader) == 4
+
+        invalidated = []
+        cache.add_listener(lambda kind, path: invalidated.append(path))
+        cache.invalidate(path=("nc_spm_08",))
+        assert invalidated == [("nc_spm_08",)]
+        assert cache.peek("raster_layers", path) is None
+        assert cache.get("raster_layers", path, loader) == 5
+        metrics = cache.metrics
+        assert metrics["hits"] == 1
+        assert metrics["misses"] == 5
+        assert metrics["entries"] == 1
+
+    def test_stale_while_revalidate(self) -> None:
+        """Test returning stale values while loading in the background."""
+        cache = ObjectCache({"locations": 0.01}, 60)
+        values = iter(["old", "new"])
+        assert cache.get("locations", (), lambda: next(values)) == "old"
+        sleep(0.02)
+        assert cache.get("locations", (), lambda: next(values)) == "old"
+        for _ in range(100):
+            if cache.peek("locations", ()) == "new":
+                break
+            sleep(0.01)
+        assert cache.peek("locations", ()) == "new"
+        assert cache.metrics["stale_hits"] == 1
+
+    def test_ttl_zero_with_stale_window(self) -> None:
+        """Test that a TTL of 0 always loads, also with stale values."""
+        cache = ObjectCache({"locations": 0})
+        values = iter(range(3))
+        results = [
+            cache.get("locations", (), lambda: next(values)) for _ in range(3)
+        ]
+        assert results == [0, 1, 2]
+        assert cache.metrics["stale_hits"] == 0
+
+    def test_refresh_does_not_overwrite(self) -> None:
+        """Test that a late refresh keeps values set while loading."""
+        cache = ObjectCache({"locations": 0.01}, 60)
+        cache.set("locations", (), "old")
+        started, release = Event(), Event()
+
+        def loader() -> str:
+            started.set()
+            release.wait(5)
+            return "refreshed"
+
+        sleep(0.02)
+        assert cache.get("locations", (), loader) == "old"
+        started.wait(5)
+        cache.set("locations", (), "new")
+        release.set()
+        for _ in range(100):
+            if cache.metrics["refreshes"]:
+                break
+            sleep(0.01)
+        assert cache.metrics["refreshes"] == 1
+        assert cache.peek("locations", ()) == "new"
+
+    def test_invalidate_while_loading(self) -> None:
+        """Test that values loaded before an invalidation are not cached."""
+        cache = ObjectCache()
+
+        def loader() -> list:
+            # the mapset changes while its list is requested
+            cache.invalidate(path=("nc_spm_08",))
+            return ["elevation"]
+
+        assert cache.get("raster_layers", ("nc_spm_08",), loader) == [
+            "elevation"
+        ]
+        assert cache.peek("raster_layers", ("nc_spm_08",)) is None
+        assert cache.get("raster_layers", ("nc_spm_08",), lambda: []) == []
+        assert cache.peek("raster_layers", ("nc_spm_08",)) == []
+
+    def test_listeners(self) -> None:
+        """Test removing listeners and not keeping their objects alive."""
+        cache = ObjectCache()
+        calls = []
+
+        class Listener:
+            def on_invalidate(self, kind: str, path: tuple) -> None:
+                calls.append(path)
+
+        listener = Listener()
+        cache.add_listener(listener.on_invalidate)
+        cache.invalidate(path=("nc_spm_08",))
+        assert calls == [("nc_spm_08",)]
+        del listener
+        gc.collect()
+        cache.invalidate(path=("nc_spm_08",))
+        assert calls == [("nc_spm_08",)]
+
+        def function(kind: str, path: tuple) -> None:
+            calls.append(kind)
+
+        cache.add_listener(function)
+        cache.remove_listener(function)
+        cache.invalidate("locations")
+        assert calls == [("nc_spm_08",)]
+
+
+class TestByteCache:
+    """Test the ByteCache."""
+
+    def test_memory_and_disk_lru(self, tmp_path) -> None:
+        """Test the size limits and reusing the files."""
+        cache = ByteCache(max_bytes=20, directory=tmp_path, max_disk_bytes=30)
+        for i in range(4):
+            cache.set(("frame", i), bytes([i]) * 10)
+        # two values in memory, three on disk
+        assert cache.metrics["memory_bytes"] == 20
+        assert cache.metrics["disk_bytes"] == 30
+        assert ("frame", 0) not in cache
+        assert cache.get(("frame", 3)) == bytes([3]) * 10
+        assert cache.get(("frame", 1)) == bytes([1]) * 10
+        assert cache.metrics["disk_hits"] == 1
+        # the files are used by a new cache, least recently used first
+        cache = ByteCache(max_bytes=20, directory=tmp_path, max_disk_bytes=30)
+        assert cache.get(("frame", 2)) == bytes([2]) * 10
+        assert cache.get(("frame", 0)) is None
+        cache.clear()
+        assert not list(tmp_path.iterdir())
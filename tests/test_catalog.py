@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+"""Test cases for the catalog of locations, mapsets and layers.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import numpy as np
+
+from actinia import Actinia
+from actinia.cache import ObjectCache
+from actinia.catalog import Catalog, CatalogEntry, read_arrays, write_arrays
+
+from .actinia_config import (
+    ACTINIA_AUTH,
+    ACTINIA_BASEURL,
+    ACTINIA_VERSION,
+    LOCATION_NAME,
+    MAPSET_NAME,
+    RASTER_NAME,
+    STRDS_NAME,
+    VECTOR_NAME,
+)
+
+
+class TestCatalogFile:
+    """Test the catalog file format."""
+
+    def test_write_and_read_arrays(self, tmp_path) -> None:
+        """Test writing and memory-mapping arrays."""
+        path = tmp_path / "arrays.bin"
+        arrays = {
+            "a": np.arange(5, dtype=np.int32),
+            "b": np.array([1.5, 2.5]),
+            "empty": np.zeros(0, dtype=np.uint8),
+        }
+        write_arrays(path, {"version": 1}, arrays)
+        meta, loaded = read_arrays(path)
+        assert meta == {"version": 1}
+        for name, array in arrays.items():
+            np.testing.assert_array_equal(loaded[name], array)
+            assert loaded[name].dtype == array.dtype
+
+
+class FakeMapset:
+    """Mapset whose raster listing can fail."""
+
+    def __init__(self, rasters: list[str]) -> None:
+        """Initialize the FakeMapset object."""
+        self.rasters = rasters
+        self.fail = False
+
+    def get_raster_layers(self, force: bool = False) -> dict:
+        """Return the raster layers or raise a connection error."""
+        if self.fail:
+            msg = "Connection refused"
+            raise ConnectionError(msg)
+        return dict.fromkeys(self.rasters)
+
+    def get_vector_layers(self, force: bool = False) -> dict:
+        """Return no vector layers."""
+        return {}
+
+    def get_strds(self, force: bool = False) -> dict:
+        """Return no STRDS."""
+        return {}
+
+
+class FakeLocation:
+    """Location with one mapset."""
+
+    def __init__(self, mapset: FakeMapset) -> None:
+        """Initialize the FakeLocation object."""
+        self.mapset = mapset
+
+    def get_mapsets(self, force: bool = False) -> dict:
+        """Return the mapsets."""
+        return {"PERMANENT": self.mapset}
+
+
+class FakeActinia:
+    """Actinia instance with one location."""
+
+    def __init__(self, mapset: FakeMapset) -> None:
+        """Initialize the FakeActinia object."""
+        self.cache = ObjectCache()
+        self.locations = {"nc": FakeLocation(mapset)}
+
+    def get_locations(self, force: bool = False) -> dict:
+        """Return the locations."""
+        return self.locations
+
+
+class TestCatalogRefresh:
+    """Test refreshing the catalog with failing listings."""
+
+    def test_failed_listing(self) -> None:
+        """Test keeping the layers of mapsets whose listing failed."""
+        mapset = FakeMapset(["elevation", "slope"])
+        actinia = FakeActinia(mapset)
+        catalog = Catalog(actinia).snapshot()
+        assert len(catalog.by_kind("raster")) == 2
+        mapset.fail = True
+        mapset.rasters.append("aspect")
+        actinia.cache.invalidate(path=("nc", "PERMANENT"))
+        catalog.refresh()
+        assert ("nc", "PERMANENT", "raster") in catalog.errors
+        assert len(catalog.by_kind("raster")) == 2
+        # the mapset stays dirty and is listed by the next refresh
+        mapset.fail = False
+        catalog.refresh()
+        assert len(catalog.by_kind("raster")) == 3
+        assert not catalog.errors
+
+
+class TestCatalog:
+    """Test the Catalog."""
+
+    @classmethod
+    def setup_class(cls) -> None:
+        """Set up the Actinia instance."""
+        cls.testactinia = Actinia(ACTINIA_BASEURL, ACTINIA_VERSION)
+        cls.testactinia.set_authentication(ACTINIA_AUTH[0], ACTINIA_AUTH[1])
+
+    def test_snapshot_and_reload(self, tmp_path) -> None:
+        """Test crawling, lookups, saving and loading the catalog."""
+        catalog = Catalog(self.testactinia).snapshot()
+        assert (LOCATION_NAME, MAPSET_NAME) in catalog.mapsets
+        raster = CatalogEntry(
+            LOCATION_NAME, MAPSET_NAME, "raster", RASTER_NAME
+        )
+        assert raster in catalog.lookup(RASTER_NAME)
+        assert raster in catalog.prefix(RASTER_NAME[:3], "raster")
+        assert all(e.kind == "raster" for e in catalog.prefix("", "raster"))
+        vector = CatalogEntry(
+            LOCATION_NAME, MAPSET_NAME, "vector", VECTOR_NAME
+        )
+        assert vector in catalog.by_kind("vector")
+        assert catalog.lookup(STRDS_NAME, "strds")
+        assert catalog.layer(raster).name == RASTER_NAME
+
+        path = tmp_path / "catalog.bin"
+        catalog.save(path)
+        loaded = Catalog.load(self.testactinia, path)
+        assert len(loaded) == len(catalog)
+        assert loaded.lookup(RASTER_NAME) == catalog.lookup(RASTER_NAME)
+        loaded.refresh()
+        assert len(loaded) == len(catalog)
+
+    def test_spatial_index(self, tmp_path) -> None:
+        """Test bounding box and point queries of the spatial index."""
+        catalog = Catalog(self.testactinia).snapshot()
+        index = catalog.build_spatial_index()
+        raster = CatalogEntry(
+            LOCATION_NAME, MAPSET_NAME, "raster", RASTER_NAME
+        )
+        region = catalog.layer(raster).region
+        assert raster in index.query(region, LOCATION_NAME, "raster")
+        x = (region.e + region.w) / 2
+        y = (region.n + region.s) / 2
+        assert raster in index.query_point(x, y, LOCATION_NAME)
+        assert raster not in index.query_point(region.e + 1, y, LOCATION_NAME)
+        assert all(
+            e.kind == "vector" for e in index.query(region, kind="vector")
+        )
+
+        path = tmp_path / "catalog.bin"
+        catalog.save(path)
+        loaded = Catalog.load(self.testactinia, path).spatial_index
+        assert len(loaded) == len(index)
+        assert loaded.query(region, LOCATION_NAME) == index.query(
+            region, LOCATION_NAME
+        )
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""Test cases for the process chain cost estimator.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+from types import SimpleNamespace
+
+from actinia.estimator import CostEstimator
+from actinia.region import Region
+from actinia.utils import create_actinia_pc_item, use_sync_processing
+
+PC = {
+    "list": [
+        create_actinia_pc_item("1", "r.mapcalc"),
+        create_actinia_pc_item("2", "r.univar"),
+    ],
+    "version": "1",
+}
+
+
+def create_region(cells):
+    """Create a region with the given number of cells."""
+    return Region(cells=cells)
+
+
+class TestCostEstimator:
+    """Test the CostEstimator."""
+
+    def test_estimate_from_samples(self, tmp_path) -> None:
+        """Test fitting the run time models to recorded samples."""
+        estimator = CostEstimator()
+        for cells in (1000, 2000, 4000):
+            estimator.add_sample("r.mapcalc", 1 + cells * 0.001, cells)
+        overhead, slope = estimator.model("r.mapcalc")
+        assert abs(overhead - 1) < 1e-6
+        assert abs(slope - 0.001) < 1e-9
+
+        estimate = estimator.estimate(PC, create_region(3000))
+        assert [step["module"] for step in estimate["steps"]] == [
+            "r.mapcalc",
+            "r.univar",
+        ]
+        assert abs(estimate["steps"][0]["runtime"] - 4) < 1e-6
+        assert estimate["cells"] == 3000
+        assert estimate["split"] == 1
+
+        limited = estimator.estimate(PC, create_region(3000), max_cells=1000)
+        assert limited["exceeds_limits"] is True
+        assert limited["split"] == 3
+
+        # saved samples result in the same models
+        model_file = tmp_path / "costs.json"
+        estimator.save(model_file)
+        loaded = CostEstimator()
+        loaded.load(model_file)
+        assert loaded.model("r.mapcalc") == estimator.model("r.mapcalc")
+
+    def test_use_sync_processing_with_estimator(self) -> None:
+        """Test the sync/async selection with a cost estimator."""
+        estimator = CostEstimator()
+        for module in ("r.mapcalc", "r.univar"):
+            for cells in (1000, 2000, 4000):
+                estimator.add_sample(module, cells * 0.05, cells)
+        region = create_region(1000)
+        assert estimator.covers(PC)
+        assert not use_sync_processing(PC, region, estimator=estimator)
+        assert use_sync_processing(
+            PC, region, estimator=estimator, max_runtime=200
+        )
+
+    def test_use_sync_processing_without_samples(self) -> None:
+        """Test the cells and modules rule for modules without samples."""
+        estimator = CostEstimator()
+        pc = {"list": [create_actinia_pc_item("1", "r.mapcalc")]}
+        estimator.add_sample("r.mapcalc", 0.1, None)
+        assert not estimator.covers(pc)
+        # the default model would select sync processing
+        region = create_region(95000000)
+        assert estimator.estimate(pc, region)["runtime"] <= 10
+        assert not use_sync_processing(pc, region, estimator=estimator)
+        assert use_sync_processing(
+            pc, create_region(1000), estimator=estimator
+        )
+
+    def test_record(self) -> None:
+        """Test recording the cells of the region set in the chain."""
+        estimator = CostEstimator()
+        job = SimpleNamespace(
+            region=create_region(1000),
+            process_log=[
+                {"executable": "r.mapcalc", "run_time": 1.0},
+                {
+                    "executable": "g.region",
+                    "run_time": 0.1,
+                    "stdout": "n=10\nrows=50\ncols=40\ncells=2000\n",
+                },
+                {"executable": "r.univar", "run_time": 2.0},
+            ],
+        )
+        estimator.record(job)
+        assert list(estimator.samples["r.mapcalc"]) == [(1000, 1.0)]
+        assert list(estimator.samples["g.region"]) == [(1000, 0.1)]
+        assert list(estimator.samples["r.univar"]) == [(2000, 2.0)]
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""Test cases for the incremental GeoJSON parsing.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import json
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from actinia.geojson import iter_batches, iter_features, split_features
+
+GEOJSON = Path(__file__).resolve().parent / "../test_data/firestations.geojson"
+
+
+class TestGeoJson:
+    """Test parsing GeoJSON feature collections incrementally."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1024 * 1024])
+    def test_iter_features(self, chunk_size) -> None:
+        """Test that the features equal the features of json.load."""
+        features = json.loads(GEOJSON.read_text())["features"]
+        with GEOJSON.open("rb") as file:
+            parsed = list(iter_features(file, chunk_size))
+        assert parsed == features
+        # UTF-8 characters split between chunks and keys after the features
+        data = json.dumps(
+            {
+                "type": "FeatureCollection",
+                "features": [{"properties": {"name": "Öhringen"}}] * 3,
+                "bbox": [0, 1, 2, 3],
+            },
+            ensure_ascii=False,
+        ).encode()
+        chunks = [bytes([byte]) for byte in data]
+        assert list(iter_features(chunks))[2]["properties"] == {
+            "name": "Öhringen"
+        }
+
+    def test_iter_features_errors(self) -> None:
+        """Test truncated and invalid GeoJSON."""
+        with pytest.raises(ValueError):
+            list(iter_features(['{"features": [{"type": "Feature"}']))
+        with pytest.raises(ValueError):
+            list(iter_features(['[{"type": "Feature"}]']))
+        assert not list(iter_features(['{"features": []}']))
+
+    def test_iter_batches(self) -> None:
+        """Test columnar batches of features."""
+        batches = list(iter_batches(iter_features(GEOJSON), 50))
+        assert [len(batch["cat"]) for batch in batches] == [50, 21]
+        assert batches[0]["cat"].dtype == np.int64
+        assert batches[0]["geometry"][0]["type"] == "Point"
+        features = [
+            {"properties": {"a": 1}, "geometry": None},
+            {"properties": {"b": "x"}, "geometry": None},
+        ]
+        (batch,) = iter_batches(features, columns=["a"])
+        assert list(batch) == ["geometry", "a"]
+        assert batch["a"].tolist() == [1, None]
+
+    def test_split_features(self, tmp_path) -> None:
+        """Test splitting a GeoJSON into chunks with the same properties."""
+        features = json.loads(GEOJSON.read_text())["features"]
+        features[0]["properties"]["cat"] = 1.5
+        del features[1]["properties"]["CITY"]
+        path = tmp_path / "firestations.geojson"
+        path.write_text(
+            json.dumps({"type": "FeatureCollection", "features": features})
+        )
+        chunks = split_features(path, 3, tmp_path, "firestations")
+        assert [chunk["features"] for chunk in chunks] == [24, 24, 23]
+        assert chunks[0]["geometry_types"] == {"Point"}
+        parsed = [
+            feature
+            for chunk in chunks
+            for feature in iter_features(chunk["path"])
+        ]
+        assert [f["geometry"] for f in parsed] == [
+            f["geometry"] for f in features
+        ]
+        assert parsed[1]["properties"]["CITY"] is None
+        assert all(isinstance(f["properties"]["cat"], float) for f in parsed)
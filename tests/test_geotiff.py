@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+"""Test cases for the GeoTIFF encoding and decoding.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from actinia.geotiff import encode, read
+from actinia.region import Region
+
+REGION = Region(n=228500, s=215000, e=645000, w=630000)
+
+
+class TestGeoTiff:
+    """Test encoding numpy arrays as GeoTIFF."""
+
+    def test_encode(self) -> None:
+        """Test the header, the tags and the data of the GeoTIFF."""
+        array = np.arange(1350 * 1500, dtype=np.int16).reshape(1350, 1500)
+        geotiff = encode(array, REGION, epsg=3358, nodata=-1)
+        assert geotiff[:4] == b"II*\0"
+        (ifd,) = struct.unpack("<I", geotiff[4:8])
+        (count,) = struct.unpack_from("<H", geotiff, ifd)
+        tags = {}
+        for i in range(count):
+            start = ifd + 2 + 12 * i
+            tag, _, n, value = struct.unpack_from("<HHII", geotiff, start)
+            tags[tag] = (n, value)
+        assert tags[256] == (1, 1500)
+        assert tags[257] == (1, 1350)
+        n_strips, offsets = tags[273]
+        (first,) = struct.unpack_from("<I", geotiff, offsets)
+        data = np.frombuffer(geotiff, "<i2", offset=first)
+        np.testing.assert_array_equal(data.reshape(1350, 1500), array)
+        # the pixel scale is computed from the extent
+        n, offset = tags[33550]
+        scale = struct.unpack_from("<3d", geotiff, offset)
+        assert scale == (10.0, 10.0, 0.0)
+
+    def test_encode_errors(self) -> None:
+        """Test unsupported arrays."""
+        with pytest.raises(ValueError):
+            encode(np.zeros((2, 2, 2)), REGION)
+        with pytest.raises(TypeError):
+            encode(np.zeros((2, 2), dtype=np.int64), REGION)
+        with pytest.raises(ValueError):
+            encode(
+                np.zeros((2, 2)), Region(n=1, s=0, e=1, w=0, rows=3, cols=3)
+            )
+
+
+def tiled_geotiff(array, tile_size, predictor=1):
+    """Write a deflate compressed, tiled, big-endian GeoTIFF."""
+    rows, cols = array.shape[:2]
+    bands = array.shape[2] if array.ndim == 3 else 1
+    dtype = array.dtype.newbyteorder(">")
+    tiles = []
+    for row in range(0, rows, tile_size):
+        for col in range(0, cols, tile_size):
+            tile = np.zeros((tile_size, tile_size, bands), dtype=dtype)
+            block = array[row:, col:][:tile_size, :tile_size]
+            tile[: block.shape[0], : block.shape[1]] = block.reshape(
+                *block.shape[:2], bands
+            )
+            if predictor == 2:
+                tile[:, 1:] = np.diff(tile, axis=1)
+            if predictor == 3:
+                # byte planes of each row, differenced by one pixel
+                planes = (
+                    tile.view(np.uint8)
+                    .reshape(tile_size, tile_size * bands, dtype.itemsize)
+                    .transpose(0, 2, 1)
+                    .reshape(tile_size, -1)
+                )
+                tile = planes.copy()
+                tile[:, bands:] = planes[:, bands:] - planes[:, :-bands]
+            tiles.append(zlib.compress(tile.tobytes()))
+    data_offset = 8
+    offsets = []
+    for tile in tiles:
+        offsets.append(data_offset)
+        data_offset += len(tile)
+    entries = [
+        (256, 4, [cols]),
+        (257, 4, [rows]),
+        (258, 3, [array.dtype.itemsize * 8]),
+        (259, 3, [8]),
+        (277, 3, [bands]),
+        (317, 3, [predictor]),
+        (322, 4, [tile_size]),
+        (323, 4, [tile_size]),
+        (324, 4, offsets),
+        (325, 4, [len(tile) for tile in tiles]),
+        (339, 3, [{"u": 1, "i": 2, "f": 3}[array.dtype.kind]]),
+        (33550, 12, [10.0, 10.0, 0.0]),
+        (33922, 12, [0.0, 0.0, 0.0, 630000.0, 228500.0, 0.0]),
+    ]
+    formats = {3: "H", 4: "I", 12: "d"}
+    ifd = bytearray(struct.pack(">H", len(entries)))
+    extra = bytearray()
+    extra_offset = data_offset + 2 + 12 * len(entries) + 4
+    for tag, field_type, values in entries:
+        packed = struct.pack(f">{len(values)}{formats[field_type]}", *values)
+        if len(packed) <= 4:
+            value = packed.ljust(4, b"\0")
+        else:
+            value = struct.pack(">I", extra_offset + len(extra))
+            extra += packed
+        ifd += struct.pack(">HHI", tag, field_type, len(values)) + value
+    ifd += b"\0\0\0\0"
+    header = b"MM\0*" + struct.pack(">I", data_offset)
+    return header + b"".join(tiles) + ifd + extra
+
+
+class TestGeoTiffRead:
+    """Test reading GeoTIFF files into numpy arrays."""
+
+    def test_read_memmap(self, tmp_path) -> None:
+        """Test memory-mapping an uncompressed GeoTIFF."""
+        array = np.arange(135 * 150, dtype=np.float32).reshape(135, 150)
+        path = tmp_path / "elevation.tif"
+        path.write_bytes(encode(array, REGION, epsg=3358, nodata=-1))
+        data, region, nodata = read(path)
+        assert isinstance(data, np.memmap)
+        np.testing.assert_array_equal(data, array)
+        assert (region.n, region.s, region.e, region.w) == (
+            228500,
+            215000,
+            645000,
+            630000,
+        )
+        assert (region.rows, region.cols) == (135, 150)
+        assert region.nsres == 100
+        assert nodata == -1
+        assert not (tmp_path / "elevation.npy").exists()
+
+    @pytest.mark.parametrize("predictor", [1, 2])
+    def test_read_tiled_deflate(self, tmp_path, predictor) -> None:
+        """Test decoding a tiled deflate compressed GeoTIFF."""
+        array = np.arange(135 * 150, dtype=np.int32).reshape(135, 150)
+        path = tmp_path / "elevation.tif"
+        path.write_bytes(tiled_geotiff(array, 64, predictor))
+        data, region, nodata = read(path)
+        np.testing.assert_array_equal(data, array)
+        assert data.dtype == np.int32
+        assert (tmp_path / "elevation.npy").exists()
+        assert (region.n, region.s, region.e, region.w) == (
+            228500,
+            227150,
+            631500,
+            630000,
+        )
+        assert nodata is None
+
+    def test_read_floating_point_predictor(self, tmp_path) -> None:
+        """Test decoding a two band GeoTIFF with floating point predictor."""
+        values = np.linspace(-1000, 1000, 135 * 150 * 2, dtype=np.float32)
+        array = values.reshape(135, 150, 2)
+        array[:, :, 1] *= -3.5
+        path = tmp_path / "elevation.tif"
+        path.write_bytes(tiled_geotiff(array, 64, predictor=3))
+        data, region, nodata = read(path)
+        assert data.shape == (135, 150, 2)
+        np.testing.assert_array_equal(data, array)
+        assert data.dtype == np.float32
@@ -19,6 +19,7 @@ __maintainer__ = "Anika Weinmann"
 
 from actinia import Actinia
 from actinia.job import Job
+from actinia.scheduler import JobScheduler
 
 from .actinia_config import (
     ACTINIA_BASEURL,
@@ -97,3 +98,58 @@ class TestActiniaProcessing(object):
             .get_raster_layers()
         )
         assert "elevation" in rasters
+
+    def test_sync_ephemeral_processing(self):
+        """Test sync ephemeral processing."""
+        job = self.testactinia.locations[
+            LOCATION_NAME
+        ].create_processing_export_job(PC, mode="sync")
+        assert isinstance(job, Job), "No job returned!"
+        assert job.status == "finished", "Job status not 'finished'!"
+        assert job.poll_until_finished() == 0
+        assert job.urls["resources"][0].endswith("elevation.tif")
+
+    def test_sync_persistent_processing(self):
+        """Test sync and auto persistent processing."""
+        mapset = self.testactinia.locations[LOCATION_NAME].mapsets[
+            NEW_MAPSET_NAME
+        ]
+        for mode in ("sync", "auto"):
+            job = mapset.create_processing_job(PC, mode=mode)
+            assert isinstance(job, Job), "No job returned!"
+            job.poll_until_finished()
+            assert job.status == "finished", "Job status not 'finished'!"
+
+    def test_map_process_chains(self):
+        """Test bulk submission of process chains."""
+        mapset = self.testactinia.locations[LOCATION_NAME].mapsets[
+            NEW_MAPSET_NAME
+        ]
+        batch = self.testactinia.map([PC, PC], mapset, max_in_flight=2)
+        items = batch.wait()
+        assert len(items) == 2, "Not all process chains returned!"
+        for item in items:
+            assert isinstance(item.job, Job), "No job returned!"
+            assert item.status == "finished", "Job status not 'finished'!"
+        metrics = batch.metrics
+        assert metrics["finished"] == 2
+        assert metrics["failed"] == 0
+        assert metrics["jobs_per_minute"] > 0
+
+    def test_job_scheduler(self):
+        """Test scheduling of dependent process chains."""
+        mapset = self.testactinia.locations[LOCATION_NAME].mapsets[
+            NEW_MAPSET_NAME
+        ]
+        scheduler = JobScheduler({"preprocessing": 1})
+        scheduler.add("ingest", PC, mapset, stage="ingest")
+        scheduler.add("pre_1", PC, mapset, ["ingest"], stage="preprocessing")
+        scheduler.add("pre_2", PC, mapset, ["ingest"], stage="preprocessing")
+        scheduler.add("mosaic", PC, mapset, ["pre_1", "pre_2"])
+        tasks = scheduler.run()
+        for task in tasks.values():
+            assert task.status == "finished", "Task status not 'finished'!"
+        path = scheduler.critical_path()
+        assert path[0].name == "ingest"
+        assert path[-1].name == "mosaic"
+        assert "Critical path" in scheduler.report()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""Test cases for Region and RegionArray.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import numpy as np
+import pytest
+
+from actinia.region import Region, RegionArray
+
+RASTER_INFO = {
+    "north": "228500",
+    "south": "215000",
+    "east": "645000",
+    "west": "630000",
+    "nsres": "10",
+    "ewres": "10",
+    "rows": "1350",
+    "cols": "1500",
+    "cells": "2025000",
+    "datatype": "FCELL",
+}
+
+
+class TestRegion:
+    """Test Region and RegionArray."""
+
+    def test_region_from_dict(self) -> None:
+        """Test creating regions from info dicts."""
+        region = Region.from_dict(RASTER_INFO)
+        assert region.n == 228500
+        assert region.cells == 2025000
+        assert isinstance(region.cells, int)
+        assert region.t is None
+        with pytest.raises(AttributeError):
+            region.datatype = "FCELL"
+
+        vector = Region.from_dict(
+            {"north": 10, "south": 0, "east": 5, "west": 0, "top": 0}
+        )
+        assert vector.e == 5
+        assert vector.nsres is None
+        assert Region.from_dict(region.to_dict()) == region
+        with pytest.raises(TypeError):
+            hash(region)
+        assert len({region.to_tuple(), vector.to_tuple()}) == 2
+        assert region.to_tuple() == Region.from_dict(RASTER_INFO).to_tuple()
+
+    def test_region_array_operations(self) -> None:
+        """Test vectorized geometry operations."""
+        regions = RegionArray.from_regions(
+            [
+                Region(n=10, s=0, e=10, w=0, nsres=1, ewres=1),
+                Region(n=30, s=20, e=30, w=20, nsres=1, ewres=1),
+            ]
+        )
+        assert regions.cells.tolist() == [100, 100]
+        assert [r.cells for r in regions.to_regions()] == [100, 100]
+        assert regions[-1].to_tuple() == regions.to_regions()[1].to_tuple()
+        aoi = Region(n=5, s=-5, e=5, w=-5)
+        assert regions.intersects(aoi).tolist() == [True, False]
+        assert regions.contains(25, 25).tolist() == [False, True]
+        intersection = regions.intersection(aoi)
+        assert intersection[0].n == 5
+        assert intersection[0].w == 0
+        assert np.isnan(intersection.n[1])
+        union = regions.union(aoi)
+        assert union[1].s == -5
+        assert regions.bounds().n == 30
+
+        aligned = RegionArray([10.5], [0.5], [10.5], [0.5]).align(2, 2)
+        assert aligned[0].n == 12
+        assert aligned[0].s == 0
+
+    def test_region_array_tile(self) -> None:
+        """Test tiling with halo."""
+        regions = RegionArray([10, 100], [0, 96], [10, 5], [0, 0], 1, 1)
+        tiles, parents = regions.tile(4, 4, halo=1)
+        assert parents.tolist() == [0] * 9 + [1, 1]
+        assert tiles[0].n == 11
+        assert tiles[0].s == 5
+        assert tiles[8].s == -1
+        assert tiles[8].e == 11
+        assert tiles[10].w == 3
+        assert tiles[10].e == 6
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""Test cases for rendering STRDS frames.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import json
+from threading import Lock
+
+import numpy as np
+import pytest
+
+from actinia.cache import ByteCache
+from actinia.render import FrameRenderer
+
+BBOX = {"n": 228500, "s": 215000, "e": 645000, "w": 630000}
+
+
+class FakeRenderer:
+    """Render function returning the render parameters as image."""
+
+    def __init__(self) -> None:
+        """Initialize the FakeRenderer object."""
+        self.calls = []
+        self.lock = Lock()
+
+    def __call__(self, render_dict: dict) -> bytes:
+        """Return the render parameters as bytes."""
+        with self.lock:
+            self.calls.append(render_dict["start_time"])
+        return json.dumps(render_dict).encode()
+
+
+def frame_renderer(render, cache=None, prefetch=3) -> FrameRenderer:
+    """Return a FrameRenderer of ten daily frames."""
+    start_times = np.arange(
+        "2023-01-01", "2023-01-11", dtype="datetime64[D]"
+    ).astype("datetime64[s]")
+    end_times = start_times + np.timedelta64(1, "D")
+    end_times[-1] = np.datetime64("NaT")
+    return FrameRenderer(
+        render,
+        ("strds", "nc_spm_08", "modis", "lst"),
+        start_times,
+        end_times,
+        BBOX,
+        400,
+        300,
+        prefetch=prefetch,
+        cache=cache,
+    )
+
+
+class TestFrameRenderer:
+    """Test rendering, prefetching and caching frames."""
+
+    def test_frames(self) -> None:
+        """Test the frames and their render parameters."""
+        render = FakeRenderer()
+        with frame_renderer(render) as frames:
+            assert len(frames) == 10
+            rendered = list(frames)
+            assert [frame.index for frame in rendered] == list(range(10))
+            params = json.loads(rendered[2].image)
+            assert params == {
+                **BBOX,
+                "width": 400,
+                "height": 300,
+                "start_time": "2023-01-03 00:00:00",
+                "end_time": "2023-01-04 00:00:00",
+            }
+            # time instances end at their start
+            assert json.loads(frames[-1].image)["end_time"] == (
+                "2023-01-10 00:00:00"
+            )
+            # each frame is rendered once
+            assert sorted(render.calls) == sorted(set(render.calls))
+            with pytest.raises(IndexError):
+                frames[10]
+
+    def test_cache(self, tmp_path) -> None:
+        """Test that cached frames are not rendered again."""
+        render = FakeRenderer()
+        cache = ByteCache(directory=tmp_path)
+        with frame_renderer(render, cache, prefetch=0) as frames:
+            frames[4]
+            frames[4]
+        assert len(render.calls) == 1
+        # a new renderer uses the files of the cache
+        render = FakeRenderer()
+        cache = ByteCache(directory=tmp_path)
+        with frame_renderer(render, cache, prefetch=0) as frames:
+            frames[4]
+            frames[5]
+        assert render.calls == ["2023-01-06 00:00:00"]
@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+"""Test cases for decoding STRDS sampling responses.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import numpy as np
+
+from actinia.strds import SampleResult
+
+
+class TestSampleResult:
+    """Test decoding STRDS sampling responses."""
+
+    def test_from_response(self) -> None:
+        """Test decoding into a (points, times) array."""
+        response = {
+            "process_results": [
+                ["start_time", "end_time", "a", "b"],
+                ["2023-01-01 00:00:00", "2023-01-02 00:00:00", "1.5", "*"],
+                ["2023-01-02 00:00:00", "None", "2", "3"],
+            ],
+        }
+        result = SampleResult.from_response(response)
+        assert result.ids.tolist() == ["a", "b"]
+        assert result.start_times[1] == np.datetime64("2023-01-02T00:00:00")
+        assert np.isnat(result.end_times[1])
+        values = result.as_array()
+        assert values.shape == (2, 2)
+        assert values[0].tolist() == [1.5, 2.0]
+        assert np.isnan(values[1, 0])
+        assert result.as_array("float32").dtype == np.float32
+        empty = SampleResult.from_response({"process_results": []})
+        assert empty.values.shape == (0, 0)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+"""Test cases for the scheduling of dependent process chains.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import pytest
+import requests
+
+from actinia.scheduler import JobScheduler
+
+
+class FakeJob:
+    """Job running for a number of polls, some of which fail."""
+
+    def __init__(self, name: str, pc: dict) -> None:
+        """Initialize the FakeJob object."""
+        self.name = name
+        self.status = "accepted"
+        self.message = ""
+        self.polls = pc.get("polls", 1)
+        self.final_status = pc.get("status", "finished")
+        self.poll_errors = pc.get("poll_errors", 0)
+
+    def poll(self, quiet: bool = False) -> None:
+        """Raise the next poll error or count down the polls."""
+        if self.poll_errors:
+            self.poll_errors -= 1
+            msg = "Read timed out."
+            raise requests.exceptions.ReadTimeout(msg)
+        self.polls -= 1
+        self.status = "running" if self.polls > 0 else self.final_status
+
+
+class FakeMapset:
+    """Mapset creating fake jobs and recording the submission order."""
+
+    def __init__(self) -> None:
+        """Initialize the FakeMapset object."""
+        self.submitted = []
+
+    def create_processing_job(self, pc: dict, name: str) -> FakeJob:
+        """Return a new job for the process chain."""
+        self.submitted.append(name)
+        return FakeJob(name, pc)
+
+
+def scheduler(**kwargs) -> JobScheduler:
+    """Return a scheduler which does not wait between polls."""
+    return JobScheduler(waiting_time=0, **kwargs)
+
+
+class TestJobScheduler:
+    """Test dependencies, failures, poll errors and the critical path."""
+
+    def test_failure_propagation(self) -> None:
+        """Test that tasks of a failed upstream task are not submitted."""
+        mapset = FakeMapset()
+        jobs = scheduler()
+        jobs.add("ingest", {}, mapset)
+        jobs.add("broken", {"status": "error"}, mapset, ["ingest"])
+        jobs.add("ok", {"polls": 3}, mapset, ["ingest"])
+        jobs.add("merge", {}, mapset, ["broken", "ok"])
+        jobs.add("report", {}, mapset, ["merge"])
+        tasks = jobs.run()
+        assert mapset.submitted == ["ingest", "broken", "ok"]
+        assert {name: task.status for name, task in tasks.items()} == {
+            "ingest": "finished",
+            "broken": "error",
+            "ok": "finished",
+            "merge": "upstream_failed",
+            "report": "upstream_failed",
+        }
+
+    def test_poll_errors(self) -> None:
+        """Test retrying failed polls and failing after too many."""
+        mapset = FakeMapset()
+        jobs = scheduler(retries=2)
+        jobs.add("flaky", {"polls": 2, "poll_errors": 2}, mapset)
+        jobs.add("lost", {"poll_errors": 3}, mapset)
+        jobs.add("next", {}, mapset, ["lost"])
+        tasks = jobs.run()
+        assert tasks["flaky"].status == "finished"
+        assert tasks["lost"].status == "error"
+        assert isinstance(
+            tasks["lost"].error,
+            requests.exceptions.ReadTimeout,
+        )
+        assert tasks["next"].status == "upstream_failed"
+
+    def test_stage_limits(self) -> None:
+        """Test the validation and use of the stage limits."""
+        with pytest.raises(ValueError, match="at least 1"):
+            JobScheduler({"preprocessing": 0})
+        with pytest.raises(ValueError, match="at least 1"):
+            JobScheduler(default_parallel=0)
+        mapset = FakeMapset()
+        jobs = scheduler(max_parallel={"preprocessing": 1})
+        for name in ("a", "b", "c"):
+            jobs.add(name, {"polls": 2}, mapset, stage="preprocessing")
+        tasks = jobs.run()
+        starts = sorted(task.submit_time for task in tasks.values())
+        ends = sorted(task.end_time for task in tasks.values())
+        # each job is submitted after the previous one has ended
+        assert all(end <= start for end, start in zip(ends, starts[1:]))
+
+    def test_critical_path(self) -> None:
+        """Test the chain of dependent tasks with the longest duration."""
+        mapset = FakeMapset()
+        jobs = scheduler()
+        jobs.add("ingest", {}, mapset, stage="ingest")
+        jobs.add("short", {}, mapset, ["ingest"])
+        jobs.add("long", {}, mapset, ["ingest"])
+        jobs.add("merge", {}, mapset, ["short", "long"])
+        jobs.run()
+        durations = {"ingest": 1.0, "short": 2.0, "long": 5.0, "merge": 1.0}
+        for name, duration in durations.items():
+            task = jobs.tasks[name]
+            task.submit_time = 0.0
+            task.end_time = duration
+        path = jobs.critical_path()
+        assert [task.name for task in path] == ["ingest", "long", "merge"]
+        report = jobs.report()
+        assert "Critical path (7.0s):" in report
+        assert "  ingest [ingest]: 1.0s (finished)" in report
+        assert "  None: finished: 3" in report
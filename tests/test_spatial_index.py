@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+"""Test cases for the spatial index of layer extents.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+from threading import Event, Lock, Thread
+
+from actinia.cache import ObjectCache
+from actinia.catalog import CatalogEntry
+from actinia.spatial_index import SpatialIndex
+
+
+class FakeLayer:
+    """Layer answering info requests with its extent."""
+
+    def __init__(self, server: "FakeServer", n, s, e, w) -> None:
+        """Initialize the FakeLayer object."""
+        self.server = server
+        self.extent = {"north": n, "south": s, "east": e, "west": w}
+
+    def get_info(self) -> dict:
+        """Return the extent as the server does."""
+        with self.server.lock:
+            self.server.requests += 1
+        self.server.release.wait(5)
+        return {key: str(value) for key, value in self.extent.items()}
+
+
+class FakeMapset:
+    """Mapset with raster layers only."""
+
+    def __init__(self, layers: dict) -> None:
+        """Initialize the FakeMapset object."""
+        self.layers = layers
+
+    def get_raster_layers(self) -> dict:
+        """Return the raster layers."""
+        return self.layers
+
+    def get_vector_layers(self) -> dict:
+        """Return no vector layers."""
+        return {}
+
+    def get_strds(self) -> dict:
+        """Return no STRDS."""
+        return {}
+
+
+class FakeLocation:
+    """Location with the mapsets of the server."""
+
+    def __init__(self, mapsets: dict) -> None:
+        """Initialize the FakeLocation object."""
+        self.mapsets = mapsets
+
+    def get_mapsets(self) -> dict:
+        """Return the mapsets."""
+        return self.mapsets
+
+
+class FakeServer:
+    """Actinia instance with one location of gridded raster layers."""
+
+    def __init__(self, n_layers: int) -> None:
+        """Initialize the FakeServer object."""
+        self.cache = ObjectCache()
+        self.lock = Lock()
+        self.release = Event()
+        self.release.set()
+        self.requests = 0
+        self.layers = {
+            f"tile_{i}": FakeLayer(
+                self,
+                (i // 100 + 1) * 10,
+                (i // 100) * 10,
+                (i % 100 + 1) * 10,
+                (i % 100) * 10,
+            )
+            for i in range(n_layers)
+        }
+        self.locations = {
+            "nc": FakeLocation({"PERMANENT": FakeMapset(self.layers)}),
+        }
+
+    def get_locations(self) -> dict:
+        """Return the locations."""
+        return self.locations
+
+
+class FakeCatalog:
+    """Catalog of all raster layers of the server."""
+
+    def __init__(self, server: FakeServer) -> None:
+        """Initialize the FakeCatalog object."""
+        self.server = server
+
+    def by_kind(self, kind: str) -> list[CatalogEntry]:
+        """Return the entries of a layer type."""
+        if kind != "raster":
+            return []
+        return [
+            CatalogEntry("nc", "PERMANENT", "raster", name)
+            for name in self.server.layers
+        ]
+
+    def layer(self, entry: CatalogEntry) -> FakeLayer:
+        """Return the layer of an entry."""
+        return self.server.layers[entry.name]
+
+
+def build(server: FakeServer) -> SpatialIndex:
+    """Return a spatial index of all layers of the server."""
+    return SpatialIndex(server).build(FakeCatalog(server))
+
+
+class TestSpatialIndex:
+    """Test building, querying and updating the spatial index."""
+
+    def test_build_and_query(self) -> None:
+        """Test bounding box and point queries of many layers."""
+        server = FakeServer(5000)
+        index = build(server)
+        assert len(index) == 5000
+        assert server.requests == 5000
+        names = {entry.name for entry in index.query((25, 15, 25, 15))}
+        assert names == {"tile_101", "tile_102", "tile_201", "tile_202"}
+        names = {entry.name for entry in index.query_point(5, 5, "nc")}
+        assert names == {"tile_0"}
+        assert index.query_point(5, 5, "unknown") == []
+
+    def test_stale_mapsets(self) -> None:
+        """Test that mapset changes are only updated by refresh."""
+        server = FakeServer(200)
+        index = build(server)
+        requests = server.requests
+        server.layers["tile_0"].extent["north"] = 1000
+        del server.layers["tile_1"]
+        server.cache.invalidate(path=("nc", "PERMANENT"))
+        assert index.stale == {("nc", "PERMANENT")}
+        names = {entry.name for entry in index.query_point(5, 500, "nc")}
+        assert names == set()
+        assert server.requests == requests
+        index.refresh()
+        assert index.stale == set()
+        assert server.requests == requests + 199
+        assert len(index) == 199
+        names = {entry.name for entry in index.query_point(5, 500, "nc")}
+        assert names == {"tile_0"}
+        assert index.query_point(15, 5, "nc") == []
+
+    def test_query_during_refresh(self) -> None:
+        """Test that queries do not wait for the requests of a refresh."""
+        server = FakeServer(100)
+        index = build(server)
+        server.release.clear()
+        server.cache.invalidate(path=("nc", "PERMANENT"))
+        refresh = Thread(target=index.refresh)
+        refresh.start()
+        names = {entry.name for entry in index.query_point(5, 5, "nc")}
+        assert names == {"tile_0"}
+        assert refresh.is_alive()
+        server.release.set()
+        refresh.join(5)
+        assert len(index) == 100
@@ -0,0 +1,156 @@
+#!/usr/bin/env python
+"""Test cases for the chunked STRDS sampling and statistics requests.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import json
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Lock, Thread
+from typing import Callable
+
+import pytest
+
+from actinia.cache import ObjectCache
+from actinia.strds import CHUNK_INDEX, SpaceTimeRasterDataset
+
+TIMESTAMPS = ["2023-01-01 00:00:00"]
+
+
+class ResponseHandler(BaseHTTPRequestHandler):
+    """Handler answering with the response of the server's respond."""
+
+    def do_POST(self) -> None:
+        """Read the request and send the status code and body."""
+        data = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with self.server.lock:
+            self.server.requests += 1
+            status_code, resp_dict = self.server.respond(data)
+        body = json.dumps(resp_dict).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        """Do not log the requests."""
+
+
+class FakeActinia:
+    """Actinia instance with the attributes used by the STRDS requests."""
+
+    def __init__(self, respond: Callable[[dict], tuple]) -> None:
+        """Start a local server answering with respond."""
+        self.server = HTTPServer(("127.0.0.1", 0), ResponseHandler)
+        self.server.respond = respond
+        self.server.requests = 0
+        self.server.lock = Lock()
+        Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        self.headers = {"content-type": "application/json; charset=utf-8"}
+        self.timeout = (5, 5)
+        self.cache = ObjectCache()
+
+    def strds(self) -> SpaceTimeRasterDataset:
+        """Return a STRDS of the local server."""
+        return SpaceTimeRasterDataset(
+            "modis", "nc_spm_08", "modis_lst", self, ("user", "pw")
+        )
+
+    def close(self) -> None:
+        """Stop the local server."""
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def polygon(feature_id: str, cat: int) -> dict:
+    """Return a square polygon feature with its own cat property."""
+    return {
+        "type": "Feature",
+        "id": feature_id,
+        "properties": {"cat": cat},
+        "geometry": {
+            "type": "Polygon",
+            "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]],
+        },
+    }
+
+
+def statistics(data: dict) -> tuple:
+    """Answer with the features' cat as number in reversed order."""
+    return 200, {
+        "process_results": [
+            {
+                "cat": str(feature["properties"]["cat"]),
+                CHUNK_INDEX: str(feature["properties"][CHUNK_INDEX]),
+                "raster_number": str(feature["properties"]["cat"]),
+            }
+            for feature in reversed(data["features"])
+        ],
+    }
+
+
+class TestStrdsRequests:
+    """Test the chunked STRDS requests against a local server."""
+
+    def test_statistics_by_chunk_index(self) -> None:
+        """Test matching statistics to features with their own cat."""
+        actinia = FakeActinia(statistics)
+        features = [polygon("a", 7), polygon("b", 3), polygon("c", 12)]
+        resp = actinia.strds().compute_zonal_statistics(
+            {"type": "FeatureCollection", "features": features},
+            TIMESTAMPS,
+            chunk_size=2,
+            waiting_time=0,
+        )
+        assert resp.ids.tolist() == ["a", "b", "c"]
+        assert resp.statistic("number")[:, 0].tolist() == [7, 3, 12]
+        assert CHUNK_INDEX not in features[0]["properties"]
+        actinia.close()
+
+    def test_retries(self) -> None:
+        """Test retrying server errors but not validation errors."""
+        responses = [(503, {"message": "Service unavailable"})]
+
+        def respond(data: dict) -> tuple:
+            return responses.pop(0) if responses else statistics(data)
+
+        actinia = FakeActinia(respond)
+        strds = actinia.strds()
+        polygons = {"type": "FeatureCollection", "features": [polygon("a", 1)]}
+        resp = strds.compute_zonal_statistics(
+            polygons, TIMESTAMPS, waiting_time=0
+        )
+        assert resp.statistic("number")[0, 0] == 1
+        assert actinia.server.requests == 2
+
+        responses.append((400, {"message": "Invalid GeoJSON"}))
+        actinia.cache.clear()
+        with pytest.raises(RuntimeError):
+            strds.compute_zonal_statistics(
+                polygons, TIMESTAMPS, waiting_time=0
+            )
+        assert actinia.server.requests == 3
+        actinia.close()
+
+    def test_duplicate_sampling_ids(self) -> None:
+        """Test rejecting sampling points with duplicate ids."""
+        actinia = FakeActinia(statistics)
+        points = [["a", 635000, 220000], ["a", 640000, 225000]]
+        with pytest.raises(ValueError, match="unique"):
+            actinia.strds().sample_points(points)
+        assert actinia.server.requests == 0
+        actinia.close()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""Test cases for the temporal index of STRDS raster layers.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import re
+
+import numpy as np
+import pytest
+
+from actinia.temporal_index import TemporalIndex
+
+
+def layer(name: str, start: str, end: str | None, value: float) -> dict:
+    """Return a raster layer dict like the server returns it."""
+    return {
+        "id": f"{name}@strds_mapset",
+        "name": name,
+        "mapset": "strds_mapset",
+        "start_time": start,
+        "end_time": "None" if end is None else end,
+        "min": value,
+        "max": value + 10,
+    }
+
+
+class FakeServer:
+    """Registered raster layers answering start time range queries."""
+
+    def __init__(self, layers: list[dict]) -> None:
+        """Initialize the FakeServer object."""
+        self.layers = layers
+        self.wheres = []
+
+    def fetch(self, where: str | None) -> list[dict]:
+        """Return the layers starting in the range of the WHERE condition."""
+        self.wheres.append(where)
+        if where is None:
+            return list(self.layers)
+        start, end = re.findall(r"'([^']+)'", where)
+        return [
+            lyr for lyr in self.layers if start <= lyr["start_time"] <= end
+        ]
+
+
+@pytest.fixture
+def server() -> FakeServer:
+    """Return a fake server with monthly, overlapping and point maps."""
+    layers = [
+        layer(
+            f"month_{i:02d}",
+            f"2023-{i:02d}-01 00:00:00",
+            f"2023-{i + 1:02d}-01 00:00:00",
+            i,
+        )
+        for i in range(1, 12)
+    ]
+    layers.append(
+        layer("year", "2023-01-01 00:00:00", "2024-01-01 00:00:00", 100),
+    )
+    layers.append(layer("point", "2023-06-15 12:00:00", None, 50))
+    return FakeServer(layers)
+
+
+def names(index: TemporalIndex, rows: np.ndarray) -> set[str]:
+    """Return the names of the maps in rows."""
+    return {lyr["name"] for lyr in index.layers(rows)}
+
+
+class TestTemporalIndex:
+    """Test the local queries of the temporal index."""
+
+    def test_during(self, server) -> None:
+        """Test time range queries including long and point maps."""
+        index = TemporalIndex(server.fetch).build()
+        assert len(index) == 13
+        assert names(index, index.during("2023-06-01", "2023-07-01")) == {
+            "month_06",
+            "year",
+            "point",
+        }
+        # the end of the range is exclusive
+        assert names(index, index.during("2023-03-15", "2023-04-01")) == {
+            "month_03",
+            "year",
+        }
+        assert len(index.during("2025-01-01", "2026-01-01")) == 0
+
+    def test_at(self, server) -> None:
+        """Test point in time queries."""
+        index = TemporalIndex(server.fetch).build()
+        assert names(index, index.at("2023-06-15 12:00:00")) == {
+            "month_06",
+            "year",
+            "point",
+        }
+        # maps are valid from their start until before their end
+        assert names(index, index.at("2023-03-01")) == {"month_03", "year"}
+
+    def test_where(self, server) -> None:
+        """Test simple WHERE conditions and unsupported conditions."""
+        index = TemporalIndex(server.fetch).build()
+        rows = index.where("start_time >= '2023-10-01' AND max >= 20")
+        assert names(index, rows) == {"month_10", "month_11"}
+        assert names(index, index.where("name = 'year'")) == {"year"}
+        assert len(index.where(None)) == 13
+        rows = index.select("min < 5", start="2023-02-10", end="2023-03-10")
+        assert names(index, rows) == {"month_02", "month_03"}
+        with pytest.raises(ValueError, match="Unsupported condition"):
+            index.where("min < 5 OR max > 10")
+        with pytest.raises(ValueError, match="Unsupported column"):
+            index.where("unknown = 1")
+
+    def test_refresh_and_remove(self, server) -> None:
+        """Test the incremental updates after (un)registering maps."""
+        index = TemporalIndex(server.fetch).build()
+        server.layers.append(
+            layer("month_12", "2023-12-01 00:00:00", "2024-01-01", 12),
+        )
+        # registered again with another start time
+        server.layers[0]["start_time"] = "2023-12-15 00:00:00"
+        server.layers[0]["end_time"] = "2023-12-31 00:00:00"
+        index.refresh("2023-12-01", "2023-12-15")
+        assert server.wheres[-1] == (
+            "start_time >= '2023-12-01 00:00:00' AND "
+            "start_time <= '2023-12-15 00:00:00'"
+        )
+        assert len(index) == 14
+        assert names(index, index.at("2023-12-20")) == {
+            "month_01",
+            "month_12",
+            "year",
+        }
+        assert names(index, index.at("2023-01-15")) == {"year"}
+        index.remove(["month_12", "year@strds_mapset"])
+        assert len(index) == 12
+        assert names(index, index.at("2023-12-20")) == {"month_01"}
+        assert index["start_time"].tolist() == sorted(
+            index["start_time"].tolist(),
+        )
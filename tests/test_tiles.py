@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+"""Test cases for the local XYZ tile proxy.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+from __future__ import annotations
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from threading import Event, Lock
+from time import monotonic, sleep
+
+import pytest
+import requests
+
+from actinia.cache import ByteCache
+from actinia.tiles import ORIGIN_SHIFT, TileProxy, tile_bbox, tile_bounds
+
+
+class FakeRenderer:
+    """Render function returning the render parameters as image."""
+
+    def __init__(self, release: Event | None = None) -> None:
+        """Initialize the FakeRenderer object."""
+        self.calls = []
+        self.lock = Lock()
+        self.release = release
+
+    def __call__(self, render_dict: dict) -> bytes:
+        """Return the render parameters as bytes."""
+        if self.release is not None:
+            self.release.wait(5)
+        with self.lock:
+            self.calls.append(render_dict)
+        return json.dumps(render_dict).encode()
+
+
+def test_tile_bounds() -> None:
+    """Test the Web Mercator bounds and the transformed bounding box."""
+    assert tile_bounds(0, 0, 0) == {
+        "n": ORIGIN_SHIFT,
+        "s": -ORIGIN_SHIFT,
+        "e": ORIGIN_SHIFT,
+        "w": -ORIGIN_SHIFT,
+    }
+    assert tile_bounds(1, 1, 0) == {
+        "n": ORIGIN_SHIFT,
+        "s": 0,
+        "e": ORIGIN_SHIFT,
+        "w": 0,
+    }
+    with pytest.raises(ValueError, match="outside of the tile grid"):
+        tile_bounds(2, 4, 0)
+    bbox = tile_bbox(1, 1, 1, lambda x, y: (x / 2, y + x))
+    assert bbox == pytest.approx(
+        {
+            "n": ORIGIN_SHIFT,
+            "s": -ORIGIN_SHIFT,
+            "e": ORIGIN_SHIFT / 2,
+            "w": 0,
+        },
+    )
+
+
+class TestTileProxy:
+    """Test serving, caching, deduplicating and prefetching tiles."""
+
+    def test_serve_tiles(self, tmp_path) -> None:
+        """Test the served tiles and the disk cache."""
+        render = FakeRenderer()
+        cache = ByteCache(directory=tmp_path)
+        with TileProxy(cache=cache, prefetch=0) as proxy:
+            template = proxy.add_layer("raster/nc/PERMANENT/elevation", render)
+            assert template == (
+                f"{proxy.url}/raster/nc/PERMANENT/elevation/{{z}}/{{x}}/{{y}}"
+                ".png"
+            )
+            url = template.format(z=1, x=1, y=0)
+            resp = requests.get(url, timeout=5)
+            assert resp.status_code == 200
+            assert resp.headers["Content-Type"] == "image/png"
+            assert json.loads(resp.content) == {
+                **tile_bounds(1, 1, 0),
+                "width": 256,
+                "height": 256,
+            }
+            assert requests.get(url, timeout=5).content == resp.content
+            assert len(render.calls) == 1
+            missing = template.format(z=1, x=2, y=0)
+            assert requests.get(missing, timeout=5).status_code == 404
+            unknown = f"{proxy.url}/unknown/1/1/0.png"
+            assert requests.get(unknown, timeout=5).status_code == 404
+        # a new proxy uses the tiles cached on disk
+        cache = ByteCache(directory=tmp_path)
+        with TileProxy(cache=cache, prefetch=0) as proxy:
+            proxy.add_layer("raster/nc/PERMANENT/elevation", render)
+            assert proxy.tile("raster/nc/PERMANENT/elevation", 1, 1, 0)
+            assert len(render.calls) == 1
+
+    def test_strds_time_steps(self) -> None:
+        """Test the time parameters of STRDS tiles."""
+        render = FakeRenderer()
+        with TileProxy(cache=ByteCache(), prefetch=0) as proxy:
+            proxy.add_layer("lst", render)
+            template = proxy.url_template("lst", "2023-01-01")
+            assert template.endswith(
+                "?start_time=2023-01-01+00%3A00%3A00"
+                "&end_time=2023-01-01+00%3A00%3A00",
+            )
+            for start_time in ["2023-01-01", "2023-01-02"]:
+                url = proxy.url_template("lst", start_time).format(
+                    z=0,
+                    x=0,
+                    y=0,
+                )
+                params = json.loads(requests.get(url, timeout=5).content)
+                assert params["start_time"] == f"{start_time} 00:00:00"
+            assert len(render.calls) == 2
+
+    def test_layer_version(self) -> None:
+        """Test that tiles of another layer version are rendered again."""
+        render = FakeRenderer()
+        versions = ["2023-01-01"]
+        with TileProxy(cache=ByteCache(), prefetch=0) as proxy:
+            proxy.add_layer("elevation", render, version=lambda: versions[-1])
+            image = proxy.tile("elevation", 0, 0, 0)
+            assert proxy.tile("elevation", 0, 0, 0) == image
+            assert len(render.calls) == 1
+            versions.append("2024-01-01")
+            proxy.tile("elevation", 0, 0, 0)
+            assert len(render.calls) == 2
+
+    def test_render_error(self) -> None:
+        """Test that failed render requests are answered and retried."""
+
+        def render(render_dict: dict) -> bytes:
+            msg = "Rendering raster <elevation> failed"
+            raise RuntimeError(msg)
+
+        with TileProxy(cache=ByteCache(), prefetch=0) as proxy:
+            url = proxy.add_layer("elevation", render).format(z=0, x=0, y=0)
+            resp = requests.get(url, timeout=5)
+            assert resp.status_code == 502
+            assert "Rendering raster &lt;elevation&gt; failed" in resp.text
+            requests.get(url, timeout=5)
+            assert proxy.metrics["errors"] == 2
+
+    def test_deduplicate_and_prefetch(self) -> None:
+        """Test concurrent requests of a tile and prefetched neighbours."""
+        release = Event()
+        render = FakeRenderer(release)
+        with TileProxy(cache=ByteCache(), max_in_flight=2) as proxy:
+            proxy.add_layer("elevation", render)
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                futures = [
+                    executor.submit(proxy.tile, "elevation", 3, 0, 2)
+                    for _ in range(8)
+                ]
+                release.set()
+                images = {future.result() for future in futures}
+            assert len(images) == 1
+            deadline = monotonic() + 5
+            while proxy.metrics["rendered"] < 9 and monotonic() < deadline:
+                sleep(0.01)
+            metrics = proxy.metrics
+        assert metrics["requests"] == 8
+        assert metrics["prefetched"] == 8
+        assert metrics["rendered"] == 9
+        # the requested tile and its neighbours, wrapped around x
+        size = ORIGIN_SHIFT / 4
+        assert {
+            (round((call["w"] + ORIGIN_SHIFT) / size), call["n"])
+            for call in render.calls
+        } == {
+            (x, ORIGIN_SHIFT - y * size) for x in (7, 0, 1) for y in (1, 2, 3)
+        }
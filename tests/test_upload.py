@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+"""Test cases for streaming uploads.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import email
+import io
+import json
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from threading import Thread
+
+import numpy as np
+import pytest
+import requests
+
+from actinia.region import Region
+import hashlib
+
+from actinia.upload import (
+    MultipartEncoder,
+    UploadManifest,
+    content_hash,
+    prepare_upload,
+    upload_file,
+)
+
+
+class ResponseHandler(BaseHTTPRequestHandler):
+    """Handler reading the body and answering with the next response."""
+
+    def do_POST(self) -> None:
+        """Read the request and send the next status code and body."""
+        self.rfile.read(int(self.headers["Content-Length"]))
+        status_code, resp_dict = self.server.responses.pop(0)
+        self.server.requests += 1
+        body = json.dumps(resp_dict).encode()
+        self.send_response(status_code)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        """Do not log the requests."""
+
+
+def serve(responses: list) -> HTTPServer:
+    """Start a local server answering with the given responses."""
+    server = HTTPServer(("127.0.0.1", 0), ResponseHandler)
+    server.responses = responses
+    server.requests = 0
+    Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class TestMultipartEncoder:
+    """Test the MultipartEncoder."""
+
+    def test_streamed_body(self, tmp_path) -> None:
+        """Test the body, progress and rewinding of the encoder."""
+        path = tmp_path / "elevation.tif"
+        data = bytes(range(256)) * 1000
+        path.write_bytes(data)
+        progress = []
+        with MultipartEncoder(
+            path,
+            filename="elevation.tif",
+            progress=lambda sent, total: progress.append(sent),
+            chunk_size=4096,
+        ) as encoder:
+            body = b"".join(encoder)
+            assert len(body) == len(encoder)
+            assert progress[-1] == len(encoder)
+            assert all(b - a >= 4096 for a, b in zip(progress, progress[1:-1]))
+            encoder.reset()
+            assert encoder.read(10) + encoder.read() == body
+            assert encoder.metrics["bytes"] == len(body)
+            assert encoder.sha256 == hashlib.sha256(data).hexdigest()
+
+        message = email.message_from_bytes(
+            f"Content-Type: {encoder.content_type}\r\n\r\n".encode() + body
+        )
+        part = message.get_payload()[0]
+        assert part.get_filename() == "elevation.tif"
+        assert part.get_payload(decode=True) == data
+        # only the base name of local paths is sent
+        with MultipartEncoder(path) as encoder:
+            assert encoder.filename == "elevation.tif"
+        with path.open("rb") as file, MultipartEncoder(file) as encoder:
+            assert encoder.filename == "elevation.tif"
+
+    def test_in_memory_sources(self, tmp_path) -> None:
+        """Test uploading bytes, file objects, mappings and arrays."""
+        data = b"0123456789" * 1000
+        for source in (data, memoryview(data), bytearray(data)):
+            with MultipartEncoder(source, filename="a.tif") as encoder:
+                assert data in b"".join(encoder)
+        file = io.BytesIO(b"ignored" + data)
+        file.seek(7)
+        encoder = MultipartEncoder(file, filename="a.tif")
+        assert data in b"".join(encoder)
+        encoder.reset()
+        assert data in encoder.read()
+        encoder.close()
+        assert not file.closed
+
+        geojson = {"type": "FeatureCollection", "features": []}
+        source, filename = prepare_upload("vector", "points", geojson)
+        assert filename == "points.geojson"
+        assert json.loads(bytes(source)) == geojson
+        source, filename = prepare_upload(
+            "raster",
+            "grid",
+            np.ones((2, 3), dtype=np.float32),
+            Region(n=2, s=0, e=3, w=0),
+        )
+        assert filename == "grid.tif"
+        assert bytes(source[:4]) == b"II*\0"
+        assert prepare_upload("raster", "r", "r.tif") == ("r.tif", None)
+
+    def test_content_hash_and_manifest(self, tmp_path) -> None:
+        """Test hashing sources and recording uploaded layers."""
+        data = b"GeoTIFF" * 1000
+        sha256 = hashlib.sha256(data).hexdigest()
+        path = tmp_path / "a.tif"
+        path.write_bytes(data)
+        file = io.BytesIO(data)
+        assert content_hash(path, chunk_size=100) == sha256
+        assert content_hash(memoryview(data)) == sha256
+        assert content_hash(file) == sha256
+        assert file.tell() == 0
+
+        manifest = UploadManifest(tmp_path / "manifest" / "uploads.json")
+        manifest.set("nc_spm_08", "test", "raster", "a", sha256)
+        manifest.set("nc_spm_08", "test", "vector", "b", sha256)
+        reloaded = UploadManifest(manifest.path)
+        assert reloaded.get("nc_spm_08", "test", "raster", "a") == sha256
+        assert reloaded.get("nc_spm_08", "test", "raster", "b") is None
+        reloaded.remove("nc_spm_08", "test", "raster", "a")
+        assert reloaded.get("nc_spm_08", "test", "raster", "a") is None
+        reloaded.remove("nc_spm_08", "test")
+        assert reloaded.get("nc_spm_08", "test", "vector", "b") is None
+
+    def test_upload_retries(self, tmp_path) -> None:
+        """Test resending only uploads which cannot have started a job."""
+        path = tmp_path / "a.tif"
+        path.write_bytes(b"GeoTIFF" * 1000)
+        server = serve(
+            [
+                (503, {"message": "Service unavailable"}),
+                (200, {"resource_id": "resource_id-1"}),
+                (500, {"resource_id": "resource_id-2"}),
+            ]
+        )
+        url = f"http://127.0.0.1:{server.server_port}/upload"
+        kwargs = {"auth": ("user", "pw"), "timeout": 5, "waiting_time": 0}
+        resp_dict, metrics = upload_file(url, path, **kwargs)
+        assert resp_dict == {"resource_id": "resource_id-1"}
+        assert metrics["attempts"] == 2
+        with pytest.raises(requests.exceptions.RequestException):
+            upload_file(url, path, **kwargs)
+        assert server.requests == 3
+        server.shutdown()
+        server.server_close()
@@ -18,10 +18,13 @@ __maintainer__ = "Anika Weinmann"
 
 import pytest
 
+from actinia.region import Region
 from actinia.utils import (
     create_actinia_pc_item,
+    load_process_chain,
     request_and_check,
     set_job_names,
+    use_sync_processing,
 )
 from .actinia_config import ACTINIA_BASEURL, ACTINIA_VERSION, ACTINIA_AUTH
 
@@ -104,3 +107,13 @@ class TestActiniaUtils(object):
             value = inp["value"]
             assert param in inputs
             assert inputs[param] == value
+
+    def test_use_sync_processing(self):
+        """Test use_sync_processing utils function."""
+        pc = {"list": [create_actinia_pc_item("1", "r.univar")], "version": 1}
+        assert load_process_chain(pc) == pc
+        region = Region(*[None] * 18, 1000, None)
+        assert use_sync_processing(pc, region) is True
+        assert use_sync_processing(pc, region, max_cells=100) is False
+        assert use_sync_processing(pc, region, max_modules=0) is False
+        assert use_sync_processing(pc, None) is False
@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""Test cases for decoding vector attribute tables.
+
+actinia-python-client is a python client for actinia - an open source REST
+API for scalable, distributed, high performance processing of geographical
+data that uses GRASS GIS for computational tasks.
+
+SPDX-FileCopyrightText: (c) 2025 mundialis GmbH & Co. KG
+
+SPDX-License-Identifier: GPL-3.0-or-later
+"""
+
+__license__ = "GPL-3.0-or-later"
+__author__ = "Anika Weinmann"
+__copyright__ = "Copyright 2025, mundialis GmbH & Co. KG"
+__maintainer__ = "Anika Weinmann"
+
+import numpy as np
+
+from actinia.vector import decode_attributes
+
+
+class TestDecodeAttributes:
+    """Test decoding v.db.select output into structured masked arrays."""
+
+    def test_decode_attributes(self) -> None:
+        """Test the column types and the null mask."""
+        dtype = np.dtype([("cat", "i8"), ("NAME", "U"), ("AREA", "f8")])
+        text = "1\tWake\t2.5\n2\t\\N\t\\N\n3\tnan\t1e3\n"
+        array = decode_attributes(text, dtype)
+        assert array.dtype["cat"] == np.int64
+        assert array.dtype["NAME"] == np.dtype("U4")
+        assert array.dtype["AREA"] == np.float64
+        assert array.data["NAME"].tolist() == ["Wake", "", "nan"]
+        assert array.mask["NAME"].tolist() == [False, True, False]
+        assert np.isnan(array.data["AREA"][1])
+        assert array["AREA"].sum() == 1002.5
+        assert not array.mask["cat"].any()
+
+    def test_integer_nulls(self) -> None:
+        """Test that integer columns keep their type in all batches."""
+        dtype = np.dtype([("cat", "i8"), ("ID", "i8")])
+        with_nulls = decode_attributes("1\t\\N\n2\t3\n", dtype)
+        without_nulls = decode_attributes("3\t4\n", dtype)
+        assert with_nulls.dtype == without_nulls.dtype == dtype
+        assert with_nulls.mask["ID"].tolist() == [True, False]
+        assert with_nulls["ID"].max() == 3
+        empty = decode_attributes("", dtype)
+        assert len(empty) == 0
+        assert empty.dtype == dtype